@@ -0,0 +1,40 @@
+"""Time building help and info embeds against serving them from the EmbedCache.
+
+Run from the repo root: python benchmarks/embed_cache.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.help_embeds import EmbedCache, build_help_embed, build_info_embed
+
+PREFIX = "!"
+
+def best_time(func, number=5000):
+    """Fastest of several runs, in microseconds per call."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+def main():
+    cache = EmbedCache()
+    key = ("help", True, PREFIX, "economy")
+    build = lambda: build_help_embed("economy", PREFIX, slash=True)
+    cache.get(key, build)
+
+    print(f"help embed, build:       {best_time(build):8.2f}us")
+    print(f"help embed, cache hit:   {best_time(lambda: cache.get(key, build)):8.2f}us")
+
+    # Why the info embed, whose server count changes, isn't cached
+    cached_info = build_info_embed(PREFIX, 0)
+
+    def copy_cached_info():
+        embed = cached_info.copy()
+        embed.set_field_at(2, name="Server Count", value=42, inline=True)
+        return embed
+
+    print(f"info embed, build:       {best_time(lambda: build_info_embed(PREFIX, 42)):8.2f}us")
+    print(f"info embed, cached copy: {best_time(copy_cached_info):8.2f}us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Compare the "minimal" and "all" gateway intent profiles offline.
+
+For each profile this times constructing the bot, then replays what the
+profile caches for one guild at startup. With "all", every guild is chunked
+when the bot connects, so all members (and their presences) are fed through
+discord.py's member chunk handler. With "minimal", nothing is chunked until a
+listing needs names. The startup time includes building the chunk payloads.
+Memory is measured with tracemalloc, so it covers Python allocations only,
+not the process RSS.
+
+Run from the repo root: python benchmarks/intents.py [members]
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from discord.ext import commands
+from discord.state import ChunkRequest
+from utils.gateway import INTENT_PROFILES, gateway_settings
+
+GUILD_ID = 1 << 40
+CHUNK_SIZE = 1000  # Members per GUILD_MEMBERS_CHUNK event, as Discord sends them
+
+def make_bot(profile):
+    intents, options = gateway_settings(profile)
+    return commands.Bot(command_prefix="!", intents=intents, **options)
+
+def member_payload(index):
+    user_id = str(10**17 + index)
+    return {
+        "user": {"id": user_id, "username": f"user{index}", "discriminator": "0", "avatar": None, "global_name": f"User {index}"},
+        "roles": [], "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False, "mute": False, "nick": None, "flags": 0,
+    }
+
+def presence_payload(index):
+    return {
+        "user": {"id": str(10**17 + index)}, "guild_id": str(GUILD_ID), "status": "online",
+        "activities": [{"name": "a game", "type": 0}], "client_status": {"desktop": "online"},
+    }
+
+def startup_chunks(bot, member_count):
+    """Build the member chunk events the profile receives for one guild at startup."""
+    if not bot._connection._chunk_guilds:
+        return []
+
+    presences = bot.intents.presences
+    chunks = []
+    for start in range(0, member_count, CHUNK_SIZE):
+        indexes = range(start, min(start + CHUNK_SIZE, member_count))
+        chunks.append({
+            "guild_id": str(GUILD_ID),
+            "members": [member_payload(index) for index in indexes],
+            "presences": [presence_payload(index) for index in indexes] if presences else [],
+            "chunk_index": len(chunks),
+        })
+    for chunk in chunks:
+        chunk["chunk_count"] = len(chunks)
+    return chunks
+
+def replay_startup(profile, member_count, loop):
+    """Build a bot with one guild and feed it the profile's startup chunks. Returns the guild."""
+    bot = make_bot(profile)
+    state = bot._connection
+    guild = state._add_guild_from_data({
+        "id": str(GUILD_ID), "name": "guild", "roles": [], "emojis": [], "stickers": [],
+        "features": [], "member_count": member_count,
+    })
+
+    chunks = startup_chunks(bot, member_count)
+    if chunks:
+        request = ChunkRequest(GUILD_ID, 0, loop, state._get_guild, cache=True)
+        state._chunk_requests[request.nonce] = request
+        for chunk in chunks:
+            state.parse_guild_members_chunk({**chunk, "nonce": request.nonce})
+    return guild
+
+async def measure(profile, member_count):
+    loop = asyncio.get_running_loop()
+
+    started = time.perf_counter()
+    for _ in range(100):
+        make_bot(profile)
+    construct_ms = (time.perf_counter() - started) * 10
+
+    # Timed and traced separately, since tracing slows the replay down
+    started = time.perf_counter()
+    replay_startup(profile, member_count, loop)
+    startup_ms = (time.perf_counter() - started) * 1000
+
+    tracemalloc.start()
+    guild = replay_startup(profile, member_count, loop)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return construct_ms, len(guild.members), startup_ms, allocated / 1024 / 1024
+
+async def main(member_count):
+    logging.getLogger("discord").setLevel(logging.ERROR)  # Voice support warnings
+    print(f"One guild with {member_count} members")
+    print(f"{'profile':<10}{'construct':>12}{'cached':>10}{'startup':>12}{'memory':>12}")
+    for profile in INTENT_PROFILES:
+        construct_ms, cached, startup_ms, memory_mb = await measure(profile, member_count)
+        print(f"{profile:<10}{construct_ms:>10.2f}ms{cached:>10}{startup_ms:>10.1f}ms{memory_mb:>10.1f}MB")
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000))
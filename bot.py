@@ -7,11 +7,51 @@ import logging
 import json
 import datetime
 from utils.database import Database
-from utils.config import PREFIX
+from utils.scheduler import Scheduler
+from utils.dispatcher import ReactionDispatcher
+from utils.outbox import Outbox
+from utils.help_embeds import (EmbedCache, HELP_CATEGORIES,
+                               build_help_embed, build_unknown_category_embed, build_info_embed)
+from utils.gateway import gateway_settings, sharding_settings
+from utils.sharding import ShardContext, ActivityBuffer
+from utils.members import member_resolver
+from utils.tree_sync import TreeSyncer
+from utils.lifecycle import Lifecycle
+from utils.config import PREFIX, INTENT_PROFILE, SHARD_COUNT, SHARD_IDS
 
-# Initialize bot with all intents
-intents = discord.Intents.all()
-bot = commands.Bot(command_prefix=PREFIX, intents=intents, help_command=None)
+# Single connection (commands.Bot) or AutoShardedBot, depending on SHARD_COUNT
+BotBase, shard_options = sharding_settings(SHARD_COUNT, SHARD_IDS)
+
+class EconomyBot(BotBase):
+    """Bot that does its one-time startup in setup_hook instead of on_ready.
+    
+    on_ready fires again after every gateway reconnect, so it only records
+    readiness; extensions, caches, background jobs and the command sync are
+    run once by the lifecycle manager.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lifecycle = Lifecycle()
+        
+    async def setup_hook(self):
+        """Run the startup phases before connecting to the gateway."""
+        await self.lifecycle.run_phase("extensions", load_extensions)
+        await self.lifecycle.run_phase("embed_cache", warm_embed_cache)
+        await self.lifecycle.run_phase("scheduler", start_scheduler)
+        await self.lifecycle.run_phase("activity_flush", self.activity_buffer.start)
+        await self.lifecycle.run_phase("command_sync", sync_command_tree)
+        
+    async def close(self):
+        """Deliver queued messages, write buffered activity and stop the job dispatcher before disconnecting."""
+        await self.outbox.flush(timeout=10)
+        await self.activity_buffer.stop()
+        await self.scheduler.stop()
+        await super().close()
+
+# Initialize bot with the configured intent profile
+intents, client_options = gateway_settings(INTENT_PROFILE)
+bot = EconomyBot(command_prefix=PREFIX, intents=intents, help_command=None, **client_options, **shard_options)
 
 # Create initial data directories if they don't exist
 os.makedirs('data', exist_ok=True)
@@ -19,56 +59,122 @@ os.makedirs('data', exist_ok=True)
 # Initialize database
 db = Database()
 
+# Initialize the persistent job scheduler (cogs register their handlers on it)
+bot.scheduler = Scheduler(db)
+
+# Route reaction confirmations (cogs wait on it)
+bot.reaction_dispatcher = ReactionDispatcher(bot)
+
+# Notifications and DMs are queued and delivered in the background
+bot.outbox = Outbox()
+
+# Shards run by this process, and message activity buffered per shard
+bot.shard_context = ShardContext(bot)
+bot.activity_buffer = ActivityBuffer(db)
+
+# Syncs slash commands only when the command tree changed
+bot.tree_syncer = TreeSyncer(bot, db)
+bot.force_sync = False  # Set by run_bot(force_sync=True) to sync once regardless of the stored hash
+
+# Prebuilt help embeds, built once at startup
+embed_cache = EmbedCache()
+
 @bot.event
 async def on_ready():
-    """Event triggered when the bot is ready and connected to Discord."""
+    """Event triggered when the bot is connected to Discord, including after every reconnect."""
+    if not bot.lifecycle.mark_ready():
+        return
+        
     logging.info(f'Bot logged in as {bot.user.name} (ID: {bot.user.id})')
     
-    # Load cogs (extensions)
-    await load_extensions()
-    
-    # Start daily reward loop
-    bot.loop.create_task(daily_reward_loop())
-    
-    # Sync slash commands with Discord
-    try:
-        logging.info("Syncing slash commands...")
-        await bot.tree.sync()
-        logging.info("Slash commands synced successfully!")
-    except Exception as e:
-        logging.error(f"Failed to sync slash commands: {e}")
-    
     # Set bot status
     await bot.change_presence(activity=discord.Game(name=f"{PREFIX}help or /help"))
     
     logging.info("Bot is ready!")
 
+@bot.event
+async def on_disconnect():
+    """Event triggered when the gateway connection is lost."""
+    bot.lifecycle.mark_disconnected()
+
+@bot.event
+async def on_shard_ready(shard_id):
+    """Event triggered when a shard connects (sharded mode only)."""
+    # Members may have changed while the shard was away; drop the names cached for its guilds
+    member_resolver.invalidate_guilds(guild.id for guild in bot.guilds if guild.shard_id == shard_id)
+
 async def load_extensions():
-    """Load all cog extensions."""
+    """Load all cog extensions that aren't loaded yet."""
+    failed = []
     for extension in ['cogs.economy', 'cogs.company', 'cogs.moderation']:
+        if extension in bot.extensions:
+            continue
+            
         try:
             await bot.load_extension(extension)
             logging.info(f'Loaded extension: {extension}')
         except Exception as e:
             logging.error(f'Failed to load extension {extension}: {e}')
+            failed.append(extension)
+            
+    # Fail the startup phase so the dashboard shows the bot as not ready
+    if failed:
+        raise RuntimeError(f"Failed to load extensions: {', '.join(failed)}")
 
-async def daily_reward_loop():
-    """Loop that gives daily rewards to all users."""
-    while True:
-        # Wait until midnight
-        now = datetime.datetime.now()
-        tomorrow = (now + datetime.timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-        seconds_until_midnight = (tomorrow - now).total_seconds()
-        
-        logging.info(f"Daily reward loop will run in {seconds_until_midnight} seconds")
-        await asyncio.sleep(seconds_until_midnight)
-        
-        # Give daily rewards
-        logging.info("Giving daily rewards to all users")
-        db.give_daily_rewards_to_all()
+async def start_scheduler():
+    """Schedule daily rewards and start the job dispatcher."""
+    schedule_daily_rewards()
+    bot.scheduler.start()
+
+async def sync_command_tree():
+    """Sync slash commands with Discord if they changed since the last sync."""
+    await bot.tree_syncer.sync(force=bot.force_sync)
+    bot.force_sync = False
+
+def warm_embed_cache():
+    """Rebuild the cached help embeds."""
+    embed_cache.clear()
+    
+    for category in [None, *HELP_CATEGORIES]:
+        get_help_embed(category, PREFIX, slash=False)
+        get_help_embed(category, PREFIX, slash=True)
+    
+    logging.info(f"Built {len(embed_cache)} help embeds")
+
+def get_help_embed(category, prefix, slash=False):
+    """Get the help embed for a category, from the cache when it's a known category."""
+    category = category.lower() if category else None
+    
+    if category is not None and category not in HELP_CATEGORIES:
+        return build_unknown_category_embed(category, prefix, slash)
         
-        # Sleep for a minute to avoid multiple triggers
-        await asyncio.sleep(60)
+    return embed_cache.get(("help", slash, prefix, category), lambda: build_help_embed(category, prefix, slash))
+
+def get_info_embed():
+    """Get the info embed with the current server count."""
+    # Built on every call: copying a cached embed to fill in the count is slower
+    return build_info_embed(bot.command_prefix, len(bot.guilds))
+
+def give_daily_rewards(payload):
+    """Scheduler handler that gives daily rewards to all users."""
+    logging.info(f"Giving daily rewards to the users of shards {bot.shard_context.shard_ids}")
+    db.give_daily_rewards_to_all(owns_user=bot.shard_context.owns_user)
+
+def schedule_daily_rewards():
+    """Schedule the recurring daily reward job for midnight, if not already scheduled."""
+    now = datetime.datetime.now()
+    tomorrow = (now + datetime.timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    # The key keeps the persisted job from being duplicated on every start
+    bot.scheduler.schedule(
+        "daily_rewards",
+        tomorrow,
+        interval=24 * 60 * 60,
+        catch_up="once",
+        key="daily_rewards"
+    )
+
+bot.scheduler.register("daily_rewards", give_daily_rewards)
 
 @bot.event
 async def on_message(message):
@@ -80,101 +186,14 @@ async def on_message(message):
     # Process commands
     await bot.process_commands(message)
     
-    # Check if user exists in database, if not create them
-    db.get_or_create_user(message.author.id)
-    
-    # If user is in a company, give them activity bonus
-    db.update_activity(message.author.id)
+    # Buffer the activity on the guild's shard; the flush creates new users and
+    # gives company members their activity bonus
+    bot.activity_buffer.record(bot.shard_context.guild_shard(message.guild), message.author.id)
 
 @bot.command(name="help")
 async def help_command(ctx, category=None):
     """Display a helpful guide to bot commands."""
-    prefix = ctx.prefix
-    
-    # Create base embed
-    embed = discord.Embed(
-        title="Discord Economy Bot - Help Menu",
-        description=f"Use `{prefix}help <category>` to view specific commands.\nAll commands are also available as slash commands!",
-        color=discord.Color.blue()
-    )
-    
-    # Add footer with version info
-    embed.set_footer(text=f"Discord Economy Bot | Use {prefix}help or /help")
-    
-    # General help menu (categories)
-    if not category:
-        embed.add_field(
-            name="🏦 Economy",
-            value=f"`{prefix}help economy` - Money, bank, and daily rewards",
-            inline=False
-        )
-        embed.add_field(
-            name="🏢 Company",
-            value=f"`{prefix}help company` - Company creation and management",
-            inline=False
-        )
-        embed.add_field(
-            name="🛡️ Moderation",
-            value=f"`{prefix}help moderation` - Role-based timeout commands",
-            inline=False
-        )
-        embed.add_field(
-            name="📊 General",
-            value=f"`{prefix}help general` - General utility commands",
-            inline=False
-        )
-        
-    # Economy commands
-    elif category.lower() == "economy":
-        embed.title = "Economy Commands"
-        embed.description = "Commands for managing your money and earning rewards."
-        
-        embed.add_field(name=f"{prefix}balance", value="Check your current balance", inline=False)
-        embed.add_field(name=f"{prefix}daily", value="Claim your daily reward of $100", inline=False)
-        embed.add_field(name=f"{prefix}deposit <amount>", value="Deposit money to your bank", inline=False)
-        embed.add_field(name=f"{prefix}withdraw <amount>", value="Withdraw money from your bank", inline=False)
-        embed.add_field(name=f"{prefix}transfer <@user> <amount>", value="Send money to another user", inline=False)
-        embed.add_field(name=f"{prefix}quest", value="Get a random quest to earn money", inline=False)
-        embed.add_field(name=f"{prefix}rob <@user>", value="Attempt to rob another user (requires 5+ people)", inline=False)
-        embed.add_field(name=f"{prefix}leaderboard", value="Display the richest users on the server", inline=False)
-        
-    # Company commands
-    elif category.lower() == "company":
-        embed.title = "Company Commands"
-        embed.description = "Commands for managing companies and employees."
-        
-        embed.add_field(name=f"{prefix}createcompany <name>", value="Create a new company (requires higher role)", inline=False)
-        embed.add_field(name=f"{prefix}company [name]", value="Display info about your company or another company", inline=False)
-        embed.add_field(name=f"{prefix}invite <@user>", value="Invite a user to your company", inline=False)
-        embed.add_field(name=f"{prefix}leave", value="Leave your current company", inline=False)
-        embed.add_field(name=f"{prefix}kick <@user>", value="Kick a member from your company (owner only)", inline=False)
-        embed.add_field(name=f"{prefix}disband", value="Disband your company as the owner", inline=False)
-        embed.add_field(name=f"{prefix}companies", value="List all companies on the server", inline=False)
-        
-    # Moderation commands
-    elif category.lower() == "moderation":
-        embed.title = "Moderation Commands"
-        embed.description = "Commands for moderating users with timeouts."
-        
-        embed.add_field(name=f"{prefix}timeout <@user>", value="Timeout a user based on your role permissions", inline=False)
-        embed.add_field(name=f"{prefix}timeout_cost", value="Check the cost of using the timeout command", inline=False)
-        embed.add_field(name=f"{prefix}timeout_limit", value="Check your timeout duration limit based on your roles", inline=False)
-        embed.add_field(name=f"{prefix}timeout_history [@user]", value="View timeout history for yourself or another user", inline=False)
-        
-    # General commands
-    elif category.lower() == "general":
-        embed.title = "General Commands"
-        embed.description = "General utility commands."
-        
-        embed.add_field(name=f"{prefix}help [category]", value="Display this help menu", inline=False)
-        embed.add_field(name=f"{prefix}ping", value="Check the bot's response time", inline=False)
-        embed.add_field(name=f"{prefix}info", value="Display information about the bot", inline=False)
-        
-    else:
-        embed.title = "Unknown Category"
-        embed.description = f"Category '{category}' not found. Use `{prefix}help` to see available categories."
-        
-    await ctx.send(embed=embed)
+    await ctx.send(embed=get_help_embed(category, ctx.prefix))
 
 # Slash command version of help
 @bot.tree.command(name="help", description="Display a helpful guide to bot commands")
@@ -189,90 +208,7 @@ async def help_slash(interaction: discord.Interaction, category: str = None):
     ctx = await bot.get_context(interaction.message) if interaction.message else None
     prefix = PREFIX if not ctx else ctx.prefix
     
-    # Create base embed
-    embed = discord.Embed(
-        title="Discord Economy Bot - Help Menu",
-        description=f"Use `/help category:category_name` to view specific commands.\nThese commands are also available with the `{prefix}` prefix!",
-        color=discord.Color.blue()
-    )
-    
-    # Add footer with version info
-    embed.set_footer(text=f"Discord Economy Bot | Use {prefix}help or /help")
-    
-    # General help menu (categories)
-    if not category:
-        embed.add_field(
-            name="🏦 Economy",
-            value=f"`/help economy` - Money, bank, and daily rewards",
-            inline=False
-        )
-        embed.add_field(
-            name="🏢 Company",
-            value=f"`/help company` - Company creation and management",
-            inline=False
-        )
-        embed.add_field(
-            name="🛡️ Moderation",
-            value=f"`/help moderation` - Role-based timeout commands",
-            inline=False
-        )
-        embed.add_field(
-            name="📊 General",
-            value=f"`/help general` - General utility commands",
-            inline=False
-        )
-        
-    # Economy commands
-    elif category.lower() == "economy":
-        embed.title = "Economy Commands"
-        embed.description = "Commands for managing your money and earning rewards."
-        
-        embed.add_field(name="/balance", value="Check your current balance", inline=False)
-        embed.add_field(name="/daily", value="Claim your daily reward of $100", inline=False)
-        embed.add_field(name="/deposit amount:<amount>", value="Deposit money to your bank", inline=False)
-        embed.add_field(name="/withdraw amount:<amount>", value="Withdraw money from your bank", inline=False)
-        embed.add_field(name="/transfer user:<@user> amount:<amount>", value="Send money to another user", inline=False)
-        embed.add_field(name="/quest", value="Get a random quest to earn money", inline=False)
-        embed.add_field(name="/rob user:<@user>", value="Attempt to rob another user (requires 5+ people)", inline=False)
-        embed.add_field(name="/leaderboard", value="Display the richest users on the server", inline=False)
-        
-    # Company commands
-    elif category.lower() == "company":
-        embed.title = "Company Commands"
-        embed.description = "Commands for managing companies and employees."
-        
-        embed.add_field(name="/createcompany name:<name>", value="Create a new company (requires higher role)", inline=False)
-        embed.add_field(name="/company [name]", value="Display info about your company or another company", inline=False)
-        embed.add_field(name="/invite user:<@user>", value="Invite a user to your company", inline=False)
-        embed.add_field(name="/leave", value="Leave your current company", inline=False)
-        embed.add_field(name="/kick user:<@user>", value="Kick a member from your company (owner only)", inline=False)
-        embed.add_field(name="/disband", value="Disband your company as the owner", inline=False)
-        embed.add_field(name="/companies", value="List all companies on the server", inline=False)
-        
-    # Moderation commands
-    elif category.lower() == "moderation":
-        embed.title = "Moderation Commands"
-        embed.description = "Commands for moderating users with timeouts."
-        
-        embed.add_field(name="/timeout user:<@user>", value="Timeout a user based on your role permissions", inline=False)
-        embed.add_field(name="/timeout_cost", value="Check the cost of using the timeout command", inline=False)
-        embed.add_field(name="/timeout_limit", value="Check your timeout duration limit based on your roles", inline=False)
-        embed.add_field(name="/timeout_history [user:<@user>]", value="View timeout history for yourself or another user", inline=False)
-        
-    # General commands
-    elif category.lower() == "general":
-        embed.title = "General Commands"
-        embed.description = "General utility commands."
-        
-        embed.add_field(name="/help [category]", value="Display this help menu", inline=False)
-        embed.add_field(name="/ping", value="Check the bot's response time", inline=False)
-        embed.add_field(name="/info", value="Display information about the bot", inline=False)
-        
-    else:
-        embed.title = "Unknown Category"
-        embed.description = f"Category '{category}' not found. Use `/help` to see available categories."
-        
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    await interaction.response.send_message(embed=get_help_embed(category, prefix, slash=True), ephemeral=True)
 
 # Simple ping command - both prefix and slash
 @bot.command(name="ping")
@@ -290,75 +226,41 @@ async def ping_slash(interaction: discord.Interaction):
 @bot.command(name="info")
 async def info(ctx):
     """Display information about the bot."""
-    embed = discord.Embed(
-        title="Discord Economy Bot",
-        description="A Discord economy bot with company creation, money management, bank system, and role-based timeout features",
-        color=discord.Color.blue()
-    )
-    
-    # Add various info fields
-    embed.add_field(name="Version", value="1.0.0", inline=True)
-    embed.add_field(name="Prefix", value=bot.command_prefix, inline=True)
-    embed.add_field(name="Server Count", value=len(bot.guilds), inline=True)
-    
-    embed.add_field(name="Features", value="""
-• Economy system with wallet and bank
-• Daily rewards of $100 for all users
-• Company creation and management
-• AI-generated quests for earning money
-• Role-based timeout system
-    """, inline=False)
-    
-    embed.set_footer(text=f"Made with ❤️ for Discord")
-    
-    await ctx.send(embed=embed)
+    await ctx.send(embed=get_info_embed())
 
 @bot.tree.command(name="info", description="Display information about the bot")
 async def info_slash(interaction: discord.Interaction):
-    embed = discord.Embed(
-        title="Discord Economy Bot",
-        description="A Discord economy bot with company creation, money management, bank system, and role-based timeout features",
-        color=discord.Color.blue()
-    )
-    
-    # Add various info fields
-    embed.add_field(name="Version", value="1.0.0", inline=True)
-    embed.add_field(name="Prefix", value=bot.command_prefix, inline=True)
-    embed.add_field(name="Server Count", value=len(bot.guilds), inline=True)
-    
-    embed.add_field(name="Features", value="""
-• Economy system with wallet and bank
-• Daily rewards of $100 for all users
-• Company creation and management
-• AI-generated quests for earning money
-• Role-based timeout system
-    """, inline=False)
-    
-    embed.set_footer(text=f"Made with ❤️ for Discord")
-    
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    await interaction.response.send_message(embed=get_info_embed(), ephemeral=True)
 
 # Admin commands
 @bot.command(name="sync")
 @commands.has_permissions(administrator=True)
-async def sync_commands(ctx):
-    """Manually sync slash commands (admin only)."""
+async def sync_commands(ctx, mode: str = None):
+    """Manually sync slash commands if they changed; use `sync force` to always sync (admin only)."""
     try:
         logging.info(f"Admin {ctx.author.name} manually syncing slash commands")
-        await bot.tree.sync()
-        await ctx.send("✅ Slash commands synced globally!")
+        if await bot.tree_syncer.sync(force=mode == "force"):
+            await ctx.send("✅ Slash commands synced globally!")
+        else:
+            await ctx.send(f"✅ Slash commands are already up to date. Use `{ctx.prefix}sync force` to sync anyway.")
     except Exception as e:
         logging.error(f"Manual sync error: {e}")
         await ctx.send(f"❌ Error syncing slash commands: {e}")
 
 @bot.tree.command(name="admin_sync", description="Manually sync slash commands (admin only)")
+@app_commands.describe(force="Sync even if the commands haven't changed since the last sync")
 @app_commands.checks.has_permissions(administrator=True)
-async def sync_commands_slash(interaction: discord.Interaction):
+async def sync_commands_slash(interaction: discord.Interaction, force: bool = False):
     """Slash command for manually syncing commands."""
     try:
         logging.info(f"Admin {interaction.user.name} manually syncing slash commands")
-        await bot.tree.sync()
-        await interaction.response.send_message("✅ Slash commands synced globally!", ephemeral=True)
+        if await bot.tree_syncer.sync(force=force):
+            await interaction.response.send_message("✅ Slash commands synced globally!", ephemeral=True)
+        else:
+            await interaction.response.send_message(
+                "✅ Slash commands are already up to date. Use `force:True` to sync anyway.",
+                ephemeral=True
+            )
     except Exception as e:
         logging.error(f"Manual sync error: {e}")
         await interaction.response.send_message(f"❌ Error syncing slash commands: {e}", ephemeral=True)
@@ -380,6 +282,12 @@ async def sync_slash_error(interaction: discord.Interaction, error):
         logging.error(f"Sync slash command error: {error}")
         await interaction.response.send_message(f"❌ An error occurred: {error}", ephemeral=True)
 
-def run_bot(token):
-    """Run the bot with the given token."""
+def run_bot(token, force_sync=False):
+    """Run the bot with the given token.
+    
+    Args:
+        token: The Discord bot token
+        force_sync: Sync slash commands on startup even if they haven't changed
+    """
+    bot.force_sync = force_sync
     bot.run(token)
@@ -2,6 +2,49 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
+import functools
+import time
+
+# Per-core counters: core name -> {"calls", "failures", "total_seconds"}
+core_stats = {}
+
+class CommandResult:
+    """Transport-agnostic outcome of a command core.
+    
+    The prefix and slash adapters in BaseCog turn it into a reply; prefix
+    commands ignore ``ephemeral``.
+    """
+    
+    __slots__ = ("content", "embed", "ephemeral", "success")
+    
+    def __init__(self, content=None, embed=None, ephemeral=False, success=True):
+        self.content = content
+        self.embed = embed
+        self.ephemeral = ephemeral
+        self.success = success
+        
+    @classmethod
+    def error(cls, content):
+        """A failed result, shown privately where the transport allows it."""
+        return cls(content, ephemeral=True, success=False)
+        
+def command_core(func):
+    """Decorator for command cores that records timings and failures per core."""
+    name = func.__name__
+    
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        started = time.monotonic()
+        result = await func(*args, **kwargs)
+        
+        stats = core_stats.setdefault(name, {"calls": 0, "failures": 0, "total_seconds": 0.0})
+        stats["calls"] += 1
+        stats["total_seconds"] += time.monotonic() - started
+        if not result.success:
+            stats["failures"] += 1
+            
+        return result
+    return wrapper
 
 class BaseCog(commands.Cog):
     """Base cog class with helper methods for both prefix and slash commands."""
@@ -10,18 +53,43 @@ class BaseCog(commands.Cog):
         self.bot = bot
         
     async def sync_slash_commands(self):
-        """Sync slash commands for the current cog."""
+        """Sync slash commands for the current cog (skipped if they haven't changed)."""
         try:
             # Sync for the current guild if available, otherwise globally
             if hasattr(self, 'guild') and self.guild:
-                await self.bot.tree.sync(guild=self.guild)
-                logging.info(f"Synced slash commands for {self.__class__.__name__} in guild {self.guild.name}")
+                if await self.bot.tree_syncer.sync(guild=self.guild):
+                    logging.info(f"Synced slash commands for {self.__class__.__name__} in guild {self.guild.name}")
             else:
-                await self.bot.tree.sync()
-                logging.info(f"Synced slash commands globally for {self.__class__.__name__}")
+                if await self.bot.tree_syncer.sync():
+                    logging.info(f"Synced slash commands globally for {self.__class__.__name__}")
         except Exception as e:
             logging.error(f"Failed to sync slash commands for {self.__class__.__name__}: {e}")
     
+    async def send_result(self, ctx, result):
+        """Prefix adapter: reply to a command with a CommandResult."""
+        await ctx.send(content=result.content, embed=result.embed)
+        
+    async def respond_result(self, interaction, result):
+        """Slash adapter: respond to an interaction with a CommandResult."""
+        kwargs = {"ephemeral": result.ephemeral}
+        if result.embed is not None:
+            kwargs["embed"] = result.embed
+        await interaction.response.send_message(result.content, **kwargs)
+    
+    async def get_user(self, user_id):
+        """Get a user from the bot's cache, fetching them if needed (None if they don't exist).
+        
+        Guild member caches are only filled on demand, so notices that just need
+        someone to DM look up the user instead of the member.
+        """
+        user = self.bot.get_user(user_id)
+        if user is None:
+            try:
+                user = await self.bot.fetch_user(user_id)
+            except discord.HTTPException:
+                return None
+        return user
+    
     def create_embed(self, title, description=None, color=discord.Color.blue()):
         """Create a standard embed with consistent styling."""
         embed = discord.Embed(
@@ -3,8 +3,39 @@ from discord.ext import commands
 from discord import app_commands
 import logging
 import asyncio
+from datetime import datetime, timedelta
 from utils.database import Database
-from cogs.base_cog import BaseCog
+from utils.config import COMPANY_CREATOR_ROLES, ACTIVITY_BONUS
+from utils.permissions import permission_resolver
+from utils.interactions import auto_defer, defer_if_slow
+from utils.members import member_resolver
+from cogs.base_cog import BaseCog, CommandResult, command_core
+
+class CompanyActionButton(discord.ui.DynamicItem[discord.ui.Button], template=r"company:(?P<action>\w+):(?P<id>\d+)"):
+    """Invite or disband confirmation button.
+    
+    The action and the pending action ID live in the custom_id
+    ("company:<action>:<action_id>"), so this class is registered once with
+    the bot and handles every such button, even after a restart, without
+    keeping a view in memory per message.
+    """
+    
+    def __init__(self, action, action_id, label=None, style=discord.ButtonStyle.grey):
+        super().__init__(discord.ui.Button(label=label, style=style, custom_id=f"company:{action}:{action_id}"))
+        self.action = action
+        self.action_id = action_id
+        
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["action"], int(match["id"]), item.label, item.style)
+        
+    async def callback(self, interaction):
+        company = interaction.client.get_cog("Company")
+        if company is None:
+            await interaction.response.send_message("Company commands are unavailable right now.", ephemeral=True)
+            return
+            
+        await company.handle_component(interaction, self.action, self.action_id)
 
 class Company(BaseCog):
     """Cog for handling company-related commands and features."""
@@ -12,19 +43,162 @@ class Company(BaseCog):
     def __init__(self, bot):
         super().__init__(bot)
         self.db = Database()
-        # Role IDs that can create companies
-        self.creator_role_ids = [
-            1352694494797234237,  # level 35
-            1352694494813749299   # level 50
-        ]
         self.max_company_members = 10  # Maximum members per company
         self.notification_channel_id = 1352694495530975240  # Channel for notifications
+        self.invite_timeout = 300  # Seconds an invitation can be accepted for
+        self.disband_timeout = 60  # Seconds a disband confirmation stays valid
+        
+    async def cog_load(self):
+        """Route invite and disband button clicks to this cog."""
+        self.bot.add_dynamic_items(CompanyActionButton)
+        
+    async def cog_unload(self):
+        """Stop routing button clicks to this cog."""
+        self.bot.remove_dynamic_items(CompanyActionButton)
         
     async def send_notification(self, guild, message):
-        """Send a notification to the designated channel."""
+        """Queue a notification for the designated channel."""
         channel = guild.get_channel(self.notification_channel_id)
         if channel:
-            await channel.send(message)
+            self.bot.outbox.send(channel, message)
+        
+    @staticmethod
+    def confirmation_view(action_id, buttons):
+        """Build the buttons for a pending action.
+        
+        Each button is (action, label, style). The view only holds dynamic
+        items, so discord.py doesn't store it per message; clicks are matched
+        to CompanyActionButton by custom_id. Sent as an ephemeral followup
+        (the auto-deferred /disband) the view gets a forced 15 minute timeout,
+        which doesn't matter here: it only ends the view object, the buttons
+        keep working, and the pending action expires on its own schedule.
+        """
+        view = discord.ui.View(timeout=None)
+        for action, label, style in buttons:
+            view.add_item(CompanyActionButton(action, action_id, label, style))
+        return view
+        
+    def create_invitation(self, owner, member, company_data):
+        """Store a pending invitation and build its embed and buttons."""
+        action_id = self.db.create_pending_action(
+            "invite", member.id, datetime.now() + timedelta(seconds=self.invite_timeout),
+            company_id=company_data["id"], owner_id=owner.id
+        )
+        
+        embed = discord.Embed(
+            title="Company Invitation",
+            description=f"{owner.display_name} is inviting you to join '{company_data['name']}'!",
+            color=discord.Color.gold()
+        )
+        embed.add_field(name="Respond", value="Use the buttons below to accept or decline. The invitation expires in 5 minutes.", inline=False)
+        
+        # Bonus notification for reaching 6 members
+        current_member_count = len(company_data.get("employees", [])) + 1  # +1 for owner
+        if current_member_count == 5:  # Will become 6 members when accepted
+            embed.add_field(
+                name="Special Notice",
+                value="This invitation will push the company to 6 members, unlocking the +$25 per active member bonus!",
+                inline=False
+            )
+            
+        view = self.confirmation_view(action_id, [
+            ("invite_accept", "Accept", discord.ButtonStyle.green),
+            ("invite_decline", "Decline", discord.ButtonStyle.red)
+        ])
+        return embed, view
+        
+    def create_disband_confirmation(self, owner, company_data):
+        """Store a pending disband confirmation and build its embed and buttons."""
+        action_id = self.db.create_pending_action(
+            "disband", owner.id, datetime.now() + timedelta(seconds=self.disband_timeout),
+            company_id=company_data["id"]
+        )
+        
+        embed = discord.Embed(
+            title="Confirm Company Disbanding",
+            description=f"Are you sure you want to disband '{company_data['name']}'? This cannot be undone!",
+            color=discord.Color.red()
+        )
+        
+        view = self.confirmation_view(action_id, [
+            ("disband_confirm", "Yes, disband company", discord.ButtonStyle.red),
+            ("disband_cancel", "No, keep company", discord.ButtonStyle.grey)
+        ])
+        return embed, view
+        
+    async def handle_component(self, interaction, action, action_id):
+        """Handle a click on an invite or disband button."""
+        pending = self.db.get_pending_action(action_id)
+        
+        if pending is not None and interaction.user.id != pending["user_id"]:
+            await interaction.response.send_message("These buttons aren't for you!", ephemeral=True)
+            return
+            
+        # Remove the buttons so the action can't be answered twice
+        await interaction.response.edit_message(view=None)
+        
+        if pending is None or self.db.pop_pending_action(action_id) is None:
+            await interaction.followup.send("This confirmation has expired.", ephemeral=True)
+            return
+            
+        if action == "invite_accept":
+            await interaction.followup.send(await self.accept_invitation(interaction.guild, interaction.user, pending))
+        elif action == "invite_decline":
+            await interaction.followup.send(f"{interaction.user.mention} declined the invitation.")
+        elif action == "disband_confirm":
+            await interaction.followup.send(self.confirm_disband(interaction.user.id, pending))
+        else:
+            await interaction.followup.send("Company disbanding cancelled.", ephemeral=True)
+            
+    async def accept_invitation(self, guild, member, pending):
+        """Add an invited member to the company. Returns the message to show."""
+        company_data = self.db.get_company_by_id(pending["company_id"])
+        
+        # Things may have changed since the invitation was sent
+        if not company_data:
+            return "That company no longer exists!"
+            
+        if self.db.get_user_company(member.id):
+            return f"{member.mention} is already in a company!"
+            
+        if len(company_data.get("employees", [])) >= self.max_company_members - 1:  # -1 for the owner
+            return f"'{company_data['name']}' has reached the maximum member limit of {self.max_company_members}!"
+            
+        result = self.db.add_employee_to_company(company_data["id"], member.id)
+        
+        if not result["success"]:
+            return f"Error: {result['message']}"
+            
+        # Check if this pushed the company above 5 members
+        if result.get("unlocked_bonus", False):
+            base_bonus = COMPANY_CREATOR_ROLES.get(result.get("creator_role_id"), ACTIVITY_BONUS)
+            
+            bonus_message = (
+                f"🎉 **BONUS UNLOCKED!** 🎉\n"
+                f"{member.mention} has joined {result['company_name']}! "
+                f"The company now has 6 members and qualifies for the +$25 bonus per active member!\n"
+                f"New activity bonus: ${base_bonus + 25} per active member per hour"
+            )
+            
+            # Also announce it in the notification channel
+            await self.send_notification(guild, bonus_message)
+            
+            return bonus_message
+            
+        return f"{member.mention} has joined {company_data['name']}!"
+        
+    def confirm_disband(self, user_id, pending):
+        """Disband the company of a confirmed disband action. Returns the message to show."""
+        company_data = self.db.get_company_by_id(pending["company_id"])
+        
+        if not company_data or company_data["owner_id"] != user_id:
+            return "You don't own that company anymore!"
+            
+        result = self.db.delete_company(company_data["id"])
+        
+        if result["success"]:
+            return f"'{company_data['name']}' has been disbanded."
+        return f"Error: {result['message']}"
         
     @commands.command(name="createcompany", aliases=["newcompany"])
     async def create_company(self, ctx, *, company_name: str):
@@ -32,12 +206,7 @@ class Company(BaseCog):
         user_id = ctx.author.id
         
         # Check if user has the necessary role to create a company
-        creator_role_id = None
-        for role in ctx.author.roles:
-            if role.id in self.creator_role_ids:
-                creator_role_id = role.id
-                role_name = role.name
-                break
+        creator_role_id = permission_resolver.resolve(ctx.author).company_role_id
                 
         if not creator_role_id:
             await ctx.send("You need the 'level 35' or 'level 50' role to create a company!")
@@ -65,7 +234,7 @@ class Company(BaseCog):
         
         if result["success"]:
             # Calculate bonus based on role
-            bonus = 25 if creator_role_id == 1352694494797234237 else 50  # 25$ for level 35, 50$ for level 50
+            bonus = COMPANY_CREATOR_ROLES[creator_role_id]
             
             embed = discord.Embed(
                 title="Company Created",
@@ -86,52 +255,31 @@ class Company(BaseCog):
         else:
             await ctx.send(f"Error: {result['message']}")
             
-    @commands.command(name="company")
-    async def company_info(self, ctx, *, company_name: str = None):
-        """Display information about a company or your company."""
-        user_id = ctx.author.id
-        
+    @command_core
+    async def company_info_core(self, guild, member, company_name=None):
+        """Build the info embed for a company, or for the member's own company."""
         if company_name:
             # Look up specific company
             company_data = self.db.get_company_by_name(company_name)
         else:
             # Look up user's company
-            company_data = self.db.get_user_company(user_id)
+            company_data = self.db.get_user_company(member.id)
             
         if not company_data:
             if company_name:
-                await ctx.send(f"Company '{company_name}' not found!")
-            else:
-                await ctx.send("You are not part of any company! Join one or create your own.")
-            return
+                return CommandResult.error(f"Company '{company_name}' not found!")
+            return CommandResult.error("You are not part of any company! Join one or create your own.")
             
-        # Get owner name
-        owner = ctx.guild.get_member(company_data["owner_id"])
-        owner_name = owner.display_name if owner else f"User {company_data['owner_id']}"
-        
-        # Get employee names
-        employees = []
-        for emp_id in company_data["employees"]:
-            member = ctx.guild.get_member(emp_id)
-            if member:
-                employees.append(member.display_name)
-            else:
-                employees.append(f"User {emp_id}")
+        # Get owner and employee names in one batch
+        names = await member_resolver.display_names(guild, [company_data["owner_id"], *company_data["employees"]])
+        owner_name = names[company_data["owner_id"]]
+        employees = [names[emp_id] for emp_id in company_data["employees"]]
                 
         # Calculate activity bonus
         total_members = len(employees) + 1  # +1 for owner
         
         # Base bonus based on creator role
-        creator_role_id = company_data.get("creator_role_id")
-        if creator_role_id == 1352694494797234237:  # level 35
-            base_bonus = 25
-            role_name = "level 35"
-        elif creator_role_id == 1352694494813749299:  # level 50
-            base_bonus = 50
-            role_name = "level 50"
-        else:
-            base_bonus = 10
-            role_name = "default"
+        base_bonus = COMPANY_CREATOR_ROLES.get(company_data.get("creator_role_id"), ACTIVITY_BONUS)
             
         # Extra bonus for companies with more than 5 members
         bonus_amount = base_bonus
@@ -157,7 +305,12 @@ class Company(BaseCog):
             embed.add_field(name="Employee List", value=", ".join(employees[:10]) + 
                 ("..." if len(employees) > 10 else ""), inline=False)
             
-        await ctx.send(embed=embed)
+        return CommandResult(embed=embed)
+        
+    @commands.command(name="company")
+    async def company_info(self, ctx, *, company_name: str = None):
+        """Display information about a company or your company."""
+        await self.send_result(ctx, await self.company_info_core(ctx.guild, ctx.author, company_name))
     
     @commands.command(name="invite")
     async def invite_to_company(self, ctx, member: discord.Member):
@@ -188,72 +341,9 @@ class Company(BaseCog):
             await ctx.send(f"{member.display_name} is already in a company!")
             return
             
-        # Create an invitation embed
-        embed = discord.Embed(
-            title="Company Invitation",
-            description=f"{ctx.author.display_name} is inviting you to join '{company_data['name']}'!",
-            color=discord.Color.gold()
-        )
-        embed.add_field(name="React to Accept", value="✅ - Accept invitation\n❌ - Decline invitation", inline=False)
-        
-        # Send invitation
-        message = await ctx.send(f"{member.mention}", embed=embed)
-        
-        # Add reactions
-        await message.add_reaction("✅")
-        await message.add_reaction("❌")
-        
-        def check(reaction, user):
-            return user.id == invitee_id and str(reaction.emoji) in ["✅", "❌"] and reaction.message.id == message.id
-            
-        try:
-            reaction, user = await self.bot.wait_for('reaction_add', timeout=300.0, check=check)
-            
-            if str(reaction.emoji) == "✅":
-                # Accept invitation
-                result = self.db.add_employee_to_company(company_data["id"], invitee_id)
-                
-                if result["success"]:
-                    # Check if this pushed the company above 5 members
-                    if result.get("unlocked_bonus", False):
-                        # Get creator role info to calculate base bonus
-                        creator_role_id = result.get("creator_role_id")
-                        if creator_role_id == 1352694494797234237:  # level 35
-                            base_bonus = 25
-                        elif creator_role_id == 1352694494813749299:  # level 50
-                            base_bonus = 50
-                        else:
-                            base_bonus = 10
-                            
-                        # Format the bonus message with company info
-                        bonus_message = (
-                            f"🎉 **BONUS UNLOCKED!** 🎉\n"
-                            f"{member.mention} has joined {result['company_name']}! "
-                            f"The company now has 6 members and qualifies for the +$25 bonus per active member!\n"
-                            f"New activity bonus: ${base_bonus + 25} per active member per hour"
-                        )
-                        
-                        # Send notification
-                        await ctx.send(bonus_message)
-                        
-                        # Also notify the channel if configured
-                        if self.notification_channel:
-                            try:
-                                channel = ctx.guild.get_channel(self.notification_channel_id)
-                                if channel:
-                                    await channel.send(bonus_message)
-                            except:
-                                pass
-                    else:
-                        await ctx.send(f"{member.mention} has joined {company_data['name']}!")
-                else:
-                    await ctx.send(f"Error: {result['message']}")
-            else:
-                # Decline invitation
-                await ctx.send(f"{member.mention} declined the invitation.")
-                
-        except asyncio.TimeoutError:
-            await ctx.send(f"The invitation to {member.mention} has expired.")
+        # Send the invitation with accept/decline buttons
+        embed, view = self.create_invitation(ctx.author, member, company_data)
+        await ctx.send(f"{member.mention}", embed=embed, view=view)
             
     @commands.command(name="leave")
     async def leave_company(self, ctx):
@@ -284,18 +374,8 @@ class Company(BaseCog):
                 # Get updated company data
                 updated_company = self.db.get_company_by_id(company_data["id"])
                 if updated_company:
-                    # Get owner name for notification
-                    owner = ctx.guild.get_member(updated_company["owner_id"])
-                    owner_name = owner.mention if owner else f"User {updated_company['owner_id']}"
-                    
                     # Calculate base bonus based on creator role
-                    creator_role_id = updated_company.get("creator_role_id")
-                    if creator_role_id == 1352694494797234237:  # level 35
-                        base_bonus = 25
-                    elif creator_role_id == 1352694494813749299:  # level 50
-                        base_bonus = 50
-                    else:
-                        base_bonus = 10
+                    base_bonus = COMPANY_CREATOR_ROLES.get(updated_company.get("creator_role_id"), ACTIVITY_BONUS)
                         
                     bonus_message = (
                         f"**NOTICE:** {company_data['name']} now has 5 members and has lost the +$25 "
@@ -303,16 +383,14 @@ class Company(BaseCog):
                     )
                     await ctx.send(bonus_message)
                     
-                    # Also notify the owner
+                    # Also queue a DM to the owner (skipped if DMs are blocked)
+                    owner = await self.get_user(updated_company["owner_id"])
                     if owner:
-                        try:
-                            await owner.send(
-                                f"Your company '{updated_company['name']}' now has 5 members and has lost the "
-                                f"+$25 activity bonus. The company now earns ${base_bonus} per active member per hour."
-                            )
-                        except:
-                            # DM failed, we already sent to channel
-                            pass
+                        self.bot.outbox.send(
+                            owner,
+                            f"Your company '{updated_company['name']}' now has 5 members and has lost the "
+                            f"+$25 activity bonus. The company now earns ${base_bonus} per active member per hour."
+                        )
             
             await ctx.send(f"You have left '{company_data['name']}'!")
         else:
@@ -330,41 +408,9 @@ class Company(BaseCog):
             await ctx.send("You don't own a company!")
             return
             
-        # Confirm action
-        embed = discord.Embed(
-            title="Confirm Company Disbanding",
-            description=f"Are you sure you want to disband '{company_data['name']}'? This cannot be undone!",
-            color=discord.Color.red()
-        )
-        embed.add_field(name="React to Confirm", value="✅ - Yes, disband company\n❌ - No, keep company", inline=False)
-        
-        # Send confirmation
-        message = await ctx.send(embed=embed)
-        
-        # Add reactions
-        await message.add_reaction("✅")
-        await message.add_reaction("❌")
-        
-        def check(reaction, user):
-            return user.id == ctx.author.id and str(reaction.emoji) in ["✅", "❌"] and reaction.message.id == message.id
-            
-        try:
-            reaction, user = await self.bot.wait_for('reaction_add', timeout=60.0, check=check)
-            
-            if str(reaction.emoji) == "✅":
-                # Disband company
-                result = self.db.delete_company(company_data["id"])
-                
-                if result["success"]:
-                    await ctx.send(f"'{company_data['name']}' has been disbanded.")
-                else:
-                    await ctx.send(f"Error: {result['message']}")
-            else:
-                # Cancel disbanding
-                await ctx.send(f"Company disbanding cancelled.")
-                
-        except asyncio.TimeoutError:
-            await ctx.send("Disbanding confirmation timed out.")
+        # Ask for confirmation with buttons
+        embed, view = self.create_disband_confirmation(ctx.author, company_data)
+        await ctx.send(embed=embed, view=view)
             
     @commands.command(name="kick")
     async def kick_from_company(self, ctx, member: discord.Member):
@@ -411,9 +457,10 @@ class Company(BaseCog):
             color=discord.Color.blue()
         )
         
+        names = await member_resolver.display_names(ctx.guild, [company["owner_id"] for company in companies[:10]])
+        
         for company in companies[:10]:  # Show only the first 10 companies
-            owner = ctx.guild.get_member(company["owner_id"])
-            owner_name = owner.display_name if owner else f"User {company['owner_id']}"
+            owner_name = names[company["owner_id"]]
             
             embed.add_field(
                 name=company["name"],
@@ -429,17 +476,13 @@ class Company(BaseCog):
 # Slash command versions
     @app_commands.command(name="createcompany", description="Create a new company (requires level 35 or level 50 role)")
     @app_commands.describe(company_name="The name of your new company")
+    @auto_defer()
     async def create_company_slash(self, interaction: discord.Interaction, company_name: str):
         """Slash command for creating a company."""
         user_id = interaction.user.id
         
         # Check if user has the necessary role to create a company
-        creator_role_id = None
-        for role in interaction.user.roles:
-            if role.id in self.creator_role_ids:
-                creator_role_id = role.id
-                role_name = role.name
-                break
+        creator_role_id = permission_resolver.resolve(interaction.user).company_role_id
                 
         if not creator_role_id:
             await interaction.response.send_message(
@@ -474,12 +517,15 @@ class Company(BaseCog):
             )
             return
             
+        # The checks above each read the companies file; defer if that took a while
+        await defer_if_slow(interaction)
+        
         # Attempt to create the company with creator role ID
         result = self.db.create_company(user_id, company_name, creator_role_id)
         
         if result["success"]:
             # Calculate bonus based on role
-            bonus = 25 if creator_role_id == 1352694494797234237 else 50  # 25$ for level 35, 50$ for level 50
+            bonus = COMPANY_CREATOR_ROLES[creator_role_id]
             
             embed = discord.Embed(
                 title="Company Created",
@@ -502,86 +548,14 @@ class Company(BaseCog):
     
     @app_commands.command(name="company", description="Display information about a company")
     @app_commands.describe(company_name="The name of the company (leave empty for your own company)")
+    @auto_defer()
     async def company_info_slash(self, interaction: discord.Interaction, company_name: str = None):
         """Slash command for showing company info."""
-        user_id = interaction.user.id
-        
-        if company_name:
-            # Look up specific company
-            company_data = self.db.get_company_by_name(company_name)
-        else:
-            # Look up user's company
-            company_data = self.db.get_user_company(user_id)
-            
-        if not company_data:
-            if company_name:
-                await interaction.response.send_message(
-                    f"Company '{company_name}' not found!",
-                    ephemeral=True
-                )
-            else:
-                await interaction.response.send_message(
-                    "You are not part of any company! Join one or create your own.",
-                    ephemeral=True
-                )
-            return
-            
-        # Get owner name
-        owner = interaction.guild.get_member(company_data["owner_id"])
-        owner_name = owner.display_name if owner else f"User {company_data['owner_id']}"
-        
-        # Get employee names
-        employees = []
-        for emp_id in company_data["employees"]:
-            member = interaction.guild.get_member(emp_id)
-            if member:
-                employees.append(member.display_name)
-            else:
-                employees.append(f"User {emp_id}")
-                
-        # Calculate activity bonus
-        total_members = len(employees) + 1  # +1 for owner
-        
-        # Base bonus based on creator role
-        creator_role_id = company_data.get("creator_role_id")
-        if creator_role_id == 1352694494797234237:  # level 35
-            base_bonus = 25
-            role_name = "level 35"
-        elif creator_role_id == 1352694494813749299:  # level 50
-            base_bonus = 50
-            role_name = "level 50"
-        else:
-            base_bonus = 10
-            role_name = "default"
-            
-        # Extra bonus for companies with more than 5 members
-        bonus_amount = base_bonus
-        if total_members > 5:
-            bonus_amount += 25
-        
-        # Create an embed for company info
-        embed = discord.Embed(
-            title=f"{company_data['name']} - Company Info",
-            color=discord.Color.blue()
-        )
-        embed.add_field(name="Owner", value=owner_name, inline=False)
-        embed.add_field(name="Created", value=company_data["created_at"].strftime("%Y-%m-%d"), inline=True)
-        embed.add_field(name="Members", value=f"{total_members}/{self.max_company_members}", inline=True)
-        
-        # Activity bonus info
-        bonus_text = f"${bonus_amount} per active member per hour"
-        if total_members > 5:
-            bonus_text += f" (includes +$25 bonus for having more than 5 members)"
-        embed.add_field(name="Activity Bonus", value=bonus_text, inline=False)
-        
-        if employees:
-            embed.add_field(name="Employee List", value=", ".join(employees[:10]) + 
-                ("..." if len(employees) > 10 else ""), inline=False)
-            
-        await interaction.response.send_message(embed=embed)
+        await self.respond_result(interaction, await self.company_info_core(interaction.guild, interaction.user, company_name))
     
     @app_commands.command(name="invite", description="Invite a user to your company")
     @app_commands.describe(user="The user to invite to your company")
+    @auto_defer()
     async def invite_to_company_slash(self, interaction: discord.Interaction, user: discord.Member):
         """Slash command for inviting users to a company."""
         owner_id = interaction.user.id
@@ -608,6 +582,7 @@ class Company(BaseCog):
             return
             
         # Check if invitee is already in a company
+        await defer_if_slow(interaction)
         user_company = self.db.get_user_company(invitee_id)
         if user_company:
             await interaction.response.send_message(
@@ -616,36 +591,17 @@ class Company(BaseCog):
             )
             return
         
-        # Get current member count
-        current_member_count = len(company_data.get("employees", [])) + 1  # +1 for owner
-        
-        # Create an invitation embed
-        embed = discord.Embed(
-            title="Company Invitation",
-            description=f"{interaction.user.display_name} is inviting you to join '{company_data['name']}'!",
-            color=discord.Color.gold()
-        )
-        embed.add_field(
-            name="Instructions", 
-            value=f"To accept this invitation, type `!invite {interaction.user.display_name}` in the chat and react with ✅.", 
-            inline=False
-        )
-        
-        # Bonus notification for reaching 6 members
-        if current_member_count == 5:  # Will become 6 members when accepted
-            embed.add_field(
-                name="Special Notice",
-                value="This invitation will push the company to 6 members, unlocking the +$25 per active member bonus!",
-                inline=False
-            )
-        
-        # Send invitation
+        # Send the invitation with accept/decline buttons
+        await defer_if_slow(interaction)
+        embed, view = self.create_invitation(interaction.user, user, company_data)
         await interaction.response.send_message(
             f"{user.mention} has been invited to join your company!",
-            embed=embed
+            embed=embed,
+            view=view
         )
     
     @app_commands.command(name="leave", description="Leave your current company")
+    @auto_defer()
     async def leave_company_slash(self, interaction: discord.Interaction):
         """Slash command for leaving a company."""
         user_id = interaction.user.id
@@ -668,26 +624,23 @@ class Company(BaseCog):
         # Calculate current member count
         current_member_count = len(company_data.get("employees", [])) + 1  # +1 for owner
         
+        await defer_if_slow(interaction)
+        
         # Remove user from company
         result = self.db.remove_employee_from_company(company_data["id"], user_id)
         
         if result["success"]:
+            # Send the primary success message first; the notice below is a followup to it
+            await interaction.response.send_message(f"You have left '{company_data['name']}'!")
+            
             # Check if this causes the company to lose their bonus (going from 6 to 5 members)
             if current_member_count == 6:
                 # Get updated company data
+                await defer_if_slow(interaction)
                 updated_company = self.db.get_company_by_id(company_data["id"])
                 if updated_company:
-                    # Get owner for notification
-                    owner = interaction.guild.get_member(updated_company["owner_id"])
-                    
                     # Calculate base bonus based on creator role
-                    creator_role_id = updated_company.get("creator_role_id")
-                    if creator_role_id == 1352694494797234237:  # level 35
-                        base_bonus = 25
-                    elif creator_role_id == 1352694494813749299:  # level 50
-                        base_bonus = 50
-                    else:
-                        base_bonus = 10
+                    base_bonus = COMPANY_CREATOR_ROLES.get(updated_company.get("creator_role_id"), ACTIVITY_BONUS)
                         
                     bonus_message = (
                         f"**NOTICE:** {company_data['name']} now has 5 members and has lost the +$25 "
@@ -697,23 +650,19 @@ class Company(BaseCog):
                     # Send public notice in channel
                     await interaction.followup.send(bonus_message)
                     
-                    # Also notify the owner via DM
+                    # Also queue a DM to the owner (skipped if DMs are blocked)
+                    owner = await self.get_user(updated_company["owner_id"])
                     if owner:
-                        try:
-                            await owner.send(
-                                f"Your company '{updated_company['name']}' now has 5 members and has lost the "
-                                f"+$25 activity bonus. The company now earns ${base_bonus} per active member per hour."
-                            )
-                        except:
-                            # DM failed, we already sent to channel
-                            pass
-            
-            # Send the primary success message
-            await interaction.response.send_message(f"You have left '{company_data['name']}'!")
+                        self.bot.outbox.send(
+                            owner,
+                            f"Your company '{updated_company['name']}' now has 5 members and has lost the "
+                            f"+$25 activity bonus. The company now earns ${base_bonus} per active member per hour."
+                        )
         else:
             await interaction.response.send_message(f"Error: {result['message']}", ephemeral=True)
     
     @app_commands.command(name="disband", description="Disband your company as the owner")
+    @auto_defer(ephemeral=True)
     async def disband_company_slash(self, interaction: discord.Interaction):
         """Slash command for disbanding a company."""
         user_id = interaction.user.id
@@ -725,52 +674,14 @@ class Company(BaseCog):
             await interaction.response.send_message("You don't own a company!", ephemeral=True)
             return
             
-        # Confirm action
-        embed = discord.Embed(
-            title="Confirm Company Disbanding",
-            description=f"Are you sure you want to disband '{company_data['name']}'? This cannot be undone!",
-            color=discord.Color.red()
-        )
-        embed.add_field(
-            name="Instructions", 
-            value="Use `/confirm_disband confirm:yes` to confirm disbanding or `/confirm_disband confirm:no` to cancel.", 
-            inline=False
-        )
-        
-        # We can't use reactions with slash commands easily, so we'll use a follow-up command
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-    
-    @app_commands.command(name="confirm_disband", description="Confirm disbanding your company")
-    @app_commands.describe(confirm="Type 'yes' to confirm or 'no' to cancel")
-    @app_commands.choices(confirm=[
-        app_commands.Choice(name="Yes, disband the company", value="yes"),
-        app_commands.Choice(name="No, keep the company", value="no")
-    ])
-    async def confirm_disband_slash(self, interaction: discord.Interaction, confirm: str):
-        """Slash command for confirming company disbanding."""
-        user_id = interaction.user.id
-        
-        # Check if user owns a company
-        company_data = self.db.get_user_owned_company(user_id)
-        
-        if not company_data:
-            await interaction.response.send_message("You don't own a company!", ephemeral=True)
-            return
-        
-        if confirm.lower() == "yes":
-            # Disband company
-            result = self.db.delete_company(company_data["id"])
-            
-            if result["success"]:
-                await interaction.response.send_message(f"'{company_data['name']}' has been disbanded.")
-            else:
-                await interaction.response.send_message(f"Error: {result['message']}", ephemeral=True)
-        else:
-            # Cancel disbanding
-            await interaction.response.send_message("Company disbanding cancelled.", ephemeral=True)
+        # Ask for confirmation with buttons
+        await defer_if_slow(interaction)
+        embed, view = self.create_disband_confirmation(interaction.user, company_data)
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
     
     @app_commands.command(name="kick", description="Kick a member from your company")
     @app_commands.describe(user="The user to kick from your company")
+    @auto_defer()
     async def kick_from_company_slash(self, interaction: discord.Interaction, user: discord.Member):
         """Slash command for kicking users from a company."""
         owner_id = interaction.user.id
@@ -792,6 +703,7 @@ class Company(BaseCog):
             return
             
         # Remove member from company
+        await defer_if_slow(interaction)
         result = self.db.remove_employee_from_company(company_data["id"], target_id)
         
         if result["success"]:
@@ -804,6 +716,7 @@ class Company(BaseCog):
             await interaction.response.send_message(f"Error: {result['message']}", ephemeral=True)
 
     @app_commands.command(name="companies", description="List all companies on the server")
+    @auto_defer()
     async def list_companies_slash(self, interaction: discord.Interaction):
         """Slash command for listing all companies."""
         companies = self.db.get_all_companies()
@@ -818,9 +731,10 @@ class Company(BaseCog):
             color=discord.Color.blue()
         )
         
+        names = await member_resolver.display_names(interaction.guild, [company["owner_id"] for company in companies[:10]])
+        
         for company in companies[:10]:  # Show only the first 10 companies
-            owner = interaction.guild.get_member(company["owner_id"])
-            owner_name = owner.display_name if owner else f"User {company['owner_id']}"
+            owner_name = names[company["owner_id"]]
             
             embed.add_field(
                 name=company["name"],
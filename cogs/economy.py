@@ -8,7 +8,12 @@ import logging
 from typing import Optional
 from utils.database import Database
 from utils.quests import QuestGenerator
-from cogs.base_cog import BaseCog
+from utils.cooldowns import CooldownStore
+from utils.robbery import RobberySessions
+from utils.config import QUEST_COOLDOWN, ROBBERY_COOLDOWN, ROBBERY_JOIN_WINDOW, MIN_ROBBERS
+from utils.interactions import auto_defer, defer_if_slow
+from utils.members import member_resolver
+from cogs.base_cog import BaseCog, CommandResult, command_core
 
 class Economy(BaseCog):
     """Cog for handling all economy-related commands and functions."""
@@ -17,24 +22,153 @@ class Economy(BaseCog):
         super().__init__(bot)
         self.db = Database()
         self.quest_generator = QuestGenerator()
-        self.quest_cooldowns = {}
-        self.rob_attempts = {}  # Track robbery attempts {target_id: [user_ids]}
+        # Shared cooldown store: "quest" is keyed by user ID, "rob" by robbery target ID
+        self.cooldowns = CooldownStore(self.db)
+        self.robberies = RobberySessions(ROBBERY_JOIN_WINDOW)  # Pending robbery attempts by target ID
+        
+        # Accepted quests live in a persisted table; one scheduler job resolves them at their deadlines
+        self.bot.scheduler.register("quest_sweep", self.resolve_due_quests)
+        self.arm_quest_sweep()
+        
+    async def cog_load(self):
+        """Start warming the quest pool when the cog is loaded."""
+        self.quest_generator.start_pool()
+        
+    async def cog_unload(self):
+        """Stop the quest pool refill task when the cog is unloaded."""
+        await self.quest_generator.stop_pool()
+        
+    def owns_quest(self, quest):
+        """Whether this process resolves a quest: the one running its guild's shard."""
+        return self.bot.shard_context.owns_guild(quest.get("guild_id"))
+        
+    def arm_quest_sweep(self):
+        """Make sure the quest sweep job runs by the earliest deadline of this process's quests."""
+        next_deadline = self.db.next_quest_deadline(owns_quest=self.owns_quest)
+        if next_deadline is not None:
+            self.bot.scheduler.ensure_due_by("quest_sweep", next_deadline, key="quest_sweep")
+            
+    async def resolve_due_quests(self, payload):
+        """Scheduler handler that resolves this process's quests whose time limit is up."""
+        for quest in self.db.pop_due_quests(owns_quest=self.owns_quest):
+            user_id = quest["user_id"]
+            
+            # Roll for success (70% chance)
+            if random.random() < 0.7:
+                # Success
+                self.db.add_money(user_id, quest["reward"])
+                message = f"<@{user_id}>, you completed the quest and earned ${quest['reward']}!"
+            else:
+                # Failure
+                message = f"<@{user_id}>, you failed to complete the quest. Better luck next time!"
+                
+            # Results due at the same time in one channel go out as a single message
+            channel = self.bot.get_channel(quest["channel_id"])
+            if channel:
+                self.bot.outbox.send(channel, message)
+                    
+        # Wake up again for the next deadline
+        self.arm_quest_sweep()
 
-    @commands.command(name="balance", aliases=["bal"])
-    async def balance(self, ctx):
-        """Check your current balance (wallet and bank)."""
-        user_id = ctx.author.id
-        user_data = self.db.get_or_create_user(user_id)
+    def settle_robbery(self, session):
+        """Settle a robbery with enough robbers as one atomic multi-account update.
+        
+        Returns:
+            dict: A dictionary with success status, the amount stolen and each robber's cut
+        """
+        # The session is over either way
+        self.robberies.close(session.target_id)
+        
+        target_data = self.db.get_or_create_user(session.target_id)
+        
+        # Check if target has money in wallet
+        if target_data["wallet"] <= 0:
+            return {"success": False}
+            
+        # Calculate amount to rob (10-25% of wallet), at least $10 but never more than the wallet
+        rob_amount = int(target_data["wallet"] * random.uniform(0.1, 0.25))
+        rob_amount = min(max(rob_amount, 10), target_data["wallet"])
+        
+        # Split the money between robbers
+        split_amount = rob_amount // len(session.robbers)
+        
+        # Take the money from the target and pay every robber in a single write
+        changes = {robber_id: split_amount for robber_id in session.robbers}
+        changes[session.target_id] = -rob_amount
+        result = self.db.apply_wallet_changes(changes)
+        
+        if not result["success"]:
+            return {"success": False}
+            
+        # Set the cooldown for robbing this target again
+        self.cooldowns.set("rob", session.target_id, ROBBERY_COOLDOWN)
+        
+        return {"success": True, "amount": rob_amount, "split_amount": split_amount}
+
+    @command_core
+    async def balance_core(self, member):
+        """Build a member's balance embed."""
+        user_data = self.db.get_or_create_user(member.id)
         
         embed = discord.Embed(
-            title=f"{ctx.author.display_name}'s Balance",
+            title=f"{member.display_name}'s Balance",
             color=discord.Color.green()
         )
         embed.add_field(name="Wallet", value=f"${user_data['wallet']}", inline=True)
         embed.add_field(name="Bank", value=f"${user_data['bank']}", inline=True)
         embed.add_field(name="Total", value=f"${user_data['wallet'] + user_data['bank']}", inline=False)
         
-        await ctx.send(embed=embed)
+        return CommandResult(embed=embed, ephemeral=True)
+        
+    @command_core
+    async def rob_core(self, guild, robber, target, join_hint):
+        """Join a robbery on a target, settling it once enough robbers have joined.
+        
+        Args:
+            guild: The guild the robbery happens in
+            robber: The member joining the robbery
+            target: The member being robbed
+            join_hint: How other users can join, shown while more robbers are needed
+        """
+        # Can't rob yourself
+        if robber.id == target.id:
+            return CommandResult.error("You can't rob yourself!")
+        
+        # Check if target has already been robbed recently
+        if self.cooldowns.remaining("rob", target.id):
+            return CommandResult.error(f"{target.display_name} has already been robbed recently. Try again later!")
+        
+        # Join (or open) the robbery session for this target
+        session, joined = self.robberies.join(target.id, robber.id)
+        if not joined:
+            return CommandResult.error("You're already part of this robbery attempt!")
+            
+        robbers_count = len(session.robbers)
+        
+        if robbers_count < MIN_ROBBERS:
+            # Not enough robbers yet
+            return CommandResult(
+                f"{robber.display_name} wants to rob {target.display_name}! "
+                f"{MIN_ROBBERS - robbers_count} more people needed! Use {join_hint} to join."
+            )
+            
+        # Enough robbers to attempt the robbery
+        await defer_if_slow()
+        result = self.settle_robbery(session)
+        
+        if not result["success"]:
+            return CommandResult(f"{target.display_name} has no money in their wallet to rob!", success=False)
+            
+        # Mentions are built from the IDs; robbers may not be in the member cache
+        robbers_list = " ".join(f"<@{robber_id}>" for robber_id in session.robbers)
+        return CommandResult(
+            f"Robbery successful! {robbers_list} robbed {target.mention} of ${result['amount']} and each got ${result['split_amount']}!"
+        )
+        
+    @commands.command(name="balance", aliases=["bal"])
+    async def balance(self, ctx):
+        """Check your current balance (wallet and bank)."""
+        await self.send_result(ctx, await self.balance_core(ctx.author))
 
     @commands.command(name="daily")
     async def daily(self, ctx):
@@ -204,26 +338,26 @@ class Economy(BaseCog):
         await ctx.send(embed=requester_embed)
         
         # Send notification to recipient
-        try:
-            recipient_embed = discord.Embed(
-                title="Money Request Received",
-                description=f"{ctx.author.display_name} has requested ${amount} from you!",
-                color=discord.Color.blue()
-            )
-            if reason:
-                recipient_embed.add_field(name="Reason", value=reason, inline=False)
-            recipient_embed.add_field(name="Request ID", value=f"#{request['id']}", inline=True)
-            recipient_embed.add_field(
-                name="How to respond", 
-                value=f"Use `!pay {ctx.author.display_name} {amount}` to accept\nor `!reject {request['id']}` to decline", 
-                inline=False
-            )
-            
-            # Try to DM the recipient
-            await recipient.send(embed=recipient_embed)
-        except discord.Forbidden:
-            # If DM is blocked, send in the same channel
-            await ctx.send(f"{recipient.mention}, you have received a money request! Check your DMs or use `!requests` to view it.")
+        recipient_embed = discord.Embed(
+            title="Money Request Received",
+            description=f"{ctx.author.display_name} has requested ${amount} from you!",
+            color=discord.Color.blue()
+        )
+        if reason:
+            recipient_embed.add_field(name="Reason", value=reason, inline=False)
+        recipient_embed.add_field(name="Request ID", value=f"#{request['id']}", inline=True)
+        recipient_embed.add_field(
+            name="How to respond", 
+            value=f"Use `!pay {ctx.author.display_name} {amount}` to accept\nor `!reject {request['id']}` to decline", 
+            inline=False
+        )
+        
+        # Queue a DM to the recipient; if DMs are blocked, mention them in the same channel instead
+        self.bot.outbox.send(
+            recipient,
+            embed=recipient_embed,
+            fallback=(ctx.channel, f"{recipient.mention}, you have received a money request! Check your DMs or use `!requests` to view it.")
+        )
             
     @commands.command(name="requests", aliases=["reqs"])
     async def view_requests(self, ctx):
@@ -244,25 +378,30 @@ class Economy(BaseCog):
             color=discord.Color.blue()
         )
         
-        # Add received requests
         received_requests = [req for req in requests if req["recipient_id"] == user_id]
+        sent_requests = [req for req in requests if req["requester_id"] == user_id]
+        
+        # Resolve every name shown below in one batch
+        names = await member_resolver.display_names(
+            ctx.guild,
+            [req["requester_id"] for req in received_requests[:5]] + [req["recipient_id"] for req in sent_requests[:5]]
+        )
+        
+        # Add received requests
         if received_requests:
             received_text = ""
             for req in received_requests[:5]:  # Show only top 5
-                requester = ctx.guild.get_member(req["requester_id"])
-                requester_name = requester.display_name if requester else f"User {req['requester_id']}"
+                requester_name = names[req["requester_id"]]
                 reason_text = f" - {req['reason']}" if req["reason"] else ""
                 received_text += f"#{req['id']} | From: {requester_name} | Amount: ${req['amount']}{reason_text}\n"
             
             embed.add_field(name="Money Requested From You", value=received_text or "None", inline=False)
         
         # Add sent requests
-        sent_requests = [req for req in requests if req["requester_id"] == user_id]
         if sent_requests:
             sent_text = ""
             for req in sent_requests[:5]:  # Show only top 5
-                recipient = ctx.guild.get_member(req["recipient_id"])
-                recipient_name = recipient.display_name if recipient else f"User {req['recipient_id']}"
+                recipient_name = names[req["recipient_id"]]
                 reason_text = f" - {req['reason']}" if req["reason"] else ""
                 sent_text += f"#{req['id']} | To: {recipient_name} | Amount: ${req['amount']}{reason_text}\n"
             
@@ -298,7 +437,7 @@ class Economy(BaseCog):
         
         if result["success"]:
             # Notify the requester
-            requester = ctx.guild.get_member(request["requester_id"])
+            requester = await self.get_user(request["requester_id"])
             
             # Create embed for recipient (current user)
             recipient_embed = discord.Embed(
@@ -308,18 +447,14 @@ class Economy(BaseCog):
             )
             await ctx.send(embed=recipient_embed)
             
-            # Try to notify the requester
+            # Queue a DM to the requester (skipped if DMs are blocked)
             if requester:
-                try:
-                    requester_embed = discord.Embed(
-                        title="Money Request Rejected",
-                        description=f"{ctx.author.display_name} has rejected your request for ${request['amount']}.",
-                        color=discord.Color.red()
-                    )
-                    await requester.send(embed=requester_embed)
-                except discord.Forbidden:
-                    # If DM is blocked, we'll just skip notification
-                    pass
+                requester_embed = discord.Embed(
+                    title="Money Request Rejected",
+                    description=f"{ctx.author.display_name} has rejected your request for ${request['amount']}.",
+                    color=discord.Color.red()
+                )
+                self.bot.outbox.send(requester, embed=requester_embed)
         else:
             await ctx.send(f"Error: {result['message']}")
 
@@ -329,18 +464,22 @@ class Economy(BaseCog):
         user_id = ctx.author.id
         
         # Check cooldown
-        now = datetime.now()
-        if user_id in self.quest_cooldowns and now < self.quest_cooldowns[user_id]:
-            time_left = self.quest_cooldowns[user_id] - now
-            minutes, seconds = divmod(time_left.seconds, 60)
+        time_left = self.cooldowns.remaining("quest", user_id)
+        if time_left:
+            minutes, seconds = divmod(int(time_left), 60)
             await ctx.send(f"You need to wait {minutes}m {seconds}s before getting another quest!")
             return
+            
+        # Only one quest can be in progress at a time
+        if self.db.get_active_quest(user_id):
+            await ctx.send("You already have an active quest! Finish it before getting another one.")
+            return
         
         # Generate a quest
-        quest_data = await self.quest_generator.generate_quest(ctx.author.display_name)
+        quest_data = await self.quest_generator.generate_quest(ctx.author.display_name, user_id)
         
         # Set cooldown (30 minutes)
-        self.quest_cooldowns[user_id] = now + timedelta(minutes=30)
+        self.cooldowns.set("quest", user_id, QUEST_COOLDOWN)
         
         # Create embed for quest
         embed = discord.Embed(
@@ -358,27 +497,21 @@ class Economy(BaseCog):
         await message.add_reaction("✅")  # Accept
         await message.add_reaction("❌")  # Decline
         
-        def check(reaction, user):
-            return user == ctx.author and str(reaction.emoji) in ["✅", "❌"] and reaction.message.id == message.id
-        
         try:
-            reaction, user = await self.bot.wait_for('reaction_add', timeout=60.0, check=check)
+            emoji = await self.bot.reaction_dispatcher.wait_for_reaction(message, user_id, timeout=60.0)
             
-            if str(reaction.emoji) == "✅":
-                # Quest accepted
-                await ctx.send(f"Quest accepted! You have {quest_data['time_limit']} minutes to complete it.")
-                
-                # Wait for the time limit
-                await asyncio.sleep(quest_data['time_limit'] * 60)
+            if emoji == "✅":
+                # Quest accepted; the quest sweep resolves it when the time limit is up
+                deadline = datetime.now() + timedelta(minutes=quest_data['time_limit'])
+                result = self.db.start_quest(
+                    user_id, ctx.channel.id, quest_data, deadline, guild_id=ctx.guild.id if ctx.guild else None
+                )
                 
-                # Roll for success (70% chance)
-                if random.random() < 0.7:
-                    # Success
-                    self.db.add_money(user_id, quest_data['reward'])
-                    await ctx.send(f"{ctx.author.mention}, you completed the quest and earned ${quest_data['reward']}!")
+                if result["success"]:
+                    self.arm_quest_sweep()
+                    await ctx.send(f"Quest accepted! You have {quest_data['time_limit']} minutes to complete it.")
                 else:
-                    # Failure
-                    await ctx.send(f"{ctx.author.mention}, you failed to complete the quest. Better luck next time!")
+                    await ctx.send(f"Error: {result['message']}")
             else:
                 # Quest declined
                 await ctx.send("Quest declined. You can get another quest in 30 minutes.")
@@ -389,77 +522,8 @@ class Economy(BaseCog):
     @commands.command(name="rob")
     async def rob(self, ctx, target: discord.Member):
         """Attempt to rob another user (requires 5+ people)."""
-        user_id = ctx.author.id
-        target_id = target.id
-        
-        # Can't rob yourself
-        if user_id == target_id:
-            await ctx.send("You can't rob yourself!")
-            return
-        
-        # Check if target has already been robbed recently
-        if target_id in self.rob_attempts and "last_robbed" in self.rob_attempts[target_id]:
-            last_robbed = self.rob_attempts[target_id]["last_robbed"]
-            if datetime.now() < last_robbed + timedelta(hours=1):
-                await ctx.send(f"{target.display_name} has already been robbed recently. Try again later!")
-                return
-        
-        # Initialize rob attempt for this target if it doesn't exist
-        if target_id not in self.rob_attempts:
-            self.rob_attempts[target_id] = {"users": []}
-        
-        # Check if this user already joined the rob attempt
-        if user_id in self.rob_attempts[target_id]["users"]:
-            await ctx.send("You're already part of this robbery attempt!")
-            return
-        
-        # Add user to rob attempt
-        self.rob_attempts[target_id]["users"].append(user_id)
-        robbers_count = len(self.rob_attempts[target_id]["users"])
-        
-        if robbers_count < 5:
-            # Not enough robbers yet
-            await ctx.send(f"{ctx.author.display_name} wants to rob {target.display_name}! {5 - robbers_count} more people needed! Use !rob {target.display_name} to join.")
-        else:
-            # Enough robbers to attempt the robbery
-            target_data = self.db.get_or_create_user(target_id)
-            
-            # Check if target has money in wallet
-            if target_data["wallet"] <= 0:
-                await ctx.send(f"{target.display_name} has no money in their wallet to rob!")
-                self.rob_attempts.pop(target_id)
-                return
-            
-            # Calculate amount to rob (10-25% of wallet)
-            rob_percent = random.uniform(0.1, 0.25)
-            rob_amount = int(target_data["wallet"] * rob_percent)
-            
-            # Ensure minimum rob amount
-            rob_amount = min(rob_amount, 10)
-            
-            # Ensure rob amount doesn't exceed wallet
-            rob_amount = min(rob_amount, target_data["wallet"])
-            
-            # Complete the robbery
-            self.db.remove_money(target_id, rob_amount)
-            
-            # Split the money between robbers
-            split_amount = rob_amount // len(self.rob_attempts[target_id]["users"])
-            
-            # Give each robber their cut
-            robbers_mentions = []
-            for robber_id in self.rob_attempts[target_id]["users"]:
-                self.db.add_money(robber_id, split_amount)
-                robber = ctx.guild.get_member(robber_id)
-                if robber:
-                    robbers_mentions.append(robber.mention)
-            
-            # Set the cooldown for robbing this target again
-            self.rob_attempts[target_id] = {"last_robbed": datetime.now()}
-            
-            # Send success message
-            robbers_list = " ".join(robbers_mentions)
-            await ctx.send(f"Robbery successful! {robbers_list} robbed {target.mention} of ${rob_amount} and each got ${split_amount}!")
+        result = await self.rob_core(ctx.guild, ctx.author, target, f"!rob {target.display_name}")
+        await self.send_result(ctx, result)
 
     @commands.command(name="leaderboard", aliases=["lb"])
     async def leaderboard(self, ctx):
@@ -476,9 +540,11 @@ class Economy(BaseCog):
             color=discord.Color.gold()
         )
         
-        for i, entry in enumerate(leaderboard_data[:10], 1):
-            user = ctx.guild.get_member(entry["user_id"])
-            username = user.display_name if user else f"User {entry['user_id']}"
+        top_entries = leaderboard_data[:10]
+        names = await member_resolver.display_names(ctx.guild, [entry["user_id"] for entry in top_entries])
+        
+        for i, entry in enumerate(top_entries, 1):
+            username = names[entry["user_id"]]
             
             # Calculate total wealth
             total = entry["wallet"] + entry["bank"]
@@ -493,22 +559,13 @@ class Economy(BaseCog):
 
 # Slash command equivalents
     @app_commands.command(name="balance", description="Check your current balance (wallet and bank)")
+    @auto_defer(ephemeral=True)
     async def balance_slash(self, interaction: discord.Interaction):
         """Slash command equivalent for checking balance."""
-        user_id = interaction.user.id
-        user_data = self.db.get_or_create_user(user_id)
-        
-        embed = discord.Embed(
-            title=f"{interaction.user.display_name}'s Balance",
-            color=discord.Color.green()
-        )
-        embed.add_field(name="Wallet", value=f"${user_data['wallet']}", inline=True)
-        embed.add_field(name="Bank", value=f"${user_data['bank']}", inline=True)
-        embed.add_field(name="Total", value=f"${user_data['wallet'] + user_data['bank']}", inline=False)
-        
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await self.respond_result(interaction, await self.balance_core(interaction.user))
         
     @app_commands.command(name="daily", description="Claim your daily reward of $100")
+    @auto_defer()
     async def daily_slash(self, interaction: discord.Interaction):
         """Slash command equivalent for claiming daily reward."""
         user_id = interaction.user.id
@@ -540,6 +597,7 @@ class Economy(BaseCog):
     
     @app_commands.command(name="deposit", description="Deposit money from your wallet to your bank")
     @app_commands.describe(amount="Amount to deposit (or 'all' to deposit everything)")
+    @auto_defer()
     async def deposit_slash(self, interaction: discord.Interaction, amount: str):
         """Slash command for depositing money."""
         user_id = interaction.user.id
@@ -558,6 +616,7 @@ class Economy(BaseCog):
                 await interaction.response.send_message("Please enter a valid amount or 'all'!", ephemeral=True)
                 return
         
+        await defer_if_slow(interaction)
         result = self.db.deposit(user_id, amount_int)
         
         if result["success"]:
@@ -574,6 +633,7 @@ class Economy(BaseCog):
             
     @app_commands.command(name="withdraw", description="Withdraw money from your bank to your wallet")
     @app_commands.describe(amount="Amount to withdraw (or 'all' to withdraw everything)")
+    @auto_defer()
     async def withdraw_slash(self, interaction: discord.Interaction, amount: str):
         """Slash command for withdrawing money."""
         user_id = interaction.user.id
@@ -592,6 +652,7 @@ class Economy(BaseCog):
                 await interaction.response.send_message("Please enter a valid amount or 'all'!", ephemeral=True)
                 return
         
+        await defer_if_slow(interaction)
         result = self.db.withdraw(user_id, amount_int)
         
         if result["success"]:
@@ -608,6 +669,7 @@ class Economy(BaseCog):
     
     @app_commands.command(name="transfer", description="Transfer money from your wallet to another user")
     @app_commands.describe(user="User to send money to", amount="Amount to transfer")
+    @auto_defer()
     async def transfer_slash(self, interaction: discord.Interaction, user: discord.Member, amount: int):
         """Slash command for transferring money."""
         if amount <= 0:
@@ -635,26 +697,35 @@ class Economy(BaseCog):
             await interaction.response.send_message(f"Error: {result['message']}", ephemeral=True)
             
     @app_commands.command(name="quest", description="Get a random quest to earn money")
+    @auto_defer()
     async def quest_slash(self, interaction: discord.Interaction):
         """Slash command for getting a quest."""
         user_id = interaction.user.id
         
         # Check cooldown
-        now = datetime.now()
-        if user_id in self.quest_cooldowns and now < self.quest_cooldowns[user_id]:
-            time_left = self.quest_cooldowns[user_id] - now
-            minutes, seconds = divmod(time_left.seconds, 60)
+        time_left = self.cooldowns.remaining("quest", user_id)
+        if time_left:
+            minutes, seconds = divmod(int(time_left), 60)
             await interaction.response.send_message(
                 f"You need to wait {minutes}m {seconds}s before getting another quest!", 
                 ephemeral=True
             )
             return
+            
+        # Only one quest can be in progress at a time
+        if self.db.get_active_quest(user_id):
+            await interaction.response.send_message(
+                "You already have an active quest! Finish it before getting another one.",
+                ephemeral=True
+            )
+            return
         
         # Generate a quest
-        quest_data = await self.quest_generator.generate_quest(interaction.user.display_name)
+        await defer_if_slow(interaction)
+        quest_data = await self.quest_generator.generate_quest(interaction.user.display_name, user_id)
         
         # Set cooldown (30 minutes)
-        self.quest_cooldowns[user_id] = now + timedelta(minutes=30)
+        self.cooldowns.set("quest", user_id, QUEST_COOLDOWN)
         
         # Create embed for quest
         embed = discord.Embed(
@@ -681,89 +752,14 @@ class Economy(BaseCog):
     
     @app_commands.command(name="rob", description="Attempt to rob another user (requires 5+ people)")
     @app_commands.describe(user="User to rob")
+    @auto_defer()
     async def rob_slash(self, interaction: discord.Interaction, user: discord.Member):
         """Slash command for robbing other users."""
-        user_id = interaction.user.id
-        target_id = user.id
-        
-        # Can't rob yourself
-        if user_id == target_id:
-            await interaction.response.send_message("You can't rob yourself!", ephemeral=True)
-            return
-        
-        # Check if target has already been robbed recently
-        if target_id in self.rob_attempts and "last_robbed" in self.rob_attempts[target_id]:
-            last_robbed = self.rob_attempts[target_id]["last_robbed"]
-            if datetime.now() < last_robbed + timedelta(hours=1):
-                await interaction.response.send_message(
-                    f"{user.display_name} has already been robbed recently. Try again later!",
-                    ephemeral=True
-                )
-                return
-        
-        # Initialize rob attempt for this target if it doesn't exist
-        if target_id not in self.rob_attempts:
-            self.rob_attempts[target_id] = {"users": []}
-        
-        # Check if this user already joined the rob attempt
-        if user_id in self.rob_attempts[target_id]["users"]:
-            await interaction.response.send_message("You're already part of this robbery attempt!", ephemeral=True)
-            return
-        
-        # Add user to rob attempt
-        self.rob_attempts[target_id]["users"].append(user_id)
-        robbers_count = len(self.rob_attempts[target_id]["users"])
-        
-        if robbers_count < 5:
-            # Not enough robbers yet
-            await interaction.response.send_message(
-                f"{interaction.user.display_name} wants to rob {user.display_name}! " +
-                f"{5 - robbers_count} more people needed! Use `/rob user:{user.display_name}` to join."
-            )
-        else:
-            # Enough robbers to attempt the robbery
-            target_data = self.db.get_or_create_user(target_id)
-            
-            # Check if target has money in wallet
-            if target_data["wallet"] <= 0:
-                await interaction.response.send_message(f"{user.display_name} has no money in their wallet to rob!")
-                self.rob_attempts.pop(target_id)
-                return
-            
-            # Calculate amount to rob (10-25% of wallet)
-            rob_percent = random.uniform(0.1, 0.25)
-            rob_amount = int(target_data["wallet"] * rob_percent)
-            
-            # Ensure minimum rob amount
-            rob_amount = max(rob_amount, 10)
-            
-            # Ensure rob amount doesn't exceed wallet
-            rob_amount = min(rob_amount, target_data["wallet"])
-            
-            # Complete the robbery
-            self.db.remove_money(target_id, rob_amount)
-            
-            # Split the money between robbers
-            split_amount = rob_amount // len(self.rob_attempts[target_id]["users"])
-            
-            # Give each robber their cut
-            robbers_mentions = []
-            for robber_id in self.rob_attempts[target_id]["users"]:
-                self.db.add_money(robber_id, split_amount)
-                robber = interaction.guild.get_member(robber_id)
-                if robber:
-                    robbers_mentions.append(robber.mention)
-            
-            # Set the cooldown for robbing this target again
-            self.rob_attempts[target_id] = {"last_robbed": datetime.now()}
-            
-            # Send success message
-            robbers_list = " ".join(robbers_mentions)
-            await interaction.response.send_message(
-                f"Robbery successful! {robbers_list} robbed {user.mention} of ${rob_amount} and each got ${split_amount}!"
-            )
+        result = await self.rob_core(interaction.guild, interaction.user, user, f"`/rob user:{user.display_name}`")
+        await self.respond_result(interaction, result)
     
     @app_commands.command(name="leaderboard", description="Display the richest users on the server")
+    @auto_defer()
     async def leaderboard_slash(self, interaction: discord.Interaction):
         """Slash command equivalent for viewing leaderboard."""
         leaderboard_data = self.db.get_leaderboard()
@@ -778,9 +774,11 @@ class Economy(BaseCog):
             color=discord.Color.gold()
         )
         
-        for i, entry in enumerate(leaderboard_data[:10], 1):
-            user = interaction.guild.get_member(entry["user_id"])
-            username = user.display_name if user else f"User {entry['user_id']}"
+        top_entries = leaderboard_data[:10]
+        names = await member_resolver.display_names(interaction.guild, [entry["user_id"] for entry in top_entries])
+        
+        for i, entry in enumerate(top_entries, 1):
+            username = names[entry["user_id"]]
             
             # Calculate total wealth
             total = entry["wallet"] + entry["bank"]
@@ -799,6 +797,7 @@ class Economy(BaseCog):
         amount="Amount of money to request",
         reason="Reason for the request (optional)"
     )
+    @auto_defer()
     async def request_money_slash(self, interaction: discord.Interaction, user: discord.Member, amount: int, reason: str = ""):
         """Slash command for requesting money."""
         if amount <= 0:
@@ -827,28 +826,25 @@ class Economy(BaseCog):
         await interaction.response.send_message(embed=requester_embed)
         
         # Send notification to recipient
-        try:
-            recipient_embed = discord.Embed(
-                title="Money Request Received",
-                description=f"{interaction.user.display_name} has requested ${amount} from you!",
-                color=discord.Color.blue()
-            )
-            if reason:
-                recipient_embed.add_field(name="Reason", value=reason, inline=False)
-            recipient_embed.add_field(name="Request ID", value=f"#{request['id']}", inline=True)
-            recipient_embed.add_field(
-                name="How to respond", 
-                value=f"Use `/transfer {interaction.user.display_name} {amount}` to accept\nor `/reject {request['id']}` to decline", 
-                inline=False
-            )
-            
-            # Try to DM the recipient
-            await user.send(embed=recipient_embed)
-        except discord.Forbidden:
-            # If DM is blocked, we'll just continue
-            pass
+        recipient_embed = discord.Embed(
+            title="Money Request Received",
+            description=f"{interaction.user.display_name} has requested ${amount} from you!",
+            color=discord.Color.blue()
+        )
+        if reason:
+            recipient_embed.add_field(name="Reason", value=reason, inline=False)
+        recipient_embed.add_field(name="Request ID", value=f"#{request['id']}", inline=True)
+        recipient_embed.add_field(
+            name="How to respond", 
+            value=f"Use `/transfer {interaction.user.display_name} {amount}` to accept\nor `/reject {request['id']}` to decline", 
+            inline=False
+        )
+        
+        # Queue a DM to the recipient (skipped if DMs are blocked)
+        self.bot.outbox.send(user, embed=recipient_embed)
             
     @app_commands.command(name="requests", description="View your pending money requests")
+    @auto_defer(ephemeral=True)
     async def view_requests_slash(self, interaction: discord.Interaction):
         """Slash command for viewing pending requests."""
         user_id = interaction.user.id
@@ -867,25 +863,30 @@ class Economy(BaseCog):
             color=discord.Color.blue()
         )
         
-        # Add received requests
         received_requests = [req for req in requests if req["recipient_id"] == user_id]
+        sent_requests = [req for req in requests if req["requester_id"] == user_id]
+        
+        # Resolve every name shown below in one batch
+        names = await member_resolver.display_names(
+            interaction.guild,
+            [req["requester_id"] for req in received_requests[:5]] + [req["recipient_id"] for req in sent_requests[:5]]
+        )
+        
+        # Add received requests
         if received_requests:
             received_text = ""
             for req in received_requests[:5]:  # Show only top 5
-                requester = interaction.guild.get_member(req["requester_id"])
-                requester_name = requester.display_name if requester else f"User {req['requester_id']}"
+                requester_name = names[req["requester_id"]]
                 reason_text = f" - {req['reason']}" if req["reason"] else ""
                 received_text += f"#{req['id']} | From: {requester_name} | Amount: ${req['amount']}{reason_text}\n"
             
             embed.add_field(name="Money Requested From You", value=received_text or "None", inline=False)
         
         # Add sent requests
-        sent_requests = [req for req in requests if req["requester_id"] == user_id]
         if sent_requests:
             sent_text = ""
             for req in sent_requests[:5]:  # Show only top 5
-                recipient = interaction.guild.get_member(req["recipient_id"])
-                recipient_name = recipient.display_name if recipient else f"User {req['recipient_id']}"
+                recipient_name = names[req["recipient_id"]]
                 reason_text = f" - {req['reason']}" if req["reason"] else ""
                 sent_text += f"#{req['id']} | To: {recipient_name} | Amount: ${req['amount']}{reason_text}\n"
             
@@ -898,6 +899,7 @@ class Economy(BaseCog):
     @app_commands.describe(
         request_id="The ID of the request to reject"
     )
+    @auto_defer()
     async def reject_request_slash(self, interaction: discord.Interaction, request_id: int):
         """Slash command for rejecting money requests."""
         user_id = interaction.user.id
@@ -920,11 +922,12 @@ class Economy(BaseCog):
             return
             
         # Resolve the request (decline)
+        await defer_if_slow(interaction)
         result = self.db.resolve_money_request(request_id, accept=False)
         
         if result["success"]:
             # Notify the requester
-            requester = interaction.guild.get_member(request["requester_id"])
+            requester = await self.get_user(request["requester_id"])
             
             # Create embed for recipient (current user)
             recipient_embed = discord.Embed(
@@ -934,18 +937,14 @@ class Economy(BaseCog):
             )
             await interaction.response.send_message(embed=recipient_embed)
             
-            # Try to notify the requester
+            # Queue a DM to the requester (skipped if DMs are blocked)
             if requester:
-                try:
-                    requester_embed = discord.Embed(
-                        title="Money Request Rejected",
-                        description=f"{interaction.user.display_name} has rejected your request for ${request['amount']}.",
-                        color=discord.Color.red()
-                    )
-                    await requester.send(embed=requester_embed)
-                except discord.Forbidden:
-                    # If DM is blocked, we'll just skip notification
-                    pass
+                requester_embed = discord.Embed(
+                    title="Money Request Rejected",
+                    description=f"{interaction.user.display_name} has rejected your request for ${request['amount']}.",
+                    color=discord.Color.red()
+                )
+                self.bot.outbox.send(requester, embed=requester_embed)
         else:
             await interaction.response.send_message(f"Error: {result['message']}", ephemeral=True)
 
@@ -4,7 +4,15 @@ from discord import app_commands, utils
 import asyncio
 import datetime
 from utils.database import Database
-from cogs.base_cog import BaseCog
+from utils.permissions import permission_resolver
+from utils.rate_limit import RateLimiter
+from utils.config import TIMEOUT_COST, BOMB_RATE_PER_MODERATOR, BOMB_RATE_PER_TARGET, BOMB_RATE_PER_GUILD, TIMEOUT_LOG_RETENTION_DAYS
+from utils.interactions import auto_defer, defer_if_slow
+from utils.members import member_resolver
+from cogs.base_cog import BaseCog, CommandResult, command_core
+
+# Cost to bomb someone
+BOMB_COST = TIMEOUT_COST
 
 class Moderation(BaseCog):
     """Cog for handling moderation commands, including the timeout feature."""
@@ -12,149 +20,154 @@ class Moderation(BaseCog):
     def __init__(self, bot):
         super().__init__(bot)
         self.db = Database()
+        # Protected roles and timeout permissions come from the config via the shared resolver
+        self.permissions = permission_resolver
+        # Throttles bombs before any money is taken or Discord API call is made
+        self.bomb_limiter = RateLimiter(
+            moderator=BOMB_RATE_PER_MODERATOR,
+            target=BOMB_RATE_PER_TARGET,
+            guild=BOMB_RATE_PER_GUILD
+        )
         
-        # Role IDs that cannot be timed out
-        self.protected_role_ids = [
-            1352694494843240448,  # Owner
-            1352694494813749308,  # Admin
-            1352694494813749307,  # Moderator/staff
-        ]
+    def check_bomb_rate_limit(self, guild_id, moderator_id, target_id):
+        """Count a bomb against the rate limits. Returns an error message if it's over a limit, else None."""
+        allowed, limit, retry_after = self.bomb_limiter.acquire(
+            moderator=(guild_id, moderator_id),
+            target=(guild_id, target_id),
+            guild=guild_id
+        )
+        if allowed:
+            return None
+            
+        wait = max(1, int(retry_after + 0.999))
+        if limit == "moderator":
+            return f"You're bombing too fast! Try again in {wait} seconds."
+        if limit == "target":
+            return f"That user has been bombed too much recently! Try again in {wait} seconds."
+        return f"Too many bombs are going off in this server! Try again in {wait} seconds."
         
-        # Role timeout permissions (role_id: seconds)
-        self.timeout_permissions = {
-            1352694494797234234: 10,    # level 5 - 10 seconds
-            1352694494797234235: 30,    # level 10 - 30 seconds
-            1352694494797234236: 60,    # level 20 - 60 seconds
-            1352694494797234237: 120,   # level 35 - 2 minutes
-            1352694494813749299: 300,   # level 50 - 5 minutes
-        }
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        """Drop cached permissions and names when a member is updated (e.g. their roles or nickname changed)."""
+        self.permissions.invalidate(after)
+        member_resolver.invalidate(after.guild.id, after.id)
         
-    @commands.command(name="bomb")
-    async def bomb(self, ctx, member: discord.Member = None):
-        """Bomb a user (timeout) based on your role permissions."""
-        if member is None:
-            await ctx.send("You need to specify a user to bomb! Usage: !bomb @username ....fkin dumbass nig...")
-            return
-        user_id = ctx.author.id
+    @command_core
+    async def bomb_core(self, guild, author, member):
+        """Bomb (time out) a member for as long as the author's roles allow."""
+        user_id = author.id
         target_id = member.id
         
         # Check if user is trying to bomb themselves
         if user_id == target_id:
-            await ctx.send("yoyoyoyoyo.. this mf trying to bomb himself lmfao")
-            return
+            return CommandResult.error("You can't bomb yourself!")
             
         # Check if target has a protected role
-        for role in member.roles:
-            if role.id in self.protected_role_ids:
-                await ctx.send(f"Nigga wtf You cannot bomb users with the {role.name} role!")
-                return
+        protected_role_id = self.permissions.resolve(member).protected_role_id
+        if protected_role_id is not None:
+            return CommandResult.error(f"You cannot bomb users with the {member.get_role(protected_role_id).name} role!")
                 
         # Check if user has permission to bomb
-        timeout_duration = 0
-        for role in ctx.author.roles:
-            if role.id in self.timeout_permissions:
-                timeout_duration = max(timeout_duration, self.timeout_permissions[role.id])
+        timeout_duration = self.permissions.resolve(author).max_timeout
                 
         if timeout_duration == 0:
-            await ctx.send("You don't have permission to bomb users!")
-            return
+            return CommandResult.error("You don't have permission to bomb users!")
             
         # Check if user has enough money
         user_data = self.db.get_or_create_user(user_id)
-        BOMB_COST = 50  # Cost to bomb someone
         
         if user_data["wallet"] < BOMB_COST:
-            await ctx.send(f"You need ${BOMB_COST} in your wallet to bomb someone you fkin moronenic poor lil bitch!")
-            return
+            return CommandResult.error(f"You need ${BOMB_COST} in your wallet to bomb someone!")
+            
+        # Check rate limits before taking money or calling Discord
+        rate_limit_error = self.check_bomb_rate_limit(guild.id, user_id, target_id)
+        if rate_limit_error:
+            return CommandResult.error(rate_limit_error)
             
-        # Deduct money
-        self.db.remove_money(user_id, BOMB_COST)
+        # Deduct money; the balance may have changed since it was checked
+        await defer_if_slow()
+        payment = self.db.remove_money(user_id, BOMB_COST)
+        if not payment["success"]:
+            return CommandResult.error(f"You need ${BOMB_COST} in your wallet to bomb someone!")
         
         # Apply timeout with timezone-aware datetime
         end_time = utils.utcnow() + datetime.timedelta(seconds=timeout_duration)
         try:
-            await member.timeout(end_time, reason=f"Bombed by {ctx.author.display_name}")
-            
-            # Create embed with bomb GIF
-            embed = discord.Embed(
-                title="💣 BOMB DEPLOYED! 💣",
-                description=f"{member.mention} has been bombed for {timeout_duration} seconds by {ctx.author.mention}!",
-                color=discord.Color.red()
-            )
-            embed.set_image(url="https://media1.tenor.com/m/tGw9QVHWzToAAAAd/pvz-gta.gif")
-            embed.set_footer(text="The user has been temporarily muted")
-            
-            # Notify users with the bomb GIF
-            await ctx.send(embed=embed)
-            
-            # Add timeout log
-            self.db.add_timeout_log(user_id, target_id, timeout_duration)
-            
+            await member.timeout(end_time, reason=f"Bombed by {author.display_name}")
         except discord.Forbidden:
-            await ctx.send("I don't have permission to bomb this user!")
             # Refund the money
             self.db.add_money(user_id, BOMB_COST)
+            return CommandResult.error("I don't have permission to bomb this user!")
         except Exception as e:
-            await ctx.send(f"An error occurred: {str(e)}")
             # Refund the money
             self.db.add_money(user_id, BOMB_COST)
+            return CommandResult.error(f"An error occurred: {str(e)}")
             
-    @commands.command(name="bombcost")
-    async def bomb_cost(self, ctx):
-        """Check the cost of using the bomb command."""
-        await ctx.send("It costs $50 to bomb someone!")
+        # Add timeout log
+        self.db.add_timeout_log(user_id, target_id, timeout_duration)
         
-    @commands.command(name="bomblimit")
-    async def bomb_limit(self, ctx):
-        """Check your bomb duration limit based on your roles."""
-        user_id = ctx.author.id
+        # Create embed with bomb GIF
+        embed = discord.Embed(
+            title="💣 BOMB DEPLOYED! 💣",
+            description=f"{member.mention} has been bombed for {timeout_duration} seconds by {author.mention}!",
+            color=discord.Color.red()
+        )
+        embed.set_image(url="https://media1.tenor.com/m/tGw9QVHWzToAAAAd/pvz-gta.gif")
+        embed.set_footer(text="The user has been temporarily muted")
         
-        # Check timeout duration based on roles
-        timeout_duration = 0
-        highest_role = None
+        return CommandResult(embed=embed)
         
-        for role in ctx.author.roles:
-            if role.id in self.timeout_permissions:
-                if self.timeout_permissions[role.id] > timeout_duration:
-                    timeout_duration = self.timeout_permissions[role.id]
-                    highest_role = role
+    @command_core
+    async def bomb_limit_core(self, member):
+        """Describe how long a member's roles let them bomb users for."""
+        # Check timeout duration based on roles
+        permissions = self.permissions.resolve(member)
+        timeout_duration = permissions.max_timeout
+        highest_role = member.get_role(permissions.timeout_role_id) if permissions.timeout_role_id else None
                     
-        if timeout_duration > 0 and highest_role is not None:
-            # Format duration for display
-            if timeout_duration < 60:
-                duration_text = f"{timeout_duration} seconds"
-            else:
-                minutes = timeout_duration // 60
-                duration_text = f"{minutes} minute{'s' if minutes > 1 else ''}"
-                
-            await ctx.send(f"With your role {highest_role.name}, you can bomb users for {duration_text}!")
-        else:
-            await ctx.send("You don't have any roles that allow you to bomb users!")
+        if timeout_duration == 0 or highest_role is None:
+            return CommandResult.error("You don't have any roles that allow you to bomb users!")
             
-    @commands.command(name="bombhistory")
-    async def bomb_history(self, ctx, member: discord.Member = None):
-        """View bomb history for yourself or another user."""
-        if member is None:
-            member = ctx.author
+        # Format duration for display
+        if timeout_duration < 60:
+            duration_text = f"{timeout_duration} seconds"
+        else:
+            minutes = timeout_duration // 60
+            duration_text = f"{minutes} minute{'s' if minutes > 1 else ''}"
             
-        target_id = member.id
+        return CommandResult(f"With your role {highest_role.name}, you can bomb users for {duration_text}!", ephemeral=True)
+        
+    @command_core
+    async def bomb_history_core(self, guild, member):
+        """Build the bomb history embed for a member."""
         target_name = member.display_name
         
-        # Get timeout history
-        timeout_logs = self.db.get_timeout_logs(target_id)
+        # Get recent timeout history and lifetime totals
+        timeout_logs = self.db.get_timeout_logs(member.id)
+        await defer_if_slow()
+        totals = self.db.get_timeout_totals(member.id)
         
-        if not timeout_logs:
-            await ctx.send(f"{target_name} has no bomb history!")
-            return
+        if not timeout_logs and totals["received"]["count"] == 0 and totals["given"]["count"] == 0:
+            return CommandResult.error(f"{target_name} has no bomb history!")
             
         embed = discord.Embed(
             title=f"💣 Bomb History for {target_name}",
             color=discord.Color.orange()
         )
         
+        embed.add_field(
+            name="Lifetime",
+            value=(
+                f"Bombed {totals['received']['count']} times ({totals['received']['total_duration']} seconds total)\n"
+                f"Bombed others {totals['given']['count']} times ({totals['given']['total_duration']} seconds total)"
+            ),
+            inline=False
+        )
+        
+        names = await member_resolver.display_names(guild, [log["moderator_id"] for log in timeout_logs[:10]])
+        
         for log in timeout_logs[:10]:  # Show only the last 10 bombs
-            moderator = ctx.guild.get_member(log["moderator_id"])
-            moderator_name = moderator.display_name if moderator else f"User {log['moderator_id']}"
+            moderator_name = names[log["moderator_id"]]
             
             embed.add_field(
                 name=f"{log['timestamp'].strftime('%Y-%m-%d %H:%M')}",
@@ -162,164 +175,100 @@ class Moderation(BaseCog):
                 inline=False
             )
             
-        await ctx.send(embed=embed)
-
-# Slash command versions
-    @app_commands.command(name="bomb", description="Bomb a user (timeout) based on your role permissions")
-    @app_commands.describe(user="The user to bomb")
-    async def bomb_slash(self, interaction: discord.Interaction, user: discord.Member):
-        """Slash command for bombing users."""
-        user_id = interaction.user.id
-        target_id = user.id
+        if not timeout_logs:
+            embed.set_footer(text=f"No bombs in the last {TIMEOUT_LOG_RETENTION_DAYS} days")
+            
+        return CommandResult(embed=embed, ephemeral=True)
         
-        # Check if user is trying to bomb themselves
-        if user_id == target_id:
-            await interaction.response.send_message("You can't bomb yourself!", ephemeral=True)
-            return
+    @command_core
+    async def bomb_stats_core(self, guild, days):
+        """Build the bomb stats embed for the last given number of days."""
+        if days < 1 or days > TIMEOUT_LOG_RETENTION_DAYS:
+            return CommandResult.error(f"Pick a number of days between 1 and {TIMEOUT_LOG_RETENTION_DAYS}!")
             
-        # Check if target has a protected role
-        for role in user.roles:
-            if role.id in self.protected_role_ids:
-                await interaction.response.send_message(
-                    f"You cannot bomb users with the {role.name} role!",
-                    ephemeral=True
-                )
-                return
-                
-        # Check if user has permission to bomb
-        timeout_duration = 0
-        for role in interaction.user.roles:
-            if role.id in self.timeout_permissions:
-                timeout_duration = max(timeout_duration, self.timeout_permissions[role.id])
+        stats = self.db.get_timeout_stats(datetime.datetime.now() - datetime.timedelta(days=days))
+        
+        embed = discord.Embed(
+            title=f"💣 Bomb Stats (last {days} day{'s' if days != 1 else ''})",
+            description=f"{stats['total']} bombs deployed",
+            color=discord.Color.orange()
+        )
+        
+        names = await member_resolver.display_names(
+            guild, [user_id for user_id, count in stats["top_bombers"] + stats["most_bombed"]]
+        )
+        
+        for field_name, ranking in (("Top Bombers", stats["top_bombers"]), ("Most Bombed", stats["most_bombed"])):
+            lines = []
+            for position, (user_id, count) in enumerate(ranking, 1):
+                lines.append(f"{position}. {names[user_id]} - {count} bomb{'s' if count != 1 else ''}")
                 
-        if timeout_duration == 0:
-            await interaction.response.send_message(
-                "You don't have permission to bomb users!", 
-                ephemeral=True
-            )
-            return
+            embed.add_field(name=field_name, value="\n".join(lines) or "Nobody yet!", inline=True)
             
-        # Check if user has enough money
-        user_data = self.db.get_or_create_user(user_id)
-        BOMB_COST = 50  # Cost to bomb someone
+        return CommandResult(embed=embed)
         
-        if user_data["wallet"] < BOMB_COST:
-            await interaction.response.send_message(
-                f"You need ${BOMB_COST} in your wallet to bomb someone!",
-                ephemeral=True
-            )
+    @commands.command(name="bomb")
+    async def bomb(self, ctx, member: discord.Member = None):
+        """Bomb a user (timeout) based on your role permissions."""
+        if member is None:
+            await ctx.send(f"You need to specify a user to bomb! Usage: `{ctx.prefix}bomb @user`")
             return
             
-        # Deduct money
-        self.db.remove_money(user_id, BOMB_COST)
-        
-        # Apply timeout with timezone-aware datetime
-        end_time = utils.utcnow() + datetime.timedelta(seconds=timeout_duration)
-        try:
-            await user.timeout(end_time, reason=f"Bombed by {interaction.user.display_name}")
-            
-            # Create embed with bomb GIF
-            embed = discord.Embed(
-                title="💣 BOMB DEPLOYED! 💣",
-                description=f"{user.mention} has been bombed for {timeout_duration} seconds by {interaction.user.mention}!",
-                color=discord.Color.red()
-            )
-            embed.set_image(url="https://media1.tenor.com/m/tGw9QVHWzToAAAAd/pvz-gta.gif")
-            embed.set_footer(text="The user has been temporarily muted")
+        await self.send_result(ctx, await self.bomb_core(ctx.guild, ctx.author, member))
             
-            # Send the bomb notification with GIF
-            await interaction.response.send_message(embed=embed)
-            
-            # Add timeout log
-            self.db.add_timeout_log(user_id, target_id, timeout_duration)
+    @commands.command(name="bombcost")
+    async def bomb_cost(self, ctx):
+        """Check the cost of using the bomb command."""
+        await ctx.send(f"It costs ${BOMB_COST} to bomb someone!")
+        
+    @commands.command(name="bomblimit")
+    async def bomb_limit(self, ctx):
+        """Check your bomb duration limit based on your roles."""
+        await self.send_result(ctx, await self.bomb_limit_core(ctx.author))
             
-        except discord.Forbidden:
-            await interaction.response.send_message(
-                "I don't have permission to bomb this user!",
-                ephemeral=True
-            )
-            # Refund the money
-            self.db.add_money(user_id, BOMB_COST)
-        except Exception as e:
-            await interaction.response.send_message(
-                f"An error occurred: {str(e)}",
-                ephemeral=True
-            )
-            # Refund the money
-            self.db.add_money(user_id, BOMB_COST)
+    @commands.command(name="bombhistory")
+    async def bomb_history(self, ctx, member: discord.Member = None):
+        """View bomb history for yourself or another user."""
+        await self.send_result(ctx, await self.bomb_history_core(ctx.guild, member or ctx.author))
+        
+    @commands.command(name="bombstats")
+    async def bomb_stats(self, ctx, days: int = 7):
+        """View the top bombers and most bombed users over the last few days."""
+        await self.send_result(ctx, await self.bomb_stats_core(ctx.guild, days))
+        
+# Slash command versions
+    @app_commands.command(name="bomb", description="Bomb a user (timeout) based on your role permissions")
+    @app_commands.describe(user="The user to bomb")
+    @auto_defer()
+    async def bomb_slash(self, interaction: discord.Interaction, user: discord.Member):
+        """Slash command for bombing users."""
+        await self.respond_result(interaction, await self.bomb_core(interaction.guild, interaction.user, user))
     
     @app_commands.command(name="bomb_cost", description="Check the cost of using the bomb command")
+    @auto_defer(ephemeral=True)
     async def bomb_cost_slash(self, interaction: discord.Interaction):
         """Slash command for checking bomb cost."""
-        await interaction.response.send_message("It costs $50 to bomb someone!", ephemeral=True)
+        await interaction.response.send_message(f"It costs ${BOMB_COST} to bomb someone!", ephemeral=True)
     
     @app_commands.command(name="bomb_limit", description="Check your bomb duration limit based on your roles")
+    @auto_defer(ephemeral=True)
     async def bomb_limit_slash(self, interaction: discord.Interaction):
         """Slash command for checking bomb limits."""
-        # Check timeout duration based on roles
-        timeout_duration = 0
-        highest_role = None
-        
-        for role in interaction.user.roles:
-            if role.id in self.timeout_permissions:
-                if self.timeout_permissions[role.id] > timeout_duration:
-                    timeout_duration = self.timeout_permissions[role.id]
-                    highest_role = role
-                    
-        if timeout_duration > 0 and highest_role is not None:
-            # Format duration for display
-            if timeout_duration < 60:
-                duration_text = f"{timeout_duration} seconds"
-            else:
-                minutes = timeout_duration // 60
-                duration_text = f"{minutes} minute{'s' if minutes > 1 else ''}"
-                
-            await interaction.response.send_message(
-                f"With your role {highest_role.name}, you can bomb users for {duration_text}!",
-                ephemeral=True
-            )
-        else:
-            await interaction.response.send_message(
-                "You don't have any roles that allow you to bomb users!",
-                ephemeral=True
-            )
+        await self.respond_result(interaction, await self.bomb_limit_core(interaction.user))
     
     @app_commands.command(name="bomb_history", description="View bomb history for yourself or another user")
     @app_commands.describe(user="The user to check bomb history for (leave empty for yourself)")
+    @auto_defer(ephemeral=True)
     async def bomb_history_slash(self, interaction: discord.Interaction, user: discord.Member = None):
         """Slash command for viewing bomb history."""
-        if user is None:
-            user = interaction.user
-            
-        target_id = user.id
-        target_name = user.display_name
-        
-        # Get timeout history
-        timeout_logs = self.db.get_timeout_logs(target_id)
-        
-        if not timeout_logs:
-            await interaction.response.send_message(
-                f"{target_name} has no bomb history!",
-                ephemeral=True
-            )
-            return
-            
-        embed = discord.Embed(
-            title=f"💣 Bomb History for {target_name}",
-            color=discord.Color.orange()
-        )
-        
-        for log in timeout_logs[:10]:  # Show only the last 10 bombs
-            moderator = interaction.guild.get_member(log["moderator_id"])
-            moderator_name = moderator.display_name if moderator else f"User {log['moderator_id']}"
-            
-            embed.add_field(
-                name=f"{log['timestamp'].strftime('%Y-%m-%d %H:%M')}",
-                value=f"By: {moderator_name}\nDuration: {log['duration']} seconds",
-                inline=False
-            )
-            
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await self.respond_result(interaction, await self.bomb_history_core(interaction.guild, user or interaction.user))
+    
+    @app_commands.command(name="bomb_stats", description="View the top bombers and most bombed users")
+    @app_commands.describe(days="How many days back to look (default 7)")
+    @auto_defer()
+    async def bomb_stats_slash(self, interaction: discord.Interaction, days: int = 7):
+        """Slash command for viewing bomb stats."""
+        await self.respond_result(interaction, await self.bomb_stats_core(interaction.guild, days))
 
 async def setup(bot):
     await bot.add_cog(Moderation(bot))
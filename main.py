@@ -1,9 +1,13 @@
 import os
+import sys
 import logging
 import threading
 import time
 from flask import Flask, render_template, jsonify, session, redirect, url_for
-from bot import run_bot
+from bot import run_bot, bot
+from utils.interactions import defer_stats
+from cogs.base_cog import core_stats
+from utils.config import DASHBOARD_PORT
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, 
@@ -20,7 +24,7 @@ bot_status = {
     "error": None
 }
 
-def start_bot_thread():
+def start_bot_thread(force_sync=False):
     """Start the Discord bot in a separate thread."""
     global bot_status
     
@@ -36,7 +40,7 @@ def start_bot_thread():
         bot_status["start_time"] = time.time()
         bot_status["error"] = None
         # Run the bot
-        run_bot(token)
+        run_bot(token, force_sync=force_sync)
     except Exception as e:
         bot_status["is_running"] = False
         bot_status["error"] = str(e)
@@ -93,6 +97,14 @@ def home():
                         <li class="list-group-item">Role-based timeout system</li>
                     </ul>
                 </div>
+                <div class="bot-info">
+                    <h2>Startup</h2>
+                    <pre id="lifecycle" class="text-start">Loading...</pre>
+                </div>
+                <div class="bot-info">
+                    <h2>Quest Generation Health</h2>
+                    <pre id="questHealth" class="text-start">Loading...</pre>
+                </div>
                 <div class="mt-4">
                     <button id="refreshBtn" class="btn btn-primary">Refresh Status</button>
                     <button id="startBtn" class="btn btn-success">Start Bot</button>
@@ -139,11 +151,41 @@ def home():
                     });
             }
             
+            // Function to fetch quest generation health (circuit breaker and latency histogram)
+            function checkQuestHealth() {
+                fetch('/quest_health')
+                    .then(response => response.json())
+                    .then(data => {
+                        document.getElementById('questHealth').textContent = JSON.stringify(data, null, 2);
+                    })
+                    .catch(error => {
+                        console.error('Error fetching quest health:', error);
+                    });
+            }
+            
+            // Function to fetch startup phases and readiness (503 until ready, same JSON body)
+            function checkLifecycle() {
+                fetch('/lifecycle')
+                    .then(response => response.json())
+                    .then(data => {
+                        document.getElementById('lifecycle').textContent = JSON.stringify(data, null, 2);
+                    })
+                    .catch(error => {
+                        console.error('Error fetching lifecycle:', error);
+                    });
+            }
+            
             // Check status on page load
             checkStatus();
+            checkLifecycle();
+            checkQuestHealth();
             
             // Set up refresh button
-            document.getElementById('refreshBtn').addEventListener('click', checkStatus);
+            document.getElementById('refreshBtn').addEventListener('click', function() {
+                checkStatus();
+                checkLifecycle();
+                checkQuestHealth();
+            });
             
             // Set up start button
             document.getElementById('startBtn').addEventListener('click', function() {
@@ -188,6 +230,46 @@ def status():
     """Return the bot status as JSON."""
     return jsonify(bot_status)
 
+@app.route('/quest_health')
+def quest_health():
+    """Return the quest generator's circuit breaker state and latency histogram as JSON."""
+    economy = bot.get_cog("Economy")
+    if economy is None:
+        return jsonify({"error": "Economy cog is not loaded"})
+    
+    return jsonify(economy.quest_generator.health())
+
+@app.route('/defer_stats')
+def slash_defer_stats():
+    """Return how often each slash command had to be deferred as JSON."""
+    return jsonify(defer_stats)
+
+@app.route('/core_stats')
+def command_core_stats():
+    """Return call counts, failures and total run time per command core as JSON."""
+    return jsonify(core_stats)
+
+@app.route('/lifecycle')
+def lifecycle():
+    """Return the bot's startup phases and readiness as JSON (HTTP 503 until ready)."""
+    status = bot.lifecycle.status()
+    return jsonify(status), 200 if status["ready"] else 503
+
+@app.route('/shards')
+def shards():
+    """Return the shards run by this process and their buffered activity as JSON."""
+    return jsonify({
+        "shard_count": bot.shard_context.shard_count,
+        "shard_ids": bot.shard_context.shard_ids,
+        "latencies": {shard_id: latency for shard_id, latency in getattr(bot, "latencies", [(0, bot.latency)])},
+        "pending_activity": bot.activity_buffer.pending_count()
+    })
+
+@app.route('/outbox')
+def outbox_stats():
+    """Return queued, sent, retried and dropped notification counts as JSON."""
+    return jsonify(bot.outbox.stats())
+
 @app.route('/start', methods=['POST'])
 def start():
     """Start the bot if it's not already running."""
@@ -220,11 +302,11 @@ def restart():
     return jsonify({"success": True})
 
 if __name__ == "__main__":
-    # Start bot thread automatically
+    # Start bot thread automatically; --force-sync re-syncs slash commands even if they're unchanged
     if not bot_status["is_running"]:
-        bot_thread = threading.Thread(target=start_bot_thread)
+        bot_thread = threading.Thread(target=start_bot_thread, args=("--force-sync" in sys.argv,))
         bot_thread.daemon = True
         bot_thread.start()
     
     # Run Flask app
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    app.run(host="0.0.0.0", port=DASHBOARD_PORT, debug=True)
@@ -0,0 +1,73 @@
+"""Local stand-in for the OpenAI chat completions endpoint used by the quest tests."""
+
+import json
+import asyncio
+from contextlib import asynccontextmanager
+from aiohttp import web
+from openai import AsyncOpenAI
+
+QUEST = {
+    "quest_title": "Emoji Hunt",
+    "quest_description": "React to five messages with a different emoji each.",
+    "reward": 50,
+    "time_limit": 15
+}
+
+class FakeCompletionServer:
+    """Serves chat completions with configurable delay, status and content.
+
+    Attributes set by tests:
+        delay: Seconds to wait before answering
+        status: HTTP status to answer with (200 returns a completion)
+        content: Completion text, or a callable taking the request JSON and returning it
+    """
+
+    def __init__(self):
+        self.delay = 0
+        self.status = 200
+        self.content = json.dumps(QUEST)
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request):
+        body = await request.json()
+        self.requests.append(body)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        if self.status != 200:
+            return web.json_response({"error": {"message": "injected failure", "type": "server_error"}}, status=self.status)
+
+        content = self.content(body) if callable(self.content) else self.content
+        return web.json_response({
+            "id": f"chatcmpl-{len(self.requests)}",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}]
+        })
+
+@asynccontextmanager
+async def fake_openai():
+    """Run a fake completion server and yield (server, client pointed at it)."""
+    server = FakeCompletionServer()
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", server.handle)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    client = AsyncOpenAI(api_key="test", base_url=f"http://127.0.0.1:{port}/v1", max_retries=0)
+    try:
+        yield server, client
+    finally:
+        await client.close()
+        await runner.cleanup()
@@ -0,0 +1,34 @@
+import asyncio
+import discord
+from discord.ext import commands
+from cogs.company import Company, CompanyActionButton
+
+BUTTONS = [("invite_accept", "Accept", discord.ButtonStyle.green), ("invite_decline", "Decline", discord.ButtonStyle.red)]
+
+def test_button_state_round_trips_through_custom_id():
+    async def scenario():
+        button = Company.confirmation_view(7, BUTTONS).children[1]
+        assert button.custom_id == "company:invite_decline:7"
+
+        match = button.template.fullmatch(button.custom_id)
+        restored = await CompanyActionButton.from_custom_id(None, button.item, match)
+        assert (restored.action, restored.action_id, restored.item.label) == ("invite_decline", 7, "Decline")
+        assert restored.custom_id == button.custom_id
+
+    asyncio.run(scenario())
+
+def test_cog_registers_the_button_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    async def scenario():
+        bot = commands.Bot(command_prefix="!", intents=discord.Intents.none())
+        add, remove = bot.add_dynamic_items, bot.remove_dynamic_items
+        monkeypatch.setattr(bot, "add_dynamic_items", lambda *items: calls.append(("add", items)) or add(*items))
+        monkeypatch.setattr(bot, "remove_dynamic_items", lambda *items: calls.append(("remove", items)) or remove(*items))
+
+        await bot.add_cog(Company(bot))
+        await bot.remove_cog("Company")
+
+    asyncio.run(scenario())
+    assert calls == [("add", (CompanyActionButton,)), ("remove", (CompanyActionButton,))]
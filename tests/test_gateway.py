@@ -0,0 +1,12 @@
+from utils.gateway import gateway_settings
+
+def test_minimal_profile_keeps_prefix_commands_working_in_dms():
+    intents, options = gateway_settings("minimal")
+
+    assert intents.guild_messages and intents.dm_messages and intents.message_content
+    assert intents.guild_reactions and intents.dm_reactions
+    assert not intents.presences
+    assert options == {"chunk_guilds_at_startup": False, "max_messages": None}
+
+def test_unknown_profile_falls_back_to_minimal():
+    assert gateway_settings("nope") == gateway_settings("minimal")
@@ -0,0 +1,19 @@
+from cogs.company import Company
+from cogs.economy import Economy
+from cogs.moderation import Moderation
+from utils.help_embeds import HELP_CATEGORIES
+
+COGS = {"economy": Economy, "company": Company, "moderation": Moderation}
+
+def listed(category):
+    """The prefix and slash command names a help page lists."""
+    commands = HELP_CATEGORIES[category][2]
+    return ({usage.split()[0] for usage, _, _ in commands},
+            {slash.split()[0].lstrip("/") for _, slash, _ in commands})
+
+def test_help_lists_every_cog_command():
+    for category, cog in COGS.items():
+        prefix_names, slash_names = listed(category)
+
+        assert prefix_names == {command.name for command in cog.__cog_commands__}, category
+        assert slash_names == {command.name for command in cog.__cog_app_commands__}, category
@@ -0,0 +1,40 @@
+from utils.help_embeds import EmbedCache, HELP_CATEGORIES, build_help_embed
+
+PREFIX = "!"
+
+def test_cache_serves_the_built_embed():
+    cache = EmbedCache()
+    for category in [None, *HELP_CATEGORIES]:
+        for slash in (False, True):
+            key = ("help", slash, PREFIX, category)
+            embed = cache.get(key, lambda: build_help_embed(category, PREFIX, slash))
+
+            assert cache.get(key, lambda: None) is embed
+            assert embed.to_dict() == build_help_embed(category, PREFIX, slash).to_dict()
+
+    assert len(cache) == 2 * (len(HELP_CATEGORIES) + 1)
+
+def test_builder_only_runs_on_a_miss():
+    cache = EmbedCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return build_help_embed("economy", PREFIX)
+
+    for _ in range(3):
+        cache.get(("help", False, PREFIX, "economy"), build)
+
+    assert len(builds) == 1
+
+def test_clear_rebuilds_on_next_get():
+    cache = EmbedCache()
+    key = ("help", False, PREFIX, None)
+    first = cache.get(key, lambda: build_help_embed(None, PREFIX))
+
+    cache.clear()
+    assert len(cache) == 0
+
+    second = cache.get(key, lambda: build_help_embed(None, PREFIX))
+    assert second is not first
+    assert second.to_dict() == first.to_dict()
@@ -0,0 +1,90 @@
+import asyncio
+import time
+from utils.interactions import auto_defer, defer_if_slow, defer_stats
+
+class FakeResponse:
+    def __init__(self, calls, defer_delay):
+        self.calls = calls
+        self.defer_delay = defer_delay
+        self.done = False
+
+    def is_done(self):
+        return self.done
+
+    async def defer(self, ephemeral=False, thinking=False):
+        await asyncio.sleep(self.defer_delay)
+        self.calls.append(("defer", ephemeral))
+        self.done = True
+
+    async def send_message(self, content=None, ephemeral=False, **kwargs):
+        self.calls.append(("send_message", content, ephemeral))
+        self.done = True
+
+class FakeFollowup:
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def send(self, content=None, ephemeral=False, **kwargs):
+        self.calls.append(("followup", content, ephemeral))
+
+class FakeInteraction:
+    def __init__(self, defer_delay=0):
+        self.calls = []
+        self._cs_response = FakeResponse(self.calls, defer_delay)
+        self.followup = FakeFollowup(self.calls)
+
+    @property
+    def response(self):
+        return self._cs_response
+
+    async def delete_original_response(self):
+        self.calls.append(("delete_original",))
+
+class Commands:
+    @auto_defer(budget=0.05)
+    async def quick(self, interaction):
+        await interaction.response.send_message("done")
+
+    @auto_defer(budget=0.05)
+    async def blocking(self, interaction, ephemeral):
+        # Blocking storage work the timer can't interrupt, then a checkpoint from a shared core
+        time.sleep(0.1)
+        await self.core()
+        await interaction.response.send_message("done", ephemeral=ephemeral)
+
+    async def core(self):
+        await defer_if_slow()
+
+    @auto_defer(budget=0.05)
+    async def returns_as_timer_fires(self, interaction):
+        # The timer fires while the handler yields, but it returns before the defer task runs
+        time.sleep(0.1)
+        await asyncio.sleep(0)
+
+    @auto_defer(budget=0.01)
+    async def returns_while_deferring(self, interaction):
+        await asyncio.sleep(0.15)
+
+def run(command, *args, defer_delay=0):
+    interaction = FakeInteraction(defer_delay)
+    asyncio.run(command(interaction, *args))
+    return interaction.calls
+
+def test_fast_command_is_not_deferred():
+    assert run(Commands().quick) == [("send_message", "done", False)]
+
+def test_checkpoint_defers_after_blocking_work():
+    assert run(Commands().blocking, False) == [("defer", False), ("followup", "done", False)]
+
+def test_ephemeral_reply_after_public_defer_stays_ephemeral():
+    assert run(Commands().blocking, True) == [("defer", False), ("delete_original",), ("followup", "done", True)]
+
+def test_checkpoint_outside_slash_commands_does_nothing():
+    asyncio.run(Commands().core())
+
+def test_no_defer_starts_after_the_handler_returned():
+    assert run(Commands().returns_as_timer_fires) == []
+
+def test_defer_in_flight_is_awaited_before_stats():
+    assert run(Commands().returns_while_deferring, defer_delay=0.3) == [("defer", False)]
+    assert defer_stats["returns_while_deferring"]["deferred"] == 1
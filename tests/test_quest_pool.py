@@ -0,0 +1,122 @@
+import asyncio
+import json
+import pytest
+from fake_openai import fake_openai, QUEST
+from utils.quests import QuestGenerator, CircuitOpenError
+from utils.circuit_breaker import CircuitBreaker
+from utils.config import QUEST_POOL_HIGH_WATERMARK, QUEST_POOL_LOW_WATERMARK
+
+def batch_content(body):
+    """Answer a batch prompt with the requested number of quests plus one invalid item."""
+    count = int(body["messages"][0]["content"].split()[1])
+    quests = [{**QUEST, "quest_title": f"Quest {i}"} for i in range(count)]
+    return json.dumps({"quests": quests + [{**QUEST, "time_limit": 500}]})
+
+def make_generator(client):
+    generator = QuestGenerator()
+    generator.client = client
+    return generator
+
+def test_batch_keeps_only_valid_quests():
+    async def scenario():
+        async with fake_openai() as (server, client):
+            server.content = batch_content
+            quests = await make_generator(client)._generate_quests_batch_with_openai(3, timeout=5)
+
+            assert [quest["quest_title"] for quest in quests] == ["Quest 0", "Quest 1", "Quest 2"]
+            assert server.requests[0]["max_tokens"] == 450
+
+    asyncio.run(scenario())
+
+def test_pool_refills_to_high_watermark():
+    async def scenario():
+        async with fake_openai() as (server, client):
+            server.content = batch_content
+            generator = make_generator(client)
+            generator.start_pool()
+            try:
+                for _ in range(100):
+                    if len(generator.quest_pool) >= QUEST_POOL_HIGH_WATERMARK:
+                        break
+                    await asyncio.sleep(0.01)
+                assert len(generator.quest_pool) == QUEST_POOL_HIGH_WATERMARK
+
+                # Draining below the low watermark triggers another refill
+                for _ in range(QUEST_POOL_HIGH_WATERMARK - QUEST_POOL_LOW_WATERMARK + 1):
+                    quest = await generator.generate_quest("alice", 1)
+                    assert quest["quest_description"].startswith("Hey alice!")
+                requests_before = len(server.requests)
+                for _ in range(100):
+                    if len(generator.quest_pool) >= QUEST_POOL_HIGH_WATERMARK:
+                        break
+                    await asyncio.sleep(0.01)
+                assert len(server.requests) > requests_before
+                assert len(generator.quest_pool) == QUEST_POOL_HIGH_WATERMARK
+            finally:
+                await generator.stop_pool()
+
+    asyncio.run(scenario())
+
+def test_open_breaker_serves_fallback_without_calling_openai():
+    async def scenario():
+        async with fake_openai() as (server, client):
+            server.status = 500
+            generator = make_generator(client)
+            generator.breaker = CircuitBreaker("test", min_calls=3, open_duration=0.2)
+
+            for _ in range(3):
+                await generator.generate_quest("alice", 1)
+            assert generator.breaker.state == CircuitBreaker.OPEN
+
+            # While open, no request reaches the server
+            quest = await generator.generate_quest("alice", 1)
+            assert len(server.requests) == 3
+            assert quest["quest_title"] != QUEST["quest_title"]
+
+            # After the open period a single probe goes through and closes the breaker
+            server.status = 200
+            await asyncio.sleep(0.25)
+            quest = await generator.generate_quest("alice", 1)
+            assert quest["quest_title"] == QUEST["quest_title"]
+            assert len(server.requests) == 4
+            assert generator.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+def test_failed_probe_reopens_breaker():
+    breaker = CircuitBreaker("test", min_calls=2, open_duration=0)
+    breaker.record_failure(0.1)
+    breaker.record_failure(0.1)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # Half-open: one probe at a time
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_failure(0.1)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_slow_calls_open_breaker_unless_threshold_is_raised():
+    breaker = CircuitBreaker("test", min_calls=2, slow_call_threshold=1)
+    breaker.record_success(10, slow_call_threshold=20)
+    breaker.record_success(10, slow_call_threshold=20)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_success(10)
+    breaker.record_success(10)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_call_rejected_while_open():
+    async def scenario():
+        generator = QuestGenerator()
+        generator.breaker = CircuitBreaker("test", min_calls=1)
+        generator.breaker.record_failure(0.1)
+
+        async def request():
+            return QUEST
+
+        with pytest.raises(CircuitOpenError):
+            await generator._call_openai(request())
+
+    asyncio.run(scenario())
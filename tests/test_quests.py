@@ -0,0 +1,68 @@
+import asyncio
+import json
+from fake_openai import fake_openai, QUEST
+from utils.quests import QuestGenerator
+from utils.config import QUEST_LLM_MAX_CONCURRENCY
+
+def make_generator(client, timeout=0.5):
+    generator = QuestGenerator()
+    generator.client = client
+    generator.llm_timeout = timeout
+    return generator
+
+def test_openai_quest_is_personalized():
+    async def scenario():
+        async with fake_openai() as (server, client):
+            quest = await make_generator(client).generate_quest("alice", 1)
+            assert quest["quest_title"] == QUEST["quest_title"]
+            assert "alice" in server.requests[0]["messages"][0]["content"]
+
+    asyncio.run(scenario())
+
+def test_slow_response_falls_back_within_budget():
+    async def scenario():
+        async with fake_openai() as (server, client):
+            server.delay = 1
+            generator = make_generator(client, timeout=0.2)
+
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            quest = await generator.generate_quest("alice", 1)
+
+            assert loop.time() - started < 1
+            assert quest["quest_title"] != QUEST["quest_title"]
+            assert generator.breaker.total_failures == 1
+
+    asyncio.run(scenario())
+
+def test_failing_response_falls_back():
+    async def scenario():
+        async with fake_openai() as (server, client):
+            server.status = 500
+            quest = await make_generator(client).generate_quest("alice", 1)
+            assert quest["quest_title"] != QUEST["quest_title"]
+
+    asyncio.run(scenario())
+
+def test_invalid_quest_falls_back():
+    async def scenario():
+        async with fake_openai() as (server, client):
+            server.content = json.dumps({**QUEST, "reward": 5000})
+            quest = await make_generator(client).generate_quest("alice", 1)
+            assert 30 <= quest["reward"] <= 100
+
+    asyncio.run(scenario())
+
+def test_concurrent_requests_are_capped():
+    async def scenario():
+        async with fake_openai() as (server, client):
+            server.delay = 0.1
+            generator = make_generator(client, timeout=5)
+
+            quests = await asyncio.gather(*(generator.generate_quest(f"user{i}", i) for i in range(12)))
+
+            assert len(server.requests) == 12
+            assert server.max_in_flight == QUEST_LLM_MAX_CONCURRENCY
+            assert all(quest["quest_title"] == QUEST["quest_title"] for quest in quests)
+
+    asyncio.run(scenario())
@@ -0,0 +1,56 @@
+import asyncio
+from datetime import datetime, timedelta
+from utils.scheduler import Scheduler
+
+class FakeJobStore:
+    def __init__(self, data=None):
+        self.data = data or {"next_id": 1, "jobs": []}
+        self.saves = 0
+
+    def get_scheduled_jobs(self):
+        return self.data
+
+    def save_scheduled_jobs(self, data):
+        self.data = data
+        self.saves += 1
+
+def test_keyed_jobs_are_found_without_writing():
+    store = FakeJobStore()
+    scheduler = Scheduler(store)
+    due = datetime.now() + timedelta(hours=1)
+
+    job_id = scheduler.schedule("sweep", due, key="sweep")
+    assert store.saves == 1
+
+    assert scheduler.schedule("sweep", due, key="sweep") == job_id
+    assert scheduler.ensure_due_by("sweep", due + timedelta(minutes=5), key="sweep") == job_id
+    assert store.saves == 1
+
+    assert scheduler.ensure_due_by("sweep", due - timedelta(minutes=5), key="sweep") == job_id
+    assert store.saves == 2
+    assert scheduler.pending_count() == 1
+
+def test_persisted_keys_survive_a_restart():
+    store = FakeJobStore()
+    job_id = Scheduler(store).schedule("sweep", datetime.now() + timedelta(hours=1), key="sweep")
+
+    restarted = Scheduler(store)
+    assert restarted.schedule("sweep", datetime.now(), key="sweep") == job_id
+    assert store.saves == 1
+
+def test_finished_one_shot_job_frees_its_key():
+    store = FakeJobStore()
+    scheduler = Scheduler(store)
+    runs = []
+    scheduler.register("sweep", runs.append)
+    job_id = scheduler.schedule("sweep", datetime.now() - timedelta(seconds=1), {"n": 1}, key="sweep")
+
+    async def scenario():
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+    assert runs == [{"n": 1}]
+    assert scheduler.pending_count() == 0
+    assert scheduler.schedule("sweep", datetime.now() + timedelta(hours=1), key="sweep") != job_id
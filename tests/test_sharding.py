@@ -0,0 +1,27 @@
+import discord
+from discord.ext import commands
+from utils.sharding import ShardContext, shard_for
+
+def make_bot(cls=commands.Bot, **options):
+    return cls(command_prefix="!", intents=discord.Intents.none(), **options)
+
+def test_plain_bot_runs_every_shard():
+    context = ShardContext(make_bot())
+
+    assert context.shard_count == 1
+    assert context.shard_ids == [0]
+    assert all(context.owns_user(user_id) for user_id in (1, 123456789012345678, 987654321098765432))
+
+def test_sharded_bot_owns_only_its_shards():
+    context = ShardContext(make_bot(commands.AutoShardedBot, shard_count=4, shard_ids=[1, 3]))
+
+    assert context.shard_ids == [1, 3]
+    for user_id in range(10**17, 10**17 + 50 * (1 << 22), 1 << 22):
+        assert context.owns_user(user_id) == (shard_for(user_id, 4) in (1, 3))
+
+def test_guilds_and_dms_belong_to_their_shard():
+    context = ShardContext(make_bot(commands.AutoShardedBot, shard_count=2, shard_ids=[1]))
+
+    assert context.owns_guild(1 << 22)
+    assert not context.owns_guild(2 << 22)
+    assert not context.owns_guild(None)
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+import pytest
+from utils.database import Database
+from utils.store import SQLiteStore
+from utils.cooldowns import CooldownStore
+from utils.sharding import shard_for
+
+QUEST = {"quest_title": "Quest", "quest_description": "Do something", "reward": 100, "time_limit": 30}
+
+@pytest.fixture
+def processes(tmp_path, monkeypatch):
+    """Two Database objects on one SQLite file, as two bot processes would have."""
+    monkeypatch.chdir(tmp_path)
+    return [Database(SQLiteStore(str(tmp_path / "bot.db"))) for _ in range(2)]
+
+def owned_by(shard_id):
+    return lambda quest: shard_for(quest["guild_id"], 2) == shard_id
+
+def test_each_process_pops_only_its_own_quests(processes):
+    first, second = processes
+    deadline = datetime.now() - timedelta(minutes=1)
+    first.start_quest(1, 10, QUEST, deadline, guild_id=2 << 22)   # Shard 0
+    first.start_quest(2, 20, QUEST, deadline, guild_id=1 << 22)   # Shard 1
+    first.start_quest(3, 30, QUEST, deadline + timedelta(hours=1), guild_id=4 << 22)
+
+    assert first.next_quest_deadline(owns_quest=owned_by(1)) == deadline
+    assert [quest["user_id"] for quest in first.pop_due_quests(owns_quest=owned_by(0))] == [1]
+    assert first.next_quest_deadline(owns_quest=owned_by(0)) == deadline + timedelta(hours=1)
+
+    assert [quest["user_id"] for quest in second.pop_due_quests(owns_quest=owned_by(1))] == [2]
+    assert second.pop_due_quests(owns_quest=owned_by(1)) == []
+    assert second.next_quest_deadline(owns_quest=owned_by(1)) is None
+    assert second.get_active_quest(3) is not None
+
+def test_cooldowns_are_shared_between_processes(processes):
+    first, second = (CooldownStore(db) for db in processes)
+
+    first.set("quest", 1, 600)
+    second.set("rob", 2, 600)
+
+    for store in (first, second):
+        assert store.remaining("quest", 1) > 590
+        assert store.remaining("rob", 2) > 590
+
+    first.clear("rob", 2)
+    assert second.remaining("rob", 2) == 0
+    assert second.remaining("quest", 1) > 590
+
+def test_own_writes_do_not_reload_the_cooldowns(processes, monkeypatch):
+    first, second = (CooldownStore(db) for db in processes)
+    loads = []
+    get_cooldowns = processes[0].get_cooldowns
+    monkeypatch.setattr(processes[0], "get_cooldowns", lambda: loads.append(1) or get_cooldowns())
+
+    first.set("quest", 1, 600)
+    first.clear("quest", 1)
+    first.set("rob", 2, 600)
+    loads.clear()
+    assert first.remaining("rob", 2) > 590
+    assert first.remaining("quest", 1) == 0
+    assert loads == []
+
+    # A write by another process is picked up on the next lookup
+    second.set("quest", 3, 600)
+    assert first.remaining("quest", 3) > 590
+    assert loads == [1]
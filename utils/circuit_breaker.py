@@ -0,0 +1,137 @@
+import time
+import bisect
+import logging
+from collections import deque
+
+class CircuitBreaker:
+    """Circuit breaker with failure-rate and latency thresholds.
+
+    The breaker tracks the outcome of recent calls in a rolling window. When too
+    many of them failed or were slow it opens and rejects calls for a cooldown
+    period, then lets a few probe calls through (half-open) to decide whether to
+    close again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    # Upper bounds (in seconds) of the latency histogram buckets
+    LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 16)
+
+    def __init__(self, name, window_size=20, min_calls=5, failure_rate_threshold=0.5,
+                 slow_call_threshold=5.0, slow_call_rate_threshold=0.5, open_duration=60,
+                 half_open_max_calls=1):
+        self.name = name
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_duration = open_duration
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = self.CLOSED
+        self.opened_at = None
+        self._outcomes = deque(maxlen=window_size)  # (failed, slow) per call
+        self._half_open_calls = 0
+
+        # Lifetime counters and latency histogram (last bucket is overflow)
+        self.total_calls = 0
+        self.total_failures = 0
+        self.total_rejected = 0
+        self.latency_histogram = [0] * (len(self.LATENCY_BUCKETS) + 1)
+
+    def allow_request(self):
+        """Return True if a call may go through right now."""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.open_duration:
+                self.total_rejected += 1
+                return False
+            self._transition(self.HALF_OPEN)
+
+        if self.state == self.HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                self.total_rejected += 1
+                return False
+            self._half_open_calls += 1
+
+        return True
+
+    def record_success(self, latency, slow_call_threshold=None):
+        """Record a call that completed after ``latency`` seconds.
+
+        Calls expected to take longer than usual (e.g. batches) can pass their
+        own ``slow_call_threshold``.
+        """
+        self._record(False, latency, slow_call_threshold)
+
+    def record_failure(self, latency, slow_call_threshold=None):
+        """Record a call that failed (or timed out) after ``latency`` seconds."""
+        self._record(True, latency, slow_call_threshold)
+
+    def _record(self, failed, latency, slow_call_threshold=None):
+        """Update the window and histogram, then re-evaluate the breaker state."""
+        slow = latency >= (slow_call_threshold or self.slow_call_threshold)
+
+        self.total_calls += 1
+        if failed:
+            self.total_failures += 1
+        self.latency_histogram[bisect.bisect_left(self.LATENCY_BUCKETS, latency)] += 1
+
+        if self.state == self.HALF_OPEN:
+            # A single bad probe re-opens the breaker; enough good probes close it
+            if failed or slow:
+                self._transition(self.OPEN)
+            elif self._half_open_calls >= self.half_open_max_calls:
+                self._transition(self.CLOSED)
+            return
+
+        self._outcomes.append((failed, slow))
+        if self.state == self.CLOSED and self._should_open():
+            self._transition(self.OPEN)
+
+    def _should_open(self):
+        """Check the rolling window against the failure and slow call thresholds."""
+        calls = len(self._outcomes)
+        if calls < self.min_calls:
+            return False
+
+        failures = sum(1 for failed, slow in self._outcomes if failed)
+        slow_calls = sum(1 for failed, slow in self._outcomes if slow)
+
+        return (failures / calls >= self.failure_rate_threshold or
+                slow_calls / calls >= self.slow_call_rate_threshold)
+
+    def _transition(self, state):
+        """Move the breaker to a new state."""
+        if state == self.state:
+            return
+
+        logging.warning(f"Circuit breaker '{self.name}' changed from {self.state} to {state}")
+        self.state = state
+        self._half_open_calls = 0
+
+        if state == self.OPEN:
+            self.opened_at = time.monotonic()
+        elif state == self.CLOSED:
+            self._outcomes.clear()
+
+    def snapshot(self):
+        """Return the breaker state and latency histogram as a JSON-friendly dict."""
+        labels = [f"<={bound}s" for bound in self.LATENCY_BUCKETS] + [f">{self.LATENCY_BUCKETS[-1]}s"]
+        retry_in = None
+        if self.state == self.OPEN:
+            retry_in = max(0, round(self.open_duration - (time.monotonic() - self.opened_at), 1))
+
+        return {
+            "name": self.name,
+            "state": self.state,
+            "retry_in": retry_in,
+            "window_calls": len(self._outcomes),
+            "window_failures": sum(1 for failed, slow in self._outcomes if failed),
+            "total_calls": self.total_calls,
+            "total_failures": self.total_failures,
+            "total_rejected": self.total_rejected,
+            "latency_histogram": dict(zip(labels, self.latency_histogram))
+        }
@@ -1,13 +1,38 @@
 """Configuration settings for the Discord bot."""
 
+import os
+
 # Bot prefix for commands
 PREFIX = "!"
 
+# Gateway intent profile: "minimal" (only what the cogs use, members chunked on demand) or "all"
+INTENT_PROFILE = os.environ.get("INTENT_PROFILE", "minimal").lower()
+
+# Sharding: empty runs a single connection, "auto" lets Discord pick the shard count, a number fixes it
+SHARD_COUNT = os.environ.get("SHARD_COUNT", "").strip().lower()
+# Comma-separated shard IDs run by this process (empty runs all of them)
+SHARD_IDS = [int(shard_id) for shard_id in os.environ.get("SHARD_IDS", "").split(",") if shard_id.strip()]
+ACTIVITY_FLUSH_INTERVAL = 60  # Seconds between writes of buffered message activity
+
+# Storage: "json" (files in data/, one process only) or "sqlite" (one store shared by several processes)
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "json").lower()
+SQLITE_PATH = os.environ.get("SQLITE_PATH", "data/economy.db")
+SQLITE_BUSY_TIMEOUT = 30  # Seconds to wait for another process's write transaction
+# Name of this process; per-process data (scheduled jobs, cooldowns) is stored under it
+INSTANCE_NAME = os.environ.get("INSTANCE_NAME") or ("shards-" + "-".join(map(str, SHARD_IDS)) if SHARD_IDS else "main")
+DASHBOARD_PORT = int(os.environ.get("DASHBOARD_PORT", "5000"))
+
 # Economy settings
 DAILY_REWARD = 100  # Amount given for daily reward
 ACTIVITY_BONUS = 10  # Amount given for being active in a company
 TIMEOUT_COST = 50    # Cost to timeout someone
 
+# Bomb rate limits as (bombs, per seconds)
+BOMB_RATE_PER_MODERATOR = (3, 60)  # How often one user can bomb
+BOMB_RATE_PER_TARGET = (2, 300)  # How often one user can be bombed
+BOMB_RATE_PER_GUILD = (10, 60)  # Cap on bombs across the whole server
+TIMEOUT_LOG_RETENTION_DAYS = 30  # Raw bomb logs older than this are dropped; lifetime totals are kept
+
 # Role IDs (as integers for comparison in code)
 PROTECTED_ROLES = [
     1352694494843240448,  # Owner
@@ -24,6 +49,12 @@ TIMEOUT_PERMISSIONS = {
     1352694494813749299: 300,   # level 50 - 5 minutes
 }
 
+# Roles that can create companies (role_id: base activity bonus per active member)
+COMPANY_CREATOR_ROLES = {
+    1352694494797234237: 25,    # level 35
+    1352694494813749299: 50,    # level 50
+}
+
 # Role name mapping for reference
 ROLE_NAMES = {
     1352694494843240448: "Owner",
@@ -39,6 +70,35 @@ ROLE_NAMES = {
 # Robbery settings
 MIN_ROBBERS = 5  # Minimum number of people needed to rob someone
 ROBBERY_COOLDOWN = 3600  # Cooldown in seconds (1 hour) before a user can be robbed again
+ROBBERY_JOIN_WINDOW = 300  # Seconds robbers have to gather before a robbery attempt expires
+
+# Member display names shown in listings are cached for this many seconds
+MEMBER_NAME_CACHE_TTL = 300
+MEMBER_NAME_CACHE_SIZE = 10000  # Maximum number of cached names
+
+# Slash commands that haven't responded after this many seconds are deferred (Discord allows 3)
+SLASH_DEFER_BUDGET = 2.0
 
 # Quest settings
 QUEST_COOLDOWN = 1800  # Cooldown in seconds (30 minutes) between quests
+
+# Quest generation (OpenAI) settings
+QUEST_USE_OPENAI = os.environ.get("QUEST_USE_OPENAI", "true").lower() != "false"  # Set to "false" to only use the local quest engine
+QUEST_LLM_TIMEOUT = 8  # Latency budget in seconds before falling back to a local quest
+QUEST_LLM_MAX_CONCURRENCY = 4  # Maximum number of OpenAI requests in flight at once
+QUEST_POOL_LOW_WATERMARK = 5  # Refill the pre-generated quest pool when it drops below this size
+QUEST_POOL_HIGH_WATERMARK = 20  # Stop refilling once the pool reaches this size
+QUEST_POOL_BATCH_SIZE = 5  # Number of quests requested per OpenAI call when refilling the pool
+QUEST_POOL_TIMEOUT_PER_QUEST = 6  # Latency budget in seconds per requested quest for background refills
+QUEST_POOL_RETRY_DELAY = 60  # Seconds to wait before refilling again after a failed generation
+QUEST_BREAKER_FAILURE_RATE = 0.5  # Open the breaker when this share of recent OpenAI calls failed
+QUEST_BREAKER_SLOW_CALL_SECONDS = 5  # OpenAI calls slower than this count as slow
+QUEST_BREAKER_SLOW_SECONDS_PER_QUEST = 4  # Pool refill batches count as slow above this many seconds per quest
+QUEST_BREAKER_SLOW_CALL_RATE = 0.5  # Open the breaker when this share of recent OpenAI calls were slow
+QUEST_BREAKER_OPEN_SECONDS = 60  # How long the breaker stays open before probing OpenAI again
+
+# Outbound notification and DM queue
+OUTBOX_CONCURRENCY = 5  # Sends in flight at once across all destinations
+OUTBOX_QUEUE_SIZE = 1000  # Messages queued beyond this are dropped
+OUTBOX_MAX_ATTEMPTS = 4  # Tries per message before it's dropped
+OUTBOX_RETRY_BASE_DELAY = 1.0  # Seconds before the first retry, doubled for each further retry
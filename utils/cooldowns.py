@@ -0,0 +1,126 @@
+import time
+
+class CooldownStore:
+    """Namespaced TTL store for cooldowns, evicted with a timing wheel.
+
+    Each entry is a single (namespace, key) -> expiry timestamp pair. Entries are
+    also filed into the wheel slot of their expiry tick; as time advances the
+    passed slots are swept and expired entries dropped, so memory is bounded by
+    the number of active cooldowns. Expiry checks themselves never depend on the
+    sweep, so lookups are always exact.
+
+    If a database is given, cooldowns are persisted and survive restarts. The
+    persisted document is shared by every bot process: each cooldown is written
+    on its own in a transaction, and the local map is reloaded whenever another
+    process changed the document.
+    """
+
+    def __init__(self, db=None, resolution=1, wheel_size=4096):
+        self.db = db
+        self.resolution = resolution
+        self.wheel_size = wheel_size
+
+        self._expiry = {}  # (namespace, key) -> expiry timestamp
+        self._wheel = [set() for _ in range(wheel_size)]
+        self._last_tick = self._tick(time.time())
+        self._version = None  # Version of the persisted document the map was loaded from
+
+        if self.db is not None:
+            self._refresh()
+
+    def _tick(self, timestamp):
+        """Convert a timestamp to a wheel tick."""
+        return int(timestamp // self.resolution)
+
+    def _refresh(self):
+        """Reload the persisted cooldowns if they changed since they were loaded."""
+        if self.db is None:
+            return
+
+        version = self.db.cooldowns_version()
+        if version is not None and version == self._version:
+            return
+
+        self._expiry.clear()
+        for slot in self._wheel:
+            slot.clear()
+
+        now = time.time()
+        for entry, expiry in self.db.get_cooldowns().items():
+            if expiry > now:
+                namespace, key = entry.split(":", 1)
+                self._insert((namespace, int(key)), expiry)
+        self._version = version
+
+    def _written(self, versions):
+        """Note a write of our own so it doesn't trigger a reload.
+
+        Only when nobody else wrote since the map was loaded: then the map
+        already matches the document, our entry included.
+        """
+        before, after = versions
+        if before is not None and before == self._version:
+            self._version = after
+
+    def _insert(self, entry, expiry):
+        """Add an entry to the expiry map and its wheel slot."""
+        self._expiry[entry] = expiry
+        self._wheel[self._tick(expiry) % self.wheel_size].add(entry)
+
+    def _sweep(self, now):
+        """Evict expired entries from the slots the wheel has passed since the last sweep."""
+        tick = self._tick(now)
+        if tick == self._last_tick:
+            return
+
+        # Sweep every tick that has fully passed; after a long gap that is each slot once
+        ticks = min(tick - self._last_tick, self.wheel_size)
+        for offset in range(1, ticks + 1):
+            slot = self._wheel[(tick - offset) % self.wheel_size]
+            if not slot:
+                continue
+
+            # Entries more than one wheel revolution away stay until a later pass
+            expired = [entry for entry in slot if self._expiry.get(entry, 0) <= now]
+            for entry in expired:
+                slot.discard(entry)
+                self._expiry.pop(entry, None)
+
+        self._last_tick = tick
+
+    def set(self, namespace, key, seconds):
+        """Start a cooldown of the given length for a key."""
+        now = time.time()
+        self._sweep(now)
+
+        entry = (namespace, key)
+        old_expiry = self._expiry.get(entry)
+        if old_expiry is not None:
+            self._wheel[self._tick(old_expiry) % self.wheel_size].discard(entry)
+
+        self._insert(entry, now + seconds)
+        if self.db is not None:
+            self._written(self.db.set_cooldown(f"{namespace}:{key}", now + seconds))
+
+    def remaining(self, namespace, key):
+        """Return the seconds left on a key's cooldown, or 0 if it isn't on cooldown."""
+        self._refresh()
+        now = time.time()
+        self._sweep(now)
+
+        expiry = self._expiry.get((namespace, key))
+        if expiry is None or expiry <= now:
+            return 0
+
+        return expiry - now
+
+    def clear(self, namespace, key):
+        """Remove a key's cooldown."""
+        expiry = self._expiry.pop((namespace, key), None)
+        if expiry is not None:
+            self._wheel[self._tick(expiry) % self.wheel_size].discard((namespace, key))
+        if self.db is not None:
+            self._written(self.db.clear_cooldown(f"{namespace}:{key}"))
+
+    def __len__(self):
+        return len(self._expiry)
@@ -1,58 +1,122 @@
 import json
 import os
+import bisect
 import datetime
+import functools
 from datetime import datetime, timedelta
 import logging
+from utils.config import TIMEOUT_LOG_RETENTION_DAYS, INSTANCE_NAME, COMPANY_CREATOR_ROLES, ACTIVITY_BONUS
+from utils.timeout_index import TimeoutLogIndex
+from utils.store import open_store
+
+def transactional(method):
+    """Run a read-modify-write method inside one store transaction."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.store.transaction():
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class Database:
-    """Class for handling all database operations using JSON files."""
+    """Class for handling all database operations on JSON documents.
+    
+    Documents live in JSON files by default, or in a SQLite store shared by
+    several bot processes (STORAGE_BACKEND="sqlite"). Methods that modify a
+    document run in a store transaction so concurrent processes can't
+    overwrite each other's changes.
+    """
     
-    def __init__(self):
+    def __init__(self, store=None):
+        self.store = store or open_store()
+        
         self.users_file = 'data/users.json'
         self.companies_file = 'data/companies.json'
         self.timeout_logs_file = 'data/timeout_logs.json'
         self.transaction_requests_file = 'data/transaction_requests.json'
+        self.active_quests_file = 'data/active_quests.json'
+        
+        # Each process runs its own scheduler, so its jobs aren't shared
+        instance_suffix = "" if INSTANCE_NAME == "main" else f".{INSTANCE_NAME}"
+        self.scheduled_jobs_file = f'data/scheduled_jobs{instance_suffix}.json'
+        self.cooldowns_file = 'data/cooldowns.json'
+        
+        self.pending_actions_file = 'data/pending_actions.json'
+        self.command_sync_file = 'data/command_sync.json'
+        
+        # In-memory indexes over the timeout logs, rebuilt when the document changes
+        self._timeout_index = None
+        self._timeout_index_version = None
         
         self.initialize_data_files()
         
+    @transactional
     def initialize_data_files(self):
         """Initialize data files if they don't exist."""
         os.makedirs('data', exist_ok=True)
         
+        # A new SQLite store starts from the existing JSON files
+        for file_path in (self.users_file, self.companies_file, self.timeout_logs_file,
+                          self.transaction_requests_file, self.scheduled_jobs_file, self.active_quests_file,
+                          self.cooldowns_file, self.pending_actions_file, self.command_sync_file):
+            self.store.adopt_file(file_path)
+            
         # Initialize users file
-        if not os.path.exists(self.users_file):
+        if not self.store.exists(self.users_file):
             self.save_json(self.users_file, {})
             
         # Initialize companies file
-        if not os.path.exists(self.companies_file):
+        if not self.store.exists(self.companies_file):
             self.save_json(self.companies_file, {"next_id": 1, "companies": []})
             
         # Initialize timeout logs file
-        if not os.path.exists(self.timeout_logs_file):
-            self.save_json(self.timeout_logs_file, [])
+        if not self.store.exists(self.timeout_logs_file):
+            self.save_json(self.timeout_logs_file, self._empty_timeout_logs())
             
         # Initialize transaction requests file
-        if not os.path.exists(self.transaction_requests_file):
+        if not self.store.exists(self.transaction_requests_file):
             self.save_json(self.transaction_requests_file, {
                 "requests": [],
                 "next_id": 1
             })
+            
+        # Initialize scheduled jobs file
+        if not self.store.exists(self.scheduled_jobs_file):
+            self.save_json(self.scheduled_jobs_file, {"next_id": 1, "jobs": []})
+            
+        # Initialize active quests file
+        if not self.store.exists(self.active_quests_file):
+            self.save_json(self.active_quests_file, {"quests": {}, "deadlines": []})
+            
+        # Initialize cooldowns file
+        if not self.store.exists(self.cooldowns_file):
+            self.save_json(self.cooldowns_file, {})
+            
+        # Initialize pending actions file (button confirmations)
+        if not self.store.exists(self.pending_actions_file):
+            self.save_json(self.pending_actions_file, {"next_id": 1, "actions": {}})
+            
+        # Initialize slash command sync hashes file
+        if not self.store.exists(self.command_sync_file):
+            self.save_json(self.command_sync_file, {})
+    
+    def transaction(self):
+        """Group several reads and writes into one atomic store transaction (reentrant)."""
+        return self.store.transaction()
     
     def save_json(self, file_path, data):
-        """Save data to a JSON file."""
-        with open(file_path, 'w') as f:
-            # Handle datetime objects for JSON serialization
-            json.dump(data, f, default=self._json_serialize)
+        """Save data to a JSON document."""
+        # Handle datetime objects for JSON serialization
+        self.store.write(file_path, json.dumps(data, default=self._json_serialize))
     
     def load_json(self, file_path):
-        """Load data from a JSON file."""
-        try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-                # Convert string dates back to datetime objects
-                return self._json_deserialize(data)
-        except FileNotFoundError:
+        """Load data from a JSON document."""
+        text = self.store.read(file_path)
+        if text is None:
             return None
+            
+        try:
+            # Convert string dates back to datetime objects
+            return self._json_deserialize(json.loads(text))
         except json.JSONDecodeError:
             logging.error(f"Error parsing JSON from {file_path}")
             return None
@@ -73,6 +137,7 @@ class Database:
             return [self._json_deserialize(item) for item in obj]
         return obj
     
+    @transactional
     def get_or_create_user(self, user_id):
         """Get a user's data or create a new user if they don't exist."""
         users = self.load_json(self.users_file)
@@ -91,6 +156,7 @@ class Database:
             
         return users[user_id_str]
     
+    @transactional
     def add_money(self, user_id, amount):
         """Add money to a user's wallet."""
         users = self.load_json(self.users_file)
@@ -104,6 +170,7 @@ class Database:
         
         return {"success": True, "new_balance": users[user_id_str]["wallet"]}
     
+    @transactional
     def remove_money(self, user_id, amount):
         """Remove money from a user's wallet if they have enough."""
         users = self.load_json(self.users_file)
@@ -120,6 +187,7 @@ class Database:
         
         return {"success": True, "new_balance": users[user_id_str]["wallet"]}
     
+    @transactional
     def claim_daily_reward(self, user_id):
         """Claim the daily reward of $100 if available."""
         users = self.load_json(self.users_file)
@@ -147,18 +215,30 @@ class Database:
             
             return {"success": False, "next_available": next_available}
     
-    def give_daily_rewards_to_all(self):
-        """Give daily rewards to all users at once."""
+    @transactional
+    def give_daily_rewards_to_all(self, owns_user=None):
+        """Give daily rewards to all users at once.
+        
+        Args:
+            owns_user: Optional predicate taking a user ID; when sharded, only the
+                users of this process's shards are paid
+        """
         users = self.load_json(self.users_file)
         now = datetime.now()
         
+        paid = 0
         for user_id in users:
+            if owns_user is not None and not owns_user(int(user_id)):
+                continue
+                
             users[user_id]["wallet"] += 100
             users[user_id]["last_daily"] = now.isoformat()
+            paid += 1
             
         self.save_json(self.users_file, users)
-        logging.info(f"Daily rewards given to {len(users)} users")
+        logging.info(f"Daily rewards given to {paid} users")
     
+    @transactional
     def deposit(self, user_id, amount):
         """Deposit money from wallet to bank."""
         users = self.load_json(self.users_file)
@@ -180,6 +260,7 @@ class Database:
             "bank": users[user_id_str]["bank"]
         }
     
+    @transactional
     def withdraw(self, user_id, amount):
         """Withdraw money from bank to wallet."""
         users = self.load_json(self.users_file)
@@ -201,6 +282,7 @@ class Database:
             "bank": users[user_id_str]["bank"]
         }
     
+    @transactional
     def transfer(self, sender_id, recipient_id, amount):
         """Transfer money from one user to another."""
         users = self.load_json(self.users_file)
@@ -229,6 +311,47 @@ class Database:
             "recipient_wallet": users[recipient_id_str]["wallet"]
         }
     
+    @transactional
+    def apply_wallet_changes(self, changes):
+        """Apply several wallet changes atomically in a single write.
+        
+        Args:
+            changes: A dict of {user_id: amount}, where negative amounts are withdrawn
+            
+        Returns:
+            dict: A dictionary with success status and the new wallet balances, or a
+                message if any wallet would go negative (in which case nothing is changed)
+        """
+        users = self.load_json(self.users_file)
+        now = datetime.now().isoformat()
+        
+        # Validate every change before touching any balance
+        for user_id, amount in changes.items():
+            user = users.get(str(user_id))
+            wallet = user["wallet"] if user else 0
+            if wallet + amount < 0:
+                return {"success": False, "message": f"Not enough money in wallet of user {user_id}"}
+                
+        wallets = {}
+        for user_id, amount in changes.items():
+            user_id_str = str(user_id)
+            if user_id_str not in users:
+                users[user_id_str] = {
+                    "wallet": 0,
+                    "bank": 0,
+                    "last_daily": None,
+                    "company_id": None,
+                    "last_activity": now
+                }
+                
+            users[user_id_str]["wallet"] += amount
+            wallets[user_id] = users[user_id_str]["wallet"]
+            
+        self.save_json(self.users_file, users)
+        
+        return {"success": True, "wallets": wallets}
+    
+    @transactional
     def create_company(self, owner_id, company_name, creator_role_id=None):
         """Create a new company with the given owner and name.
         
@@ -316,6 +439,7 @@ class Database:
                 
         return None
     
+    @transactional
     def update_user_company(self, user_id, company_id):
         """Update a user's company ID."""
         users = self.load_json(self.users_file)
@@ -327,6 +451,7 @@ class Database:
         users[user_id_str]["company_id"] = company_id
         self.save_json(self.users_file, users)
     
+    @transactional
     def add_employee_to_company(self, company_id, user_id):
         """Add a user as an employee to a company.
         
@@ -373,6 +498,7 @@ class Database:
             
         return result
     
+    @transactional
     def remove_employee_from_company(self, company_id, user_id):
         """Remove a user from a company."""
         data = self.load_json(self.companies_file)
@@ -399,6 +525,7 @@ class Database:
         
         return {"success": True}
     
+    @transactional
     def delete_company(self, company_id):
         """Delete a company and update all related users."""
         data = self.load_json(self.companies_file)
@@ -432,6 +559,7 @@ class Database:
         data = self.load_json(self.companies_file)
         return data["companies"]
     
+    @transactional
     def update_activity(self, user_id):
         """Update a user's activity and give them a bonus if they're in a company."""
         users = self.load_json(self.users_file)
@@ -447,35 +575,61 @@ class Database:
         if user["company_id"] is not None:
             # Check if last activity was more than 1 hour ago
             if user["last_activity"] and datetime.fromisoformat(user["last_activity"]) < now - timedelta(hours=1):
-                # Get company info to determine bonus amount
-                company = self.get_company_by_id(user["company_id"])
-                if company:
-                    # Default bonus
-                    bonus_amount = 10
-                    
-                    # Calculate bonus based on creator role and company size
-                    if "creator_role_id" in company:
-                        # Level 35 role (25$ bonus)
-                        if company["creator_role_id"] == 1352694494797234237:
-                            bonus_amount = 25
-                        # Level 50 role (50$ bonus)
-                        elif company["creator_role_id"] == 1352694494813749299:
-                            bonus_amount = 50
-                    
-                    # Additional bonus for companies with more than 5 members
-                    total_members = len(company.get("employees", [])) + 1  # +1 for owner
-                    if total_members > 5:
-                        bonus_amount += 25
-                        
-                    # Give activity bonus
-                    user["wallet"] += bonus_amount
-                else:
-                    # Default bonus if company not found
-                    user["wallet"] += 10
+                user["wallet"] += self._activity_bonus(self.get_company_by_id(user["company_id"]))
                 
         # Update last activity
         user["last_activity"] = now.isoformat()
         self.save_json(self.users_file, users)
+        
+    @transactional
+    def record_activity(self, activity):
+        """Apply buffered message activity for many users in a single write.
+        
+        Args:
+            activity: A dict of {user_id: (first_seen, last_seen)} datetimes
+        """
+        users = self.load_json(self.users_file)
+        companies = {company["id"]: company for company in self.load_json(self.companies_file)["companies"]}
+        
+        for user_id, (first_seen, last_seen) in activity.items():
+            user_id_str = str(user_id)
+            user = users.get(user_id_str)
+            
+            if user is None:
+                # New users start their activity clock now, without a bonus
+                users[user_id_str] = {
+                    "wallet": 0,
+                    "bank": 0,
+                    "last_daily": None,
+                    "company_id": None,
+                    "last_activity": last_seen.isoformat()
+                }
+                continue
+                
+            # Same rule as update_activity, checked at the first buffered message
+            if user["company_id"] is not None:
+                if user["last_activity"] and datetime.fromisoformat(user["last_activity"]) < first_seen - timedelta(hours=1):
+                    user["wallet"] += self._activity_bonus(companies.get(user["company_id"]))
+                    
+            user["last_activity"] = last_seen.isoformat()
+            
+        self.save_json(self.users_file, users)
+        
+    def _activity_bonus(self, company):
+        """Get the hourly activity bonus paid to a member of a company."""
+        # Default bonus if company not found
+        if not company:
+            return ACTIVITY_BONUS
+            
+        # Base bonus based on the creator's role
+        bonus_amount = COMPANY_CREATOR_ROLES.get(company.get("creator_role_id"), ACTIVITY_BONUS)
+        
+        # Additional bonus for companies with more than 5 members
+        total_members = len(company.get("employees", [])) + 1  # +1 for owner
+        if total_members > 5:
+            bonus_amount += 25
+            
+        return bonus_amount
     
     def get_leaderboard(self):
         """Get leaderboard data sorted by total wealth."""
@@ -493,9 +647,58 @@ class Database:
         
         return users_list
     
+    def _empty_timeout_logs(self):
+        """Return an empty timeout log store."""
+        return {"recent": [], "user_totals": {}, "moderator_totals": {}}
+        
+    def _load_timeout_logs(self):
+        """Load the timeout log store, migrating the old flat list format if needed."""
+        data = self.load_json(self.timeout_logs_file)
+        
+        if data is None:
+            return self._empty_timeout_logs()
+            
+        if isinstance(data, list):
+            # Old format: one unbounded list of entries. Roll it up into lifetime totals.
+            logs = sorted(data, key=lambda x: x["timestamp"])
+            data = self._empty_timeout_logs()
+            for log in logs:
+                self._add_to_timeout_totals(data, log)
+            data["recent"] = logs
+            
+            self._compact_timeout_logs(data)
+            self.save_json(self.timeout_logs_file, data)
+            logging.info(f"Migrated {len(logs)} timeout logs to the compacted format")
+            
+        return data
+        
+    def _add_to_timeout_totals(self, data, log):
+        """Count a timeout log entry in the per-user and per-moderator lifetime totals."""
+        for totals, user_id in ((data["user_totals"], log["user_id"]), (data["moderator_totals"], log["moderator_id"])):
+            entry = totals.setdefault(str(user_id), {"count": 0, "total_duration": 0})
+            entry["count"] += 1
+            entry["total_duration"] += log["duration"]
+            
+    def _compact_timeout_logs(self, data, now=None):
+        """Drop raw entries older than the retention period.
+        
+        The lifetime totals already include every entry, so only the raw
+        history is lost. Entries are kept in timestamp order, so the expired
+        ones always form a prefix.
+        
+        Returns:
+            int: The number of entries dropped
+        """
+        cutoff = (now or datetime.now()) - timedelta(days=TIMEOUT_LOG_RETENTION_DAYS)
+        expired = bisect.bisect_left(data["recent"], cutoff, key=lambda x: x["timestamp"])
+        
+        del data["recent"][:expired]
+        return expired
+        
+    @transactional
     def add_timeout_log(self, moderator_id, user_id, duration):
         """Add a timeout log entry."""
-        logs = self.load_json(self.timeout_logs_file)
+        data = self._load_timeout_logs()
         
         log_entry = {
             "moderator_id": moderator_id,
@@ -504,29 +707,79 @@ class Database:
             "timestamp": datetime.now()
         }
         
-        logs.append(log_entry)
-        self.save_json(self.timeout_logs_file, logs)
+        data["recent"].append(log_entry)
+        self._add_to_timeout_totals(data, log_entry)
+        self._compact_timeout_logs(data, log_entry["timestamp"])
+        self.save_json(self.timeout_logs_file, data)
     
+    def _get_timeout_index(self):
+        """Get the indexes over the recent timeout logs, rebuilding them if the document changed.
+        
+        The document version is shared by all processes, so logs added by
+        another process invalidate this one's index too.
+        """
+        version = self.store.version(self.timeout_logs_file)
+        
+        if self._timeout_index is None or version != self._timeout_index_version:
+            with self.transaction():
+                self._timeout_index = TimeoutLogIndex(self._load_timeout_logs()["recent"])
+                # Loading may have migrated (rewritten) the document
+                self._timeout_index_version = self.store.version(self.timeout_logs_file)
+            
+        return self._timeout_index
+        
     def get_timeout_logs(self, user_id):
-        """Get timeout logs for a user."""
-        logs = self.load_json(self.timeout_logs_file)
+        """Get the recent (within the retention period) timeout logs for a user, newest first."""
+        return self._get_timeout_index().for_user(user_id)[::-1]
         
-        # Filter logs for the specified user
-        user_logs = [log for log in logs if log["user_id"] == user_id]
+    def get_timeout_logs_by_moderator(self, moderator_id, since=None, until=None):
+        """Get the recent timeout logs for bombs given by a moderator, newest first."""
+        return self._get_timeout_index().for_moderator(moderator_id, since, until)[::-1]
         
-        # Sort by timestamp (newest first)
-        user_logs.sort(key=lambda x: x["timestamp"], reverse=True)
+    def get_timeout_logs_between(self, since=None, until=None):
+        """Get the recent timeout logs within a time window, newest first."""
+        return self._get_timeout_index().between(since, until)[::-1]
         
-        return user_logs
+    def get_timeout_logs_by_duration(self, min_duration=None, max_duration=None):
+        """Get the recent timeout logs with a duration (in seconds) within a range, shortest first."""
+        return self._get_timeout_index().with_duration(min_duration, max_duration)
         
+    def get_timeout_stats(self, since=None, limit=5):
+        """Get the top bombers and most bombed users since the given datetime.
+        
+        Args:
+            since: Start of the window (None for the whole retention period)
+            limit: Number of users to include in each ranking
+            
+        Returns:
+            dict: "top_bombers" and "most_bombed" as lists of (user_id, count), and the "total" bombs
+        """
+        return self._get_timeout_index().top(since, limit=limit)
+        
+    def get_timeout_totals(self, user_id):
+        """Get a user's lifetime timeout totals.
+        
+        Returns:
+            dict: "received" and "given" totals, each with a count and total_duration in seconds
+        """
+        data = self._load_timeout_logs()
+        empty = {"count": 0, "total_duration": 0}
+        
+        return {
+            "received": data["user_totals"].get(str(user_id), empty),
+            "given": data["moderator_totals"].get(str(user_id), empty)
+        }
+        
+    @transactional
     def initialize_transaction_requests_file(self):
         """Initialize the transaction requests file if it doesn't exist."""
-        if not os.path.exists(self.transaction_requests_file):
+        if not self.store.exists(self.transaction_requests_file):
             self.save_json(self.transaction_requests_file, {
                 "requests": [],
                 "next_id": 1
             })
             
+    @transactional
     def create_money_request(self, requester_id, recipient_id, amount, reason=None):
         """Create a money request from one user to another.
         
@@ -590,6 +843,7 @@ class Database:
                 
         return None
         
+    @transactional
     def resolve_money_request(self, request_id, accept=True):
         """Resolve a money request by accepting or rejecting it.
         
@@ -641,6 +895,215 @@ class Database:
         
         return result
         
+    def get_scheduled_jobs(self):
+        """Get all persisted scheduler jobs."""
+        data = self.load_json(self.scheduled_jobs_file)
+        
+        if data is None:
+            return {"next_id": 1, "jobs": []}
+            
+        return data
+        
+    def save_scheduled_jobs(self, data):
+        """Persist the scheduler's pending jobs."""
+        self.save_json(self.scheduled_jobs_file, data)
+        
+    @transactional
+    def start_quest(self, user_id, channel_id, quest_data, deadline, guild_id=None):
+        """Record an accepted quest that resolves at the given deadline.
+        
+        Args:
+            user_id: The user ID who accepted the quest
+            channel_id: The channel where the outcome should be announced
+            quest_data: The quest as returned by the quest generator
+            deadline: The datetime at which the quest resolves
+            guild_id: The guild of the channel (None for DMs), which decides the
+                process that resolves the quest
+            
+        Returns:
+            dict: A dictionary with success status, and a message if it failed
+        """
+        data = self.load_json(self.active_quests_file)
+        user_id_str = str(user_id)
+        
+        if user_id_str in data["quests"]:
+            return {"success": False, "message": "You already have an active quest"}
+            
+        data["quests"][user_id_str] = {
+            "user_id": user_id,
+            "channel_id": channel_id,
+            "guild_id": guild_id,
+            "title": quest_data["quest_title"],
+            "reward": quest_data["reward"],
+            "deadline": deadline
+        }
+        
+        # Keep the deadline index sorted so due quests are always at the front
+        bisect.insort(data["deadlines"], [deadline, user_id])
+        self.save_json(self.active_quests_file, data)
+        
+        return {"success": True}
+        
+    def get_active_quest(self, user_id):
+        """Get a user's active quest, if any."""
+        data = self.load_json(self.active_quests_file)
+        return data["quests"].get(str(user_id))
+        
+    def next_quest_deadline(self, owns_quest=None):
+        """Get the earliest active quest deadline, or None if there are no active quests.
+        
+        Args:
+            owns_quest: Optional predicate taking a quest; when sharded, only the
+                quests this process resolves are considered
+        """
+        data = self.load_json(self.active_quests_file)
+        
+        for deadline, user_id in data["deadlines"]:
+            quest = data["quests"].get(str(user_id))
+            if quest and (owns_quest is None or owns_quest(quest)):
+                return deadline
+                
+        return None
+        
+    @transactional
+    def pop_due_quests(self, now=None, owns_quest=None):
+        """Remove and return the active quests whose deadline has passed.
+        
+        Args:
+            now: The time to compare deadlines against (defaults to now)
+            owns_quest: Optional predicate taking a quest; when sharded, quests of
+                other processes are left for them to resolve
+        """
+        data = self.load_json(self.active_quests_file)
+        now = now or datetime.now()
+        
+        # The index is sorted by deadline, so due quests form a prefix
+        due_count = bisect.bisect_right(data["deadlines"], [now, float("inf")])
+        if due_count == 0:
+            return []
+            
+        due_quests = []
+        kept = []
+        for entry in data["deadlines"][:due_count]:
+            quest = data["quests"].get(str(entry[1]))
+            if quest is None:
+                continue
+            if owns_quest is not None and not owns_quest(quest):
+                kept.append(entry)
+                continue
+                
+            due_quests.append(data["quests"].pop(str(entry[1])))
+            
+        if len(kept) < due_count:
+            data["deadlines"][:due_count] = kept
+            self.save_json(self.active_quests_file, data)
+        
+        return due_quests
+        
+    def get_cooldowns(self):
+        """Get all persisted cooldowns as a {"namespace:key": expiry_timestamp} dict."""
+        return self.load_json(self.cooldowns_file) or {}
+        
+    def cooldowns_version(self):
+        """The cooldowns document's version, which changes whenever any process writes it."""
+        return self.store.version(self.cooldowns_file)
+        
+    @transactional
+    def set_cooldown(self, entry, expiry):
+        """Persist one cooldown, dropping the ones that already expired.
+        
+        Returns:
+            tuple: The document's version before and after the write
+        """
+        before = self.cooldowns_version()
+        now = datetime.now().timestamp()
+        cooldowns = {key: value for key, value in self.get_cooldowns().items() if value > now}
+        cooldowns[entry] = expiry
+        self.save_json(self.cooldowns_file, cooldowns)
+        return before, self.cooldowns_version()
+        
+    @transactional
+    def clear_cooldown(self, entry):
+        """Remove one persisted cooldown.
+        
+        Returns:
+            tuple: The document's version before and after the write (the same if there was nothing to remove)
+        """
+        before = self.cooldowns_version()
+        cooldowns = self.get_cooldowns()
+        if cooldowns.pop(entry, None) is not None:
+            self.save_json(self.cooldowns_file, cooldowns)
+        return before, self.cooldowns_version()
+        
+    @transactional
+    def create_pending_action(self, action_type, user_id, expires_at, **data):
+        """Store an action waiting for a user to confirm it with a button.
+        
+        Args:
+            action_type: What the action does (e.g. "invite", "disband")
+            user_id: The only user allowed to confirm or cancel it
+            expires_at: The datetime after which it can no longer be confirmed
+            **data: Extra JSON-serializable data needed to carry out the action
+            
+        Returns:
+            int: The ID of the pending action, used in the buttons' custom_ids
+        """
+        pending = self.load_json(self.pending_actions_file)
+        now = datetime.now()
+        
+        # Drop expired actions so the table only holds live confirmations
+        pending["actions"] = {
+            action_id: action for action_id, action in pending["actions"].items()
+            if action["expires_at"] > now
+        }
+        
+        action_id = pending["next_id"]
+        pending["next_id"] += 1
+        pending["actions"][str(action_id)] = {
+            "id": action_id,
+            "type": action_type,
+            "user_id": user_id,
+            "expires_at": expires_at,
+            **data
+        }
+        
+        self.save_json(self.pending_actions_file, pending)
+        return action_id
+        
+    def get_pending_action(self, action_id):
+        """Get a pending action, or None if it doesn't exist or has expired."""
+        pending = self.load_json(self.pending_actions_file)
+        action = pending["actions"].get(str(action_id))
+        
+        if action is None or action["expires_at"] <= datetime.now():
+            return None
+            
+        return action
+        
+    @transactional
+    def pop_pending_action(self, action_id):
+        """Remove and return a pending action, or None if it doesn't exist or has expired."""
+        pending = self.load_json(self.pending_actions_file)
+        action = pending["actions"].pop(str(action_id), None)
+        
+        if action is None:
+            return None
+            
+        self.save_json(self.pending_actions_file, pending)
+        
+        if action["expires_at"] <= datetime.now():
+            return None
+            
+        return action
+        
+    def get_command_tree_hashes(self):
+        """Get the hash of the last synced slash command tree per scope ("global" or a guild ID)."""
+        return self.load_json(self.command_sync_file) or {}
+        
+    def save_command_tree_hashes(self, hashes):
+        """Persist the slash command tree hashes."""
+        self.save_json(self.command_sync_file, hashes)
+        
     def log_transaction(self, sender_id, recipient_id, amount, transaction_type, message=None):
         """Log a money transaction for notification purposes.
         
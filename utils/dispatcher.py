@@ -0,0 +1,97 @@
+import asyncio
+import heapq
+
+class PendingReaction:
+    """A confirmation waiting for one user to react to one message."""
+
+    __slots__ = ("future", "user_id", "emojis", "expires_at")
+
+    def __init__(self, future, user_id, emojis, expires_at):
+        self.future = future
+        self.user_id = user_id
+        self.emojis = emojis
+        self.expires_at = expires_at
+
+class ReactionDispatcher:
+    """Routes reactions to whoever is waiting for them.
+
+    Pending reaction confirmations are indexed by message ID, so each reaction is
+    routed with a single dict lookup no matter how many confirmations are open,
+    instead of running every ``wait_for`` check. Timeouts are kept in a heap and
+    handled by one timer armed for the earliest deadline.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+
+        self._pending = {}  # message_id -> PendingReaction
+        self._expiry_heap = []  # (expires_at, message_id), stale entries are skipped lazily
+        self._timer = None
+        self._timer_at = None
+
+        bot.add_listener(self._on_raw_reaction_add, "on_raw_reaction_add")
+
+    async def wait_for_reaction(self, message, user_id, emojis=("✅", "❌"), timeout=60.0):
+        """Wait for a user to react to a message with one of the given emojis.
+
+        Returns:
+            str: The emoji the user reacted with
+
+        Raises:
+            asyncio.TimeoutError: If the user didn't react in time
+        """
+        loop = asyncio.get_running_loop()
+
+        pending = PendingReaction(loop.create_future(), user_id, frozenset(emojis), loop.time() + timeout)
+        self._pending[message.id] = pending
+        heapq.heappush(self._expiry_heap, (pending.expires_at, message.id))
+        self._arm_timer(loop)
+
+        try:
+            return await pending.future
+        finally:
+            if self._pending.get(message.id) is pending:
+                del self._pending[message.id]
+
+    def pending_count(self):
+        """Return the number of confirmations currently waiting for a reaction."""
+        return len(self._pending)
+
+    def _arm_timer(self, loop):
+        """Make sure the timer fires at the earliest pending deadline."""
+        if not self._expiry_heap:
+            return
+
+        when = self._expiry_heap[0][0]
+        if self._timer is not None and self._timer_at <= when:
+            return
+
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_at(when, self._expire, loop)
+        self._timer_at = when
+
+    def _expire(self, loop):
+        """Time out every confirmation whose deadline has passed, then re-arm the timer."""
+        self._timer = None
+        now = loop.time()
+
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, message_id = heapq.heappop(self._expiry_heap)
+            pending = self._pending.get(message_id)
+
+            # The entry may belong to a confirmation that was already answered or replaced
+            if pending is not None and pending.expires_at == expires_at and not pending.future.done():
+                pending.future.set_exception(asyncio.TimeoutError())
+
+        self._arm_timer(loop)
+
+    async def _on_raw_reaction_add(self, payload):
+        """Resolve the confirmation waiting on the reacted message, if any."""
+        pending = self._pending.get(payload.message_id)
+        if pending is None or payload.user_id != pending.user_id:
+            return
+
+        emoji = str(payload.emoji)
+        if emoji in pending.emojis and not pending.future.done():
+            pending.future.set_result(emoji)
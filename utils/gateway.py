@@ -0,0 +1,60 @@
+import logging
+import discord
+from discord.ext import commands
+
+def _minimal_intents():
+    """Only the intents the cogs use."""
+    intents = discord.Intents.none()
+    intents.guilds = True            # Guilds, channels and roles
+    intents.members = True           # Member updates, member lookups and chunk queries
+    intents.guild_messages = True    # Prefix commands and activity tracking
+    intents.dm_messages = True       # Prefix commands sent in DMs (!help, !balance, ...)
+    intents.message_content = True   # Reading prefix commands
+    intents.guild_reactions = True   # Reaction confirmations
+    intents.dm_reactions = True      # Reaction confirmations on commands sent in DMs
+    return intents
+
+# Intent profile name -> (intents factory, extra client options)
+INTENT_PROFILES = {
+    # Member lists are chunked lazily per guild, and no message cache is kept
+    # (reactions and buttons are handled from raw events)
+    "minimal": (_minimal_intents, {"chunk_guilds_at_startup": False, "max_messages": None}),
+    # Everything, including presences; every guild is chunked at startup
+    "all": (discord.Intents.all, {}),
+}
+
+def gateway_settings(profile):
+    """Get the intents and extra client options for an intent profile.
+
+    Returns:
+        tuple: (intents, options) to pass to the bot constructor
+    """
+    if profile not in INTENT_PROFILES:
+        logging.warning(f"Unknown intent profile '{profile}', using 'minimal'")
+        profile = "minimal"
+
+    make_intents, options = INTENT_PROFILES[profile]
+    logging.info(f"Using the '{profile}' gateway intent profile")
+    return make_intents(), dict(options)
+
+def sharding_settings(shard_count, shard_ids):
+    """Pick the bot base class and sharding options.
+
+    Args:
+        shard_count: "" for a single connection, "auto" to let Discord pick, or a number
+        shard_ids: Shard IDs run by this process (empty for all of them)
+
+    Returns:
+        tuple: (bot class, options) to build the bot with
+    """
+    if not shard_count:
+        return commands.Bot, {}
+
+    options = {"shard_count": None if shard_count == "auto" else int(shard_count)}
+    if shard_ids:
+        if options["shard_count"] is None:
+            raise ValueError("SHARD_IDS requires a fixed SHARD_COUNT")
+        options["shard_ids"] = shard_ids
+
+    logging.info(f"Running sharded (shard count: {shard_count}, shards: {shard_ids or 'all'})")
+    return commands.AutoShardedBot, options
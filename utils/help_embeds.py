@@ -0,0 +1,131 @@
+import discord
+
+# Help menu overview: (category, field name, summary)
+HELP_OVERVIEW = (
+    ("economy", "🏦 Economy", "Money, bank, and daily rewards"),
+    ("company", "🏢 Company", "Company creation and management"),
+    ("moderation", "🛡️ Moderation", "Role-based bomb (timeout) commands"),
+    ("general", "📊 General", "General utility commands"),
+)
+
+# Commands per category: category -> (title, description, ((prefix usage, slash usage, description), ...))
+HELP_CATEGORIES = {
+    "economy": ("Economy Commands", "Commands for managing your money and earning rewards.", (
+        ("balance", "/balance", "Check your current balance"),
+        ("daily", "/daily", "Claim your daily reward of $100"),
+        ("deposit <amount>", "/deposit amount:<amount>", "Deposit money to your bank"),
+        ("withdraw <amount>", "/withdraw amount:<amount>", "Withdraw money from your bank"),
+        ("transfer <@user> <amount>", "/transfer user:<@user> amount:<amount>", "Send money to another user"),
+        ("quest", "/quest", "Get a random quest to earn money"),
+        ("rob <@user>", "/rob user:<@user>", "Attempt to rob another user (requires 5+ people)"),
+        ("leaderboard", "/leaderboard", "Display the richest users on the server"),
+        ("request <@user> <amount> [reason]", "/request user:<@user> amount:<amount> [reason:<reason>]", "Request money from another user"),
+        ("requests", "/requests", "View your pending money requests"),
+        ("reject <id>", "/reject request_id:<id>", "Reject a money request sent to you"),
+    )),
+    "company": ("Company Commands", "Commands for managing companies and employees.", (
+        ("createcompany <name>", "/createcompany name:<name>", "Create a new company (requires higher role)"),
+        ("company [name]", "/company [name]", "Display info about your company or another company"),
+        ("invite <@user>", "/invite user:<@user>", "Invite a user to your company"),
+        ("leave", "/leave", "Leave your current company"),
+        ("kick <@user>", "/kick user:<@user>", "Kick a member from your company (owner only)"),
+        ("disband", "/disband", "Disband your company as the owner"),
+        ("companies", "/companies", "List all companies on the server"),
+    )),
+    "moderation": ("Moderation Commands", "Commands for bombing (timing out) users.", (
+        ("bomb <@user>", "/bomb user:<@user>", "Bomb (timeout) a user based on your role permissions"),
+        ("bombcost", "/bomb_cost", "Check the cost of using the bomb command"),
+        ("bomblimit", "/bomb_limit", "Check your bomb duration limit based on your roles"),
+        ("bombhistory [@user]", "/bomb_history [user:<@user>]", "View bomb history for yourself or another user"),
+        ("bombstats [days]", "/bomb_stats [days:<days>]", "View the top bombers and most bombed users"),
+    )),
+    "general": ("General Commands", "General utility commands.", (
+        ("help [category]", "/help [category]", "Display this help menu"),
+        ("ping", "/ping", "Check the bot's response time"),
+        ("info", "/info", "Display information about the bot"),
+    )),
+}
+
+BOT_FEATURES = """
+• Economy system with wallet and bank
+• Daily rewards of $100 for all users
+• Company creation and management
+• AI-generated quests for earning money
+• Role-based timeout system
+"""
+
+class EmbedCache:
+    """Cache of prebuilt embeds keyed by (kind, style, prefix, category).
+
+    Help embeds only change when the bot's commands change, so they are built
+    once, in the startup phase after the extensions are loaded, and the same
+    objects are sent on every call. Anything that changes the commands at
+    runtime must clear and rewarm the cache. Embeds with live values aren't
+    cached: ``Embed.copy()`` costs more than building a small embed.
+    """
+
+    def __init__(self):
+        self._embeds = {}
+
+    def get(self, key, builder):
+        """Get the cached embed for a key, building it with ``builder()`` on a miss."""
+        embed = self._embeds.get(key)
+        if embed is None:
+            embed = self._embeds[key] = builder()
+        return embed
+
+    def clear(self):
+        self._embeds.clear()
+
+    def __len__(self):
+        return len(self._embeds)
+
+def build_help_embed(category, prefix, slash=False):
+    """Build the help embed for a category (or the overview if category is None)."""
+    if slash:
+        description = f"Use `/help category:category_name` to view specific commands.\nThese commands are also available with the `{prefix}` prefix!"
+    else:
+        description = f"Use `{prefix}help <category>` to view specific commands.\nAll commands are also available as slash commands!"
+
+    embed = discord.Embed(
+        title="Discord Economy Bot - Help Menu",
+        description=description,
+        color=discord.Color.blue()
+    )
+    embed.set_footer(text=f"Discord Economy Bot | Use {prefix}help or /help")
+
+    if category is None:
+        for name, field_name, summary in HELP_OVERVIEW:
+            usage = f"/help {name}" if slash else f"{prefix}help {name}"
+            embed.add_field(name=field_name, value=f"`{usage}` - {summary}", inline=False)
+        return embed
+
+    embed.title, embed.description, commands = HELP_CATEGORIES[category]
+    for prefix_usage, slash_usage, command_description in commands:
+        embed.add_field(name=slash_usage if slash else f"{prefix}{prefix_usage}", value=command_description, inline=False)
+
+    return embed
+
+def build_unknown_category_embed(category, prefix, slash=False):
+    """Build the help embed for a category that doesn't exist (not cached)."""
+    embed = build_help_embed(None, prefix, slash)
+    embed.clear_fields()
+    embed.title = "Unknown Category"
+    embed.description = f"Category '{category}' not found. Use `{'/' if slash else prefix}help` to see available categories."
+    return embed
+
+def build_info_embed(prefix, server_count):
+    """Build the bot info embed (not cached, since the server count changes)."""
+    embed = discord.Embed(
+        title="Discord Economy Bot",
+        description="A Discord economy bot with company creation, money management, bank system, and role-based timeout features",
+        color=discord.Color.blue()
+    )
+
+    embed.add_field(name="Version", value="1.0.0", inline=True)
+    embed.add_field(name="Prefix", value=prefix, inline=True)
+    embed.add_field(name="Server Count", value=server_count, inline=True)
+    embed.add_field(name="Features", value=BOT_FEATURES, inline=False)
+
+    embed.set_footer(text="Made with ❤️ for Discord")
+    return embed
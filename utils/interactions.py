@@ -0,0 +1,192 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import time
+from utils.config import SLASH_DEFER_BUDGET
+
+# Per-command counters: command name -> {"calls", "deferred", "slowest"}
+defer_stats = {}
+
+# The _DeferState of the slash command running in the current task, if any
+_current_state = contextvars.ContextVar("auto_defer_state", default=None)
+
+class _DeferState:
+    """Bookkeeping for one slash command invocation."""
+
+    __slots__ = ("interaction", "response", "started", "budget", "ephemeral", "deferred", "answered", "finished",
+                 "lock", "timer", "task")
+
+    def __init__(self, interaction, response, budget, ephemeral):
+        self.interaction = interaction
+        self.response = response  # The real InteractionResponse
+        self.started = time.monotonic()
+        self.budget = budget
+        self.ephemeral = ephemeral
+        self.deferred = False
+        self.answered = False  # Whether a followup replaced the "thinking" message
+        self.finished = False  # Whether the handler returned; no defer may start after that
+        self.lock = asyncio.Lock()
+        self.timer = None
+        self.task = None  # The defer started by the timer
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def start_defer(self):
+        """Timer callback: defer in a task the wrapper can wait for."""
+        self.task = asyncio.ensure_future(self.defer())
+
+    async def finish(self):
+        """Stop the timer and wait for a defer that is already being sent."""
+        self.finished = True
+        self.timer.cancel()
+        if self.task is not None:
+            await asyncio.gather(self.task, return_exceptions=True)
+
+    async def defer(self):
+        """Defer the response unless the command already responded or returned."""
+        async with self.lock:
+            if self.finished or self.deferred or self.response.is_done():
+                return
+
+            await self.response.defer(ephemeral=self.ephemeral, thinking=True)
+            self.deferred = True
+
+class DeferringResponse:
+    """Stand-in for ``interaction.response`` used while a command runs under auto_defer.
+
+    Until the response is deferred it behaves exactly like the real one. After
+    an automatic defer, send_message goes out as a followup and edit_message
+    edits the original response, so command code doesn't have to know whether
+    the defer happened.
+
+    The first followup replaces the "thinking" message and Discord keeps that
+    message's visibility, so if the reply's ``ephemeral`` flag doesn't match
+    the defer's, the "thinking" message is deleted and the reply is sent as a
+    new message instead.
+    """
+
+    def __init__(self, state):
+        self._state = state
+
+    async def send_message(self, content=None, **kwargs):
+        state = self._state
+        async with state.lock:
+            if not state.deferred:
+                return await state.response.send_message(content, **kwargs)
+
+        # Followups don't support delete_after; the rest of the arguments match
+        kwargs.pop("delete_after", None)
+        if content is not None:
+            kwargs["content"] = content
+
+        if not state.answered:
+            state.answered = True
+            if kwargs.get("ephemeral", False) != state.ephemeral:
+                await state.interaction.delete_original_response()
+        await state.interaction.followup.send(**kwargs)
+
+    async def edit_message(self, **kwargs):
+        state = self._state
+        async with state.lock:
+            if not state.deferred:
+                return await state.response.edit_message(**kwargs)
+
+        await state.interaction.edit_original_response(**kwargs)
+
+    async def defer(self, **kwargs):
+        state = self._state
+        async with state.lock:
+            if not state.deferred:
+                await state.response.defer(**kwargs)
+                state.deferred = True
+                state.ephemeral = kwargs.get("ephemeral", False)
+
+    def __getattr__(self, name):
+        return getattr(self._state.response, name)
+
+async def defer_if_slow(interaction=None):
+    """Checkpoint for commands doing blocking work: defer now if the budget is used up.
+
+    The auto_defer timer can only fire while the command is awaiting something,
+    not while it's blocked in storage calls, so slash commands call this before
+    each blocking section after the first. Without an interaction it applies to
+    the slash command running in the current task, which lets command cores
+    shared with prefix commands (where it does nothing) checkpoint too.
+    """
+    if interaction is None:
+        state = _current_state.get()
+    elif isinstance(interaction.response, DeferringResponse):
+        state = interaction.response._state
+    else:
+        state = None
+
+    if state is not None and not state.deferred and state.elapsed() >= state.budget:
+        await state.defer()
+
+def _install_response(interaction, response):
+    """Make ``interaction.response`` return the given stand-in.
+
+    discord.py 2.x builds ``Interaction.response`` lazily and caches it in the
+    private ``_cs_response`` slot (verified with 2.7.1). If a release
+    stops honoring the slot, the stand-in isn't installed and the command runs
+    without auto-deferring instead of breaking.
+
+    Returns:
+        bool: Whether the stand-in is now in place
+    """
+    try:
+        interaction._cs_response = response
+    except AttributeError:
+        pass
+
+    if interaction.response is response:
+        return True
+
+    logging.warning("Couldn't install the auto-defer response; discord.py's Interaction may have changed")
+    return False
+
+def auto_defer(budget=SLASH_DEFER_BUDGET, ephemeral=False):
+    """Decorator for slash command handlers that defers the response when it's running late.
+
+    Discord fails an interaction that isn't answered within 3 seconds. If the
+    handler hasn't responded after ``budget`` seconds the response is deferred
+    (showing "thinking...") and later messages are sent as followups instead.
+    Place it below the ``app_commands.command`` decorator. The timer can't fire
+    during blocking storage calls, so handlers also call ``defer_if_slow``
+    between them.
+
+    Args:
+        budget: Seconds to wait before deferring
+        ephemeral: Whether the deferred "thinking" response is only shown to the
+            user; pick what the command's usual reply is, since a reply with the
+            other visibility costs an extra request to replace the "thinking" message
+    """
+    def decorator(func):
+        command_name = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(self, interaction, *args, **kwargs):
+            state = _DeferState(interaction, interaction.response, budget, ephemeral)
+            if not _install_response(interaction, DeferringResponse(state)):
+                return await func(self, interaction, *args, **kwargs)
+
+            state.timer = asyncio.get_running_loop().call_later(budget, state.start_defer)
+
+            token = _current_state.set(state)
+            try:
+                return await func(self, interaction, *args, **kwargs)
+            finally:
+                _current_state.reset(token)
+                await state.finish()
+
+                stats = defer_stats.setdefault(command_name, {"calls": 0, "deferred": 0, "slowest": 0})
+                stats["calls"] += 1
+                stats["slowest"] = max(stats["slowest"], round(state.elapsed(), 3))
+                if state.deferred:
+                    stats["deferred"] += 1
+                    logging.info(f"Slash command '{command_name}' was deferred after {state.elapsed():.2f}s")
+
+        return wrapper
+    return decorator
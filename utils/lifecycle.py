@@ -0,0 +1,81 @@
+import time
+import asyncio
+import logging
+
+class Lifecycle:
+    """Run the bot's startup steps exactly once and track its readiness.
+
+    ``on_ready`` fires again after every gateway reconnect, so anything that
+    must only happen once per process (loading extensions, warming caches,
+    starting background jobs, syncing commands) runs as a named phase from
+    ``setup_hook`` instead. A phase that completed is never run again; a phase
+    that failed is recorded and may be retried by running it again.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.phases = {}  # phase name -> {"done", "seconds", "error"}
+        self.connected = False
+        self.ready_at = None
+        self.ready_events = 0
+        self.disconnects = 0
+
+    async def run_phase(self, name, step):
+        """Run a startup step (sync or async) unless it already completed.
+
+        Returns:
+            bool: True if the step ran and succeeded
+        """
+        phase = self.phases.get(name)
+        if phase is not None and phase["done"]:
+            logging.info(f"Startup phase '{name}' already done, skipping")
+            return False
+
+        started = time.monotonic()
+        try:
+            result = step()
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            logging.error(f"Startup phase '{name}' failed: {e}")
+            self.phases[name] = {"done": False, "seconds": round(time.monotonic() - started, 3), "error": str(e)}
+            return False
+
+        self.phases[name] = {"done": True, "seconds": round(time.monotonic() - started, 3), "error": None}
+        logging.info(f"Startup phase '{name}' done in {self.phases[name]['seconds']}s")
+        return True
+
+    def mark_ready(self):
+        """Record an on_ready event. Returns True the first time, False on reconnects."""
+        self.connected = True
+        self.ready_events += 1
+
+        if self.ready_at is None:
+            self.ready_at = time.time()
+            return True
+
+        logging.info(f"Reconnected to Discord (ready event #{self.ready_events})")
+        return False
+
+    def mark_disconnected(self):
+        """Record a lost gateway connection."""
+        if self.connected:
+            self.connected = False
+            self.disconnects += 1
+
+    @property
+    def is_ready(self):
+        """Whether every startup phase completed and the bot is connected."""
+        return self.connected and all(phase["done"] for phase in self.phases.values())
+
+    def status(self):
+        """Readiness summary for the dashboard."""
+        return {
+            "ready": self.is_ready,
+            "connected": self.connected,
+            "phases": self.phases,
+            "ready_at": self.ready_at,
+            "ready_events": self.ready_events,
+            "disconnects": self.disconnects,
+            "startup_seconds": round(self.ready_at - self.started_at, 3) if self.ready_at else None,
+        }
@@ -0,0 +1,125 @@
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from utils.config import MEMBER_NAME_CACHE_TTL, MEMBER_NAME_CACHE_SIZE
+
+# Discord allows at most 100 user IDs per member chunk request
+QUERY_BATCH_SIZE = 100
+
+class MemberResolver:
+    """Resolve user IDs to display names for listings.
+
+    IDs are deduplicated and looked up in an LRU cache of names (entries expire
+    after a TTL), then in the guild's member cache. Whatever is left is fetched
+    with a single gateway chunk request (``guild.query_members``) instead of one
+    API call per member. Users that can't be found are shown as "User <id>"; that
+    fallback is cached too, so departed members aren't queried on every listing.
+    """
+
+    def __init__(self, ttl=MEMBER_NAME_CACHE_TTL, max_entries=MEMBER_NAME_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._names = OrderedDict()  # (guild_id, user_id) -> (display name, expires_at)
+        self._chunk_locks = {}  # guild_id -> asyncio.Lock
+
+    async def ensure_chunked(self, guild):
+        """Download a guild's full member list once, the first time it's needed.
+
+        With the minimal intent profile guilds aren't chunked at startup, so the
+        member cache only holds members seen in events until this runs.
+        """
+        if guild.chunked:
+            return
+
+        lock = self._chunk_locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            if not guild.chunked:
+                logging.info(f"Chunking members of guild {guild.id}")
+                await guild.chunk(cache=True)
+
+    def _store(self, guild_id, user_id, name, now):
+        """Cache a display name, evicting the least recently used entry if full."""
+        key = (guild_id, user_id)
+        self._names[key] = (name, now + self.ttl)
+        self._names.move_to_end(key)
+
+        if len(self._names) > self.max_entries:
+            self._names.popitem(last=False)
+
+    async def display_names(self, guild, user_ids):
+        """Get display names for the given user IDs.
+
+        Returns:
+            dict: user_id -> display name (or "User <id>" if the user couldn't be found)
+        """
+        now = time.monotonic()
+        names = {}
+        misses = []
+
+        for user_id in dict.fromkeys(user_ids):
+            cached = self._names.get((guild.id, user_id))
+            if cached is not None and cached[1] > now:
+                self._names.move_to_end((guild.id, user_id))
+                names[user_id] = cached[0]
+                continue
+
+            member = guild.get_member(user_id)
+            if member is not None:
+                names[user_id] = member.display_name
+                self._store(guild.id, user_id, member.display_name, now)
+            else:
+                misses.append(user_id)
+
+        # Too many misses for one chunk query: load the whole member list instead
+        if len(misses) > QUERY_BATCH_SIZE and not guild.chunked:
+            try:
+                await self.ensure_chunked(guild)
+            except Exception as e:
+                logging.warning(f"Failed to chunk guild {guild.id}: {e}")
+
+            remaining = []
+            for user_id in misses:
+                member = guild.get_member(user_id)
+                if member is not None:
+                    names[user_id] = member.display_name
+                    self._store(guild.id, user_id, member.display_name, now)
+                else:
+                    remaining.append(user_id)
+            misses = remaining
+
+        for start in range(0, len(misses), QUERY_BATCH_SIZE):
+            batch = misses[start:start + QUERY_BATCH_SIZE]
+            try:
+                members = await guild.query_members(user_ids=batch, limit=len(batch), cache=True)
+            except Exception as e:
+                logging.warning(f"Failed to query {len(batch)} members in guild {guild.id}: {e}")
+                members = []
+
+            for member in members:
+                names[member.id] = member.display_name
+                self._store(guild.id, member.id, member.display_name, now)
+
+        for user_id in misses:
+            if user_id not in names:
+                names[user_id] = f"User {user_id}"
+                self._store(guild.id, user_id, names[user_id], now)
+
+        return names
+
+    async def display_name(self, guild, user_id):
+        """Get a single display name."""
+        return (await self.display_names(guild, [user_id]))[user_id]
+
+    def invalidate(self, guild_id, user_id):
+        """Drop a cached name (e.g. after the member changed their nickname)."""
+        self._names.pop((guild_id, user_id), None)
+
+    def invalidate_guilds(self, guild_ids):
+        """Drop every cached name for the given guilds."""
+        guild_ids = set(guild_ids)
+        for key in [key for key in self._names if key[0] in guild_ids]:
+            del self._names[key]
+
+# Shared resolver used by all cogs
+member_resolver = MemberResolver()
@@ -0,0 +1,162 @@
+import asyncio
+import random
+import logging
+from collections import deque
+import discord
+from utils.config import OUTBOX_CONCURRENCY, OUTBOX_QUEUE_SIZE, OUTBOX_MAX_ATTEMPTS, OUTBOX_RETRY_BASE_DELAY
+
+# Discord limits per message
+MAX_CONTENT_LENGTH = 2000
+MAX_EMBEDS = 10
+
+class Outbox:
+    """Deliver notifications and DMs in the background so commands don't wait on them.
+
+    Messages are queued per destination (a channel, or a user's DMs) and each
+    destination is drained by its own worker, so messages to one destination
+    keep their order. Messages queued for the same destination are batched into
+    as few sends as Discord allows, and a semaphore caps how many sends run at
+    once. Failed sends are retried with exponential backoff; messages that can't
+    be delivered are dropped and counted by reason.
+    """
+
+    def __init__(self, max_concurrency=OUTBOX_CONCURRENCY, max_queued=OUTBOX_QUEUE_SIZE,
+                 max_attempts=OUTBOX_MAX_ATTEMPTS, retry_base_delay=OUTBOX_RETRY_BASE_DELAY):
+        self.max_queued = max_queued
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._queues = {}   # destination key -> deque of (content, embed, fallback)
+        self._workers = {}  # destination key -> worker task
+        self._queued = 0
+        self.counters = {"queued": 0, "sent": 0, "sends": 0, "retries": 0, "dropped": {}}
+
+    def _key(self, destination):
+        """Members and users share one DM channel, so they're keyed by user ID."""
+        kind = "dm" if isinstance(destination, (discord.User, discord.Member)) else "channel"
+        return kind, destination.id
+
+    def send(self, destination, content=None, embed=None, fallback=None):
+        """Queue a message and return immediately.
+
+        Args:
+            destination: A channel, member or user to send to
+            content: Message text
+            embed: An embed to send
+            fallback: Optional (destination, content) queued instead if the
+                destination can't be messaged (e.g. the user blocks DMs)
+
+        Returns:
+            bool: False if the message was dropped because the queue is full
+        """
+        if self._queued >= self.max_queued:
+            self._drop("queue_full")
+            return False
+
+        key = self._key(destination)
+        self._queues.setdefault(key, deque()).append((content, embed, fallback))
+        self._queued += 1
+        self.counters["queued"] += 1
+
+        worker = self._workers.get(key)
+        if worker is None or worker.done():
+            self._workers[key] = asyncio.get_running_loop().create_task(self._drain(key, destination))
+        return True
+
+    def _drop(self, reason, count=1):
+        self.counters["dropped"][reason] = self.counters["dropped"].get(reason, 0) + count
+
+    def _next_batch(self, queue):
+        """Take as many queued messages as fit in one send."""
+        contents, embeds, fallbacks = [], [], []
+        length = 0
+
+        while queue:
+            content, embed, fallback = queue[0]
+            added = (len(content) + (1 if contents else 0)) if content else 0
+            if contents and length + added > MAX_CONTENT_LENGTH:
+                break
+            if embed is not None and len(embeds) == MAX_EMBEDS:
+                break
+
+            queue.popleft()
+            if content:
+                contents.append(content)
+                length += added
+            if embed is not None:
+                embeds.append(embed)
+            if fallback is not None:
+                fallbacks.append(fallback)
+
+        return "\n".join(contents) or None, embeds, fallbacks
+
+    async def _drain(self, key, destination):
+        """Send everything queued for one destination, then exit."""
+        queue = self._queues[key]
+        try:
+            while queue:
+                size = len(queue)
+                content, embeds, fallbacks = self._next_batch(queue)
+                count = size - len(queue)
+                self._queued -= count
+
+                async with self._semaphore:
+                    reason = await self._deliver(destination, content, embeds)
+
+                if reason is None:
+                    self.counters["sent"] += count
+                    self.counters["sends"] += 1
+                elif reason == "forbidden" and fallbacks:
+                    for fallback_destination, fallback_content in fallbacks:
+                        self.send(fallback_destination, fallback_content)
+                    self._drop(reason, count)
+                else:
+                    self._drop(reason, count)
+        finally:
+            if not queue:
+                self._queues.pop(key, None)
+            if self._workers.get(key) is asyncio.current_task():
+                del self._workers[key]
+
+    async def _deliver(self, destination, content, embeds):
+        """Send one batch, retrying transient failures.
+
+        Returns:
+            str: None if sent, otherwise the reason the batch was dropped
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                if embeds:
+                    await destination.send(content=content, embeds=embeds)
+                else:
+                    await destination.send(content=content)
+                return None
+            except discord.Forbidden:
+                return "forbidden"
+            except discord.NotFound:
+                return "not_found"
+            except discord.RateLimited as e:
+                delay = e.retry_after
+            except (discord.HTTPException, asyncio.TimeoutError, OSError) as e:
+                # Client errors other than the ones above won't succeed on a retry
+                if isinstance(e, discord.HTTPException) and e.status < 500 and e.status != 429:
+                    logging.warning(f"Dropping message to {self._key(destination)}: {e}")
+                    return "rejected"
+                delay = self.retry_base_delay * 2 ** (attempt - 1) * random.uniform(1, 1.5)
+
+            if attempt < self.max_attempts:
+                self.counters["retries"] += 1
+                await asyncio.sleep(delay)
+
+        logging.warning(f"Giving up on message to {self._key(destination)} after {self.max_attempts} attempts")
+        return "failed"
+
+    async def flush(self, timeout=None):
+        """Wait for the queued messages to be delivered (e.g. before shutting down)."""
+        workers = [worker for worker in self._workers.values() if not worker.done()]
+        if workers:
+            await asyncio.wait(workers, timeout=timeout)
+
+    def stats(self):
+        """Delivery counters for the dashboard."""
+        return {**self.counters, "pending": self._queued, "destinations": len(self._workers)}
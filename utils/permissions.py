@@ -0,0 +1,79 @@
+from collections import OrderedDict, namedtuple
+from utils.config import PROTECTED_ROLES, TIMEOUT_PERMISSIONS, COMPANY_CREATOR_ROLES
+
+# Effective permissions of a member. Role IDs are None when no role grants the permission.
+MemberPermissions = namedtuple(
+    "MemberPermissions",
+    ["max_timeout", "timeout_role_id", "protected_role_id", "company_role_id"]
+)
+
+class PermissionResolver:
+    """Resolve a member's bot permissions from the role tables in the config.
+
+    The config is compiled once into frozensets and tier tables sorted best-first.
+    Resolved permissions are cached per member, keyed on a fingerprint of the
+    member's role IDs, so a role change always produces a fresh result even before
+    the cache entry is invalidated.
+    """
+
+    def __init__(self, protected_roles=PROTECTED_ROLES, timeout_permissions=TIMEOUT_PERMISSIONS,
+                 company_creator_roles=COMPANY_CREATOR_ROLES, max_cached_members=10000):
+        self.protected_roles = frozenset(protected_roles)
+
+        # (role_id, value) tiers, best first, so the first role a member has wins
+        self.timeout_tiers = tuple(sorted(timeout_permissions.items(), key=lambda tier: tier[1], reverse=True))
+        self.company_tiers = tuple(sorted(company_creator_roles.items(), key=lambda tier: tier[1], reverse=True))
+
+        # Every role ID that affects permissions; all other roles are ignored
+        self.relevant_roles = self.protected_roles | frozenset(timeout_permissions) | frozenset(company_creator_roles)
+
+        self.max_cached_members = max_cached_members
+        self._cache = OrderedDict()  # (guild_id, member_id) -> (fingerprint, MemberPermissions)
+
+    def _fingerprint(self, member):
+        """Return the member's role IDs as a hashable tuple."""
+        # discord.py keeps the raw, sorted role ID list on the member; using it avoids
+        # building Role objects on every check
+        role_ids = getattr(member, "_roles", None)
+        if role_ids is None:
+            return tuple(sorted(role.id for role in member.roles))
+        return tuple(role_ids)
+
+    def resolve(self, member):
+        """Get a member's effective permissions."""
+        key = (member.guild.id, member.id)
+        fingerprint = self._fingerprint(member)
+
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            self._cache.move_to_end(key)
+            return cached[1]
+
+        permissions = self._compile(self.relevant_roles.intersection(fingerprint))
+
+        self._cache[key] = (fingerprint, permissions)
+        if len(self._cache) > self.max_cached_members:
+            self._cache.popitem(last=False)
+
+        return permissions
+
+    def _compile(self, role_ids):
+        """Work out permissions from the set of relevant role IDs a member has."""
+        protected_role_id = next((role_id for role_id in role_ids if role_id in self.protected_roles), None)
+
+        max_timeout, timeout_role_id = 0, None
+        for role_id, seconds in self.timeout_tiers:
+            if role_id in role_ids:
+                max_timeout, timeout_role_id = seconds, role_id
+                break
+
+        company_role_id = next((role_id for role_id, bonus in self.company_tiers if role_id in role_ids), None)
+
+        return MemberPermissions(max_timeout, timeout_role_id, protected_role_id, company_role_id)
+
+    def invalidate(self, member):
+        """Drop a member's cached permissions (e.g. after their roles changed)."""
+        self._cache.pop((member.guild.id, member.id), None)
+
+# Shared resolver used by all cogs
+permission_resolver = PermissionResolver()
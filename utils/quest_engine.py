@@ -0,0 +1,122 @@
+import random
+from collections import OrderedDict, deque
+
+# Grammar tables. Each activity is (title noun, description template, target table,
+# count range, reward per unit, minutes per unit). Templates use {target} and {count};
+# count ranges start at 2 wherever the template uses a plural noun.
+CHANNELS = (
+    "the general chat", "the memes channel", "the gaming channel", "the music channel",
+    "the art channel", "the off-topic channel", "the introductions channel",
+)
+VOICE_CHANNELS = (
+    "a voice channel", "the gaming voice channel", "the music voice channel", "the chill lounge",
+)
+TOPICS = (
+    "video games", "the server itself", "food", "pets", "space", "music", "movies",
+    "school or work", "sports", "the internet",
+)
+RECOMMENDATIONS = (
+    "games", "songs", "movies", "books", "anime series", "podcasts", "YouTube channels",
+)
+
+ACTIVITIES = (
+    ("Chatterbox", "Post {count} messages in {target}", CHANNELS, (3, 15), 4, 2),
+    ("Reactor", "React to {count} different messages in {target} with fitting emojis", CHANNELS, (5, 20), 3, 1),
+    ("Welcomer", "Welcome {count} new members and point them to {target}", CHANNELS, (2, 5), 15, 8),
+    ("Helper", "Answer {count} questions from other members in {target}", CHANNELS, (2, 6), 12, 6),
+    ("Critic", "Give thoughtful feedback on {count} creations shared in {target}", CHANNELS, (2, 5), 12, 5),
+    ("Voice Hero", "Spend {count} minutes chatting with other members in {target}", VOICE_CHANNELS, (10, 40), 2, 1),
+    ("Storyteller", "Share {count} short stories about {target}", TOPICS, (2, 4), 15, 12),
+    ("Meme Maker", "Create and share {count} original memes about {target}", TOPICS, (2, 5), 14, 10),
+    ("Discussion Starter", "Start a discussion about {target} that gets at least {count} replies", TOPICS, (3, 10), 7, 4),
+    ("Trivia Master", "Answer {count} trivia questions about {target} correctly in the chat", TOPICS, (2, 6), 10, 5),
+    ("Artist", "Share {count} pieces of original art inspired by {target}", TOPICS, (2, 4), 20, 13),
+    ("Curator", "Recommend {count} {target} to the community and explain why you like them", RECOMMENDATIONS, (2, 5), 10, 4),
+)
+
+ADJECTIVES = (
+    "Legendary", "Speedy", "Friendly", "Mighty", "Secret", "Daring", "Cosmic", "Golden",
+)
+
+# Optional twists appended to the description, with their reward multiplier
+TWISTS = (
+    ("", 1.0),
+    (" while keeping it friendly", 1.0),
+    (" and include at least one pun", 1.15),
+    (" without mentioning the bot", 1.05),
+    (" and keep it family-friendly", 1.05),
+    (" and make at least one person laugh", 1.2),
+)
+
+MIN_REWARD, MAX_REWARD = 30, 100
+MIN_TIME_LIMIT, MAX_TIME_LIMIT = 10, 60
+
+class QuestEngine:
+    """Local quest generator that composes quests from grammar tables.
+
+    The tables are compiled once into flat tuples, so generating a quest is a few
+    random picks and one string format with no network I/O. Recently issued quests
+    are remembered per user so the same quest isn't handed out twice in a row.
+    """
+
+    def __init__(self, recent_per_user=10, max_tracked_users=10000, max_attempts=5):
+        self.recent_per_user = recent_per_user
+        self.max_tracked_users = max_tracked_users
+        self.max_attempts = max_attempts
+
+        # One entry per (activity, target): (title noun, "%d"-style description, count low,
+        # count span, reward per unit, minutes per unit)
+        self._entries = tuple(
+            (noun, template.replace("{target}", target).replace("{count}", "%d"), low, high - low + 1, reward, minutes)
+            for noun, template, targets, (low, high), reward, minutes in ACTIVITIES
+            for target in targets
+        )
+        self._recent = OrderedDict()  # user_id -> deque of recent quest signatures
+
+    def combinations(self):
+        """Return the number of distinct quests the engine can produce."""
+        return sum(span for _, _, _, span, _, _ in self._entries) * len(TWISTS)
+
+    def generate(self, username, user_id=None):
+        """Generate a quest for a user, avoiding their recent quests."""
+        rand = random.random
+        entries = self._entries
+        recent = self._recent_for(user_id) if user_id is not None else None
+
+        for _ in range(self.max_attempts):
+            entry_index = int(rand() * len(entries))
+            noun, description, low, span, reward_per_unit, minutes_per_unit = entries[entry_index]
+            count = low + int(rand() * span)
+            twist_index = int(rand() * len(TWISTS))
+
+            signature = (entry_index, count, twist_index)
+            if recent is None or signature not in recent:
+                break
+
+        if recent is not None:
+            recent.append(signature)
+
+        twist, multiplier = TWISTS[twist_index]
+        reward = int((20 + count * reward_per_unit) * multiplier)
+        time_limit = 5 + count * minutes_per_unit
+
+        return {
+            "quest_title": f"{ADJECTIVES[int(rand() * len(ADJECTIVES))]} {noun}",
+            "quest_description": f"Hey {username}! {description % count}{twist}.",
+            "reward": MIN_REWARD if reward < MIN_REWARD else MAX_REWARD if reward > MAX_REWARD else reward,
+            "time_limit": MIN_TIME_LIMIT if time_limit < MIN_TIME_LIMIT else MAX_TIME_LIMIT if time_limit > MAX_TIME_LIMIT else time_limit
+        }
+
+    def _recent_for(self, user_id):
+        """Get the recent quest signatures for a user, tracking at most max_tracked_users users."""
+        recent = self._recent.get(user_id)
+
+        if recent is None:
+            recent = deque(maxlen=self.recent_per_user)
+            self._recent[user_id] = recent
+            if len(self._recent) > self.max_tracked_users:
+                self._recent.popitem(last=False)
+        else:
+            self._recent.move_to_end(user_id)
+
+        return recent
@@ -1,9 +1,22 @@
 import os
 import logging
-import random
 import asyncio
 import json
-from openai import OpenAI
+import time
+from collections import deque
+from openai import AsyncOpenAI
+from utils.circuit_breaker import CircuitBreaker
+from utils.quest_engine import QuestEngine
+from utils.config import (
+    QUEST_USE_OPENAI, QUEST_LLM_TIMEOUT, QUEST_LLM_MAX_CONCURRENCY,
+    QUEST_POOL_LOW_WATERMARK, QUEST_POOL_HIGH_WATERMARK, QUEST_POOL_BATCH_SIZE, QUEST_POOL_TIMEOUT_PER_QUEST,
+    QUEST_POOL_RETRY_DELAY, QUEST_BREAKER_FAILURE_RATE, QUEST_BREAKER_SLOW_CALL_SECONDS,
+    QUEST_BREAKER_SLOW_SECONDS_PER_QUEST,
+    QUEST_BREAKER_SLOW_CALL_RATE, QUEST_BREAKER_OPEN_SECONDS
+)
+
+class CircuitOpenError(Exception):
+    """Raised when an OpenAI call is skipped because the circuit breaker is open."""
 
 class QuestGenerator:
     """Class for generating random quests using OpenAI API."""
@@ -11,45 +24,166 @@ class QuestGenerator:
     def __init__(self):
         self.api_key = os.environ.get("OPENAI_API_KEY")
         self.client = None
+        self.llm_timeout = QUEST_LLM_TIMEOUT  # Interactive latency budget in seconds
         
-        if not self.api_key:
+        if not QUEST_USE_OPENAI:
+            logging.info("OpenAI quest generation disabled, using the local quest engine.")
+        elif not self.api_key:
             logging.warning("OPENAI_API_KEY not set! Using fallback quest generation.")
         else:
-            self.client = OpenAI(api_key=self.api_key)
-            
-        # Fallback quests in case API isn't available
-        self.fallback_quests = [
-            {"title": "Social Media Manager", "description": "Post 5 messages in the general chat channel to boost server activity.", "reward": 50, "time_limit": 30},
-            {"title": "Server Guide", "description": "Help a new member understand the server rules and channels.", "reward": 75, "time_limit": 45},
-            {"title": "Meme Maker", "description": "Create and share an original meme related to the server theme.", "reward": 60, "time_limit": 20},
-            {"title": "Discussion Starter", "description": "Start an interesting discussion that gets at least 5 replies.", "reward": 70, "time_limit": 60},
-            {"title": "Voice Chat Hero", "description": "Spend 15 minutes in a voice channel chatting with other members.", "reward": 80, "time_limit": 20},
-            {"title": "Art Showcase", "description": "Share some original artwork or creation with the community.", "reward": 90, "time_limit": 30},
-            {"title": "Emoji Reactor", "description": "React to 10 different messages with appropriate emojis.", "reward": 40, "time_limit": 15},
-            {"title": "Feedback Provider", "description": "Provide constructive feedback on someone's idea or creation.", "reward": 65, "time_limit": 25},
-            {"title": "Trivia Master", "description": "Answer 3 trivia questions correctly in the chat.", "reward": 55, "time_limit": 20},
-            {"title": "Community Cleaner", "description": "Find and report any old messages that break the server rules.", "reward": 85, "time_limit": 40},
-        ]
-        
-    async def generate_quest(self, username):
-        """Generate a random quest for a user."""
+            # Retries are disabled so a single request can't exceed the latency budget
+            self.client = AsyncOpenAI(api_key=self.api_key, timeout=QUEST_LLM_TIMEOUT, max_retries=0)
+            
+        # Cap the number of OpenAI requests in flight at once
+        self.request_semaphore = asyncio.Semaphore(QUEST_LLM_MAX_CONCURRENCY)
+        
+        # Stop calling OpenAI for a while when it keeps failing or is too slow
+        self.breaker = CircuitBreaker(
+            "openai_quests",
+            failure_rate_threshold=QUEST_BREAKER_FAILURE_RATE,
+            slow_call_threshold=QUEST_BREAKER_SLOW_CALL_SECONDS,
+            slow_call_rate_threshold=QUEST_BREAKER_SLOW_CALL_RATE,
+            open_duration=QUEST_BREAKER_OPEN_SECONDS
+        )
+        
+        # Warm pool of pre-generated quests, refilled in the background
+        self.quest_pool = deque()
+        self._refill_needed = asyncio.Event()
+        self._refill_task = None
+            
+        # Local quest engine used when OpenAI is disabled, unavailable or too slow
+        self.engine = QuestEngine()
+        
+    def start_pool(self):
+        """Start the background task that keeps the quest pool filled."""
+        if not self.client or (self._refill_task and not self._refill_task.done()):
+            return
+            
+        self._refill_task = asyncio.get_running_loop().create_task(self._refill_pool_loop())
+        
+    async def stop_pool(self):
+        """Stop the background pool refill task."""
+        if self._refill_task:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+            self._refill_task = None
+            
+    async def _refill_pool_loop(self):
+        """Fill the pool up to the high watermark, then sleep until it drops below the low watermark."""
+        while True:
+            self._refill_needed.clear()
+            
+            while len(self.quest_pool) < QUEST_POOL_HIGH_WATERMARK:
+                count = min(QUEST_POOL_BATCH_SIZE, QUEST_POOL_HIGH_WATERMARK - len(self.quest_pool))
+                
+                # Nobody is waiting on a refill, so its budget and slow-call threshold are
+                # scaled to the batch size instead of using the interactive ones
+                timeout = QUEST_POOL_TIMEOUT_PER_QUEST * count
+                try:
+                    quests = await self._call_openai(
+                        self._generate_quests_batch_with_openai(count, timeout),
+                        timeout,
+                        slow_call_threshold=QUEST_BREAKER_SLOW_SECONDS_PER_QUEST * count
+                    )
+                except Exception as e:
+                    quests = []
+                    logging.warning(f"Quest pool refill failed: {e}")
+                    
+                if not quests:
+                    logging.warning(f"Quest pool refill produced no quests, retrying in {QUEST_POOL_RETRY_DELAY}s")
+                    await asyncio.sleep(QUEST_POOL_RETRY_DELAY)
+                    continue
+                    
+                # The model may return more quests than requested, so never overfill the pool
+                self.quest_pool.extend(quests[:count])
+                
+            await self._refill_needed.wait()
+            
+    async def generate_quest(self, username, user_id=None):
+        """Generate a random quest for a user.
+        
+        The user ID, if given, lets the local quest engine avoid repeating the
+        user's recent quests.
+        """
+        if self.quest_pool:
+            quest = self.quest_pool.popleft()
+            
+            if len(self.quest_pool) < QUEST_POOL_LOW_WATERMARK:
+                self._refill_needed.set()
+                
+            return self._personalize_quest(quest, username)
+            
+        if self._refill_task:
+            # The pool is drained; serve a local quest rather than waiting on OpenAI
+            self._refill_needed.set()
+            return self._generate_fallback_quest(username, user_id)
+            
         # Try to use OpenAI if available
         if self.client:
             try:
-                return await self._generate_quest_with_openai(username)
+                return await self._call_openai(self._generate_quest_with_openai(username))
+            except CircuitOpenError:
+                # OpenAI is known to be unhealthy, don't wait on it
+                pass
+            except asyncio.TimeoutError:
+                logging.warning(f"OpenAI quest generation exceeded {self.llm_timeout}s, using fallback quest")
             except Exception as e:
                 logging.error(f"Error generating quest with OpenAI: {e}")
                 # Fall back to pre-defined quests
                 
         # Use fallback quest generation
-        return self._generate_fallback_quest(username)
+        return self._generate_fallback_quest(username, user_id)
+        
+    async def _call_openai(self, request, timeout=None, slow_call_threshold=None):
+        """Run an OpenAI request through the circuit breaker within the latency budget."""
+        timeout = timeout or self.llm_timeout
+        if not self.breaker.allow_request():
+            request.close()
+            raise CircuitOpenError(f"Circuit breaker '{self.breaker.name}' is open")
+            
+        start = time.monotonic()
+        try:
+            # Waiting for a free request slot counts against the latency budget too
+            result = await asyncio.wait_for(request, timeout=timeout)
+        except BaseException:
+            # Cancellations are recorded too, so a half-open probe can't stay pending forever
+            self.breaker.record_failure(time.monotonic() - start, slow_call_threshold)
+            raise
+            
+        self.breaker.record_success(time.monotonic() - start, slow_call_threshold)
+        return result
+        
+    def health(self):
+        """Return the quest generation health for the dashboard."""
+        return {
+            "openai_enabled": self.client is not None,
+            "pool_size": len(self.quest_pool),
+            "breaker": self.breaker.snapshot()
+        }
+        
+    def _personalize_quest(self, quest, username):
+        """Address a pre-generated quest to a specific user."""
+        return {
+            "quest_title": quest["quest_title"],
+            "quest_description": f"Hey {username}! {quest['quest_description']}",
+            "reward": quest["reward"],
+            "time_limit": quest["time_limit"]
+        }
     
-    async def _generate_quest_with_openai(self, username):
-        """Generate a quest using OpenAI API."""
+    async def _generate_quest_with_openai(self, username=None):
+        """Generate a quest using OpenAI API.
+        
+        Without a username the quest is generic, so it can be stored in the pool
+        and personalized later.
+        """
         # The newest OpenAI model is "gpt-4o" which was released May 13, 2024.
         # do not change this unless explicitly requested by the user
         
-        prompt = f"""Generate a fun Discord economy bot quest for user '{username}'. 
+        recipient = f"user '{username}'" if username else "a member of the server"
+        prompt = f"""Generate a fun Discord economy bot quest for {recipient}. 
         The quest should be something the user can do in a Discord server.
         
         Return the result as a JSON object with these fields:
@@ -62,38 +196,92 @@ class QuestGenerator:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
-                max_tokens=500
-            )
+            async with self.request_semaphore:
+                response = await self.client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=[{"role": "user", "content": prompt}],
+                    response_format={"type": "json_object"},
+                    max_tokens=500
+                )
             
-            # Parse the response
-            quest_data = json.loads(response.choices[0].message.content)
-            
-            # Format the quest
-            return {
-                "quest_title": quest_data["quest_title"],
-                "quest_description": quest_data["quest_description"],
-                "reward": int(quest_data["reward"]),
-                "time_limit": int(quest_data["time_limit"])
-            }
+            # Parse and validate the response
+            quest = self._validate_quest(json.loads(response.choices[0].message.content))
+            if quest is None:
+                raise ValueError("OpenAI returned an invalid quest")
+                
+            return quest
             
         except Exception as e:
             logging.error(f"Error in OpenAI quest generation: {str(e)}")
             raise
-    
-    def _generate_fallback_quest(self, username):
-        """Generate a quest using pre-defined templates when OpenAI is unavailable."""
-        quest = random.choice(self.fallback_quests)
+            
+    async def _generate_quests_batch_with_openai(self, count, timeout=QUEST_LLM_TIMEOUT):
+        """Generate several generic quests in a single OpenAI call.
         
-        # Customize with username
-        quest_description = f"Hey {username}! {quest['description']}"
+        The client's default timeout is the interactive budget, so the batch
+        request passes its own ``timeout``.
         
+        Returns:
+            list: The quests that passed validation (may be fewer than requested)
+        """
+        prompt = f"""Generate {count} different fun Discord economy bot quests for members of the server.
+        Each quest should be something a user can do in a Discord server.
+        
+        Return the result as a JSON object with a single field "quests" containing an array of
+        {count} objects, each with these fields:
+        - quest_title: A catchy title for the quest
+        - quest_description: A detailed description of what the user needs to do
+        - reward: A random reward amount between 30 and 100
+        - time_limit: A time limit in minutes between 10 and 60
+        
+        Be creative, avoid repeating ideas, and make each quest achievable within its time limit.
+        """
+        
+        async with self.request_semaphore:
+            response = await self.client.chat.completions.create(
+                model="gpt-4o",
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
+                max_tokens=150 * count,
+                timeout=timeout
+            )
+            
+        data = json.loads(response.choices[0].message.content)
+        items = data.get("quests", []) if isinstance(data, dict) else []
+        
+        quests = []
+        for item in items if isinstance(items, list) else []:
+            quest = self._validate_quest(item)
+            if quest is not None:
+                quests.append(quest)
+                
+        if len(quests) < len(items):
+            logging.warning(f"Discarded {len(items) - len(quests)} invalid quests from OpenAI batch")
+            
+        return quests
+        
+    def _validate_quest(self, data):
+        """Normalize a quest returned by OpenAI, or return None if it is invalid."""
+        try:
+            title = str(data["quest_title"]).strip()
+            description = str(data["quest_description"]).strip()
+            reward = int(data["reward"])
+            time_limit = int(data["time_limit"])
+        except (KeyError, TypeError, ValueError):
+            return None
+            
+        if not title or not description:
+            return None
+        if not 30 <= reward <= 100 or not 10 <= time_limit <= 60:
+            return None
+            
         return {
-            "quest_title": quest["title"],
-            "quest_description": quest_description,
-            "reward": quest["reward"],
-            "time_limit": quest["time_limit"]
+            "quest_title": title,
+            "quest_description": description,
+            "reward": reward,
+            "time_limit": time_limit
         }
+    
+    def _generate_fallback_quest(self, username, user_id=None):
+        """Generate a quest with the local quest engine when OpenAI is unavailable."""
+        return self.engine.generate(username, user_id)
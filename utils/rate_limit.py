@@ -0,0 +1,90 @@
+import time
+from collections import OrderedDict
+
+class TokenBuckets:
+    """Token buckets for many keys sharing one capacity and refill rate.
+
+    Each bucket is stored as a (tokens, updated) tuple in an OrderedDict kept in
+    least-recently-used order. A bucket left idle long enough to refill completely
+    is identical to a new one, so idle buckets are evicted from the front.
+    """
+
+    def __init__(self, capacity, per_seconds):
+        self.capacity = capacity
+        self.rate = capacity / per_seconds  # Tokens added per second
+        self.refill_time = per_seconds  # Time for an empty bucket to refill completely
+        self._buckets = OrderedDict()  # key -> (tokens, updated)
+
+    def _evict_idle(self, now):
+        """Drop buckets that have been idle long enough to be full again."""
+        while self._buckets:
+            key, (tokens, updated) = next(iter(self._buckets.items()))
+            if now - updated < self.refill_time:
+                break
+            del self._buckets[key]
+
+    def _tokens(self, key, now):
+        """Get the tokens currently available in a key's bucket."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return self.capacity
+
+        tokens, updated = bucket
+        return min(self.capacity, tokens + (now - updated) * self.rate)
+
+    def retry_after(self, key, now=None, cost=1):
+        """Return the seconds until ``cost`` tokens are available, or 0 if they are now."""
+        now = time.monotonic() if now is None else now
+        self._evict_idle(now)
+
+        missing = cost - self._tokens(key, now)
+        return missing / self.rate if missing > 0 else 0
+
+    def consume(self, key, now=None, cost=1):
+        """Take ``cost`` tokens from a key's bucket. Returns False if there weren't enough."""
+        now = time.monotonic() if now is None else now
+        self._evict_idle(now)
+
+        tokens = self._tokens(key, now)
+        if tokens < cost:
+            return False
+
+        self._buckets[key] = (tokens - cost, now)
+        self._buckets.move_to_end(key)
+        return True
+
+    def __len__(self):
+        return len(self._buckets)
+
+class RateLimiter:
+    """A set of named token bucket limits that must all allow an action.
+
+    Limits are given as name=(capacity, per_seconds). An action is only counted
+    against the limits when every one of them has a token for it.
+    """
+
+    def __init__(self, **limits):
+        self.limits = {name: TokenBuckets(capacity, per_seconds) for name, (capacity, per_seconds) in limits.items()}
+
+    def acquire(self, **keys):
+        """Try to take a token from each named limit for the given keys.
+
+        Returns:
+            tuple: (allowed, limit_name, retry_after) where limit_name is the limit
+                that blocked the action (the one with the longest wait) or None
+        """
+        now = time.monotonic()
+
+        blocked_by, retry_after = None, 0
+        for name, key in keys.items():
+            wait = self.limits[name].retry_after(key, now)
+            if wait > retry_after:
+                blocked_by, retry_after = name, wait
+
+        if blocked_by is not None:
+            return False, blocked_by, retry_after
+
+        for name, key in keys.items():
+            self.limits[name].consume(key, now)
+
+        return True, None, 0
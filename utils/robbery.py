@@ -0,0 +1,69 @@
+import time
+import heapq
+
+class RobberySession:
+    """A robbery attempt on one target that robbers can join until it expires."""
+
+    __slots__ = ("target_id", "robbers", "expires_at")
+
+    def __init__(self, target_id, expires_at):
+        self.target_id = target_id
+        self.robbers = []  # User IDs in join order
+        self.expires_at = expires_at
+
+class RobberySessions:
+    """Index of active robbery sessions keyed by target ID.
+
+    Sessions expire a fixed join window after they were opened. Expired sessions
+    are dropped lazily from a heap ordered by expiry, so lookups stay O(1) and no
+    session outlives its window.
+    """
+
+    def __init__(self, join_window):
+        self.join_window = join_window
+        self._sessions = {}  # target_id -> RobberySession
+        self._expiry_heap = []  # (expires_at, target_id)
+
+    def _expire(self, now):
+        """Drop every session whose join window has passed."""
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, target_id = heapq.heappop(self._expiry_heap)
+            session = self._sessions.get(target_id)
+
+            # The heap entry may belong to a session that was already closed or replaced
+            if session is not None and session.expires_at == expires_at:
+                del self._sessions[target_id]
+
+    def get(self, target_id):
+        """Get the active session for a target, or None."""
+        self._expire(time.time())
+        return self._sessions.get(target_id)
+
+    def join(self, target_id, user_id):
+        """Add a robber to the target's session, opening one if needed.
+
+        Returns:
+            tuple: (session, joined) where joined is False if the user was already part of it
+        """
+        now = time.time()
+        self._expire(now)
+
+        session = self._sessions.get(target_id)
+        if session is None:
+            session = RobberySession(target_id, now + self.join_window)
+            self._sessions[target_id] = session
+            heapq.heappush(self._expiry_heap, (session.expires_at, target_id))
+
+        if user_id in session.robbers:
+            return session, False
+
+        session.robbers.append(user_id)
+        return session, True
+
+    def close(self, target_id):
+        """Close a target's session (after settlement or cancellation)."""
+        self._sessions.pop(target_id, None)
+
+    def __len__(self):
+        self._expire(time.time())
+        return len(self._sessions)
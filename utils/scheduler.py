@@ -0,0 +1,202 @@
+import asyncio
+import heapq
+import inspect
+import logging
+from datetime import datetime, timedelta
+
+class Scheduler:
+    """Persistent job scheduler driven by a single dispatcher task.
+
+    Jobs are kept in a heap ordered by due time and mirrored to storage, so they
+    survive restarts. Jobs that came due while the bot was offline are run as soon
+    as the dispatcher starts again (catch-up).
+    """
+
+    # Upper bound on a single dispatcher sleep so wall clock jumps are noticed
+    MAX_SLEEP = 3600
+    # Delay before retrying a job whose handler is not registered yet
+    MISSING_HANDLER_RETRY = 60
+
+    def __init__(self, db):
+        self.db = db
+        self.handlers = {}
+        self._jobs = {}   # job_id -> job dict
+        self._keys = {}   # job key -> job_id, for keyed jobs
+        self._heap = []   # (due, job_id) entries, stale entries are skipped lazily
+        self._next_id = 1
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+        self._load()
+
+    def _load(self):
+        """Load persisted jobs into the in-memory heap."""
+        data = self.db.get_scheduled_jobs()
+        self._next_id = data["next_id"]
+
+        for job in data["jobs"]:
+            self._jobs[job["id"]] = job
+            if job.get("key") is not None:
+                self._keys[job["key"]] = job["id"]
+            heapq.heappush(self._heap, (job["due"], job["id"]))
+
+        if self._jobs:
+            logging.info(f"Scheduler loaded {len(self._jobs)} pending jobs")
+
+    def _save(self):
+        """Persist all pending jobs (called only when a job was added, moved or removed)."""
+        self.db.save_scheduled_jobs({
+            "next_id": self._next_id,
+            "jobs": list(self._jobs.values())
+        })
+
+    def register(self, name, handler):
+        """Register the handler called with a job's payload when it comes due."""
+        self.handlers[name] = handler
+
+    def schedule(self, name, due, payload=None, interval=None, catch_up="once", key=None):
+        """Schedule a job and return its ID.
+
+        Args:
+            name: The handler name to run when the job comes due
+            due: The datetime at which the job should run
+            payload: JSON-serializable data passed to the handler
+            interval: Repeat interval in seconds for recurring jobs
+            catch_up: For recurring jobs, "once" runs a single time for all missed
+                occurrences after downtime, "all" runs every missed occurrence
+            key: Optional unique key; if a job with this key already exists it is
+                kept and its ID returned instead of scheduling a duplicate
+        """
+        if key is not None and key in self._keys:
+            return self._keys[key]
+
+        job_id = self._next_id
+        self._next_id += 1
+
+        job = {
+            "id": job_id,
+            "name": name,
+            "due": due,
+            "payload": payload or {},
+            "interval": interval,
+            "catch_up": catch_up,
+            "key": key
+        }
+
+        self._jobs[job_id] = job
+        if key is not None:
+            self._keys[key] = job_id
+        heapq.heappush(self._heap, (due, job_id))
+        self._save()
+
+        # Wake the dispatcher in case this job is now the earliest one
+        self._wakeup.set()
+        return job_id
+
+    def schedule_in(self, name, seconds, payload=None, **kwargs):
+        """Schedule a job to run after the given number of seconds."""
+        return self.schedule(name, datetime.now() + timedelta(seconds=seconds), payload, **kwargs)
+
+    def ensure_due_by(self, name, due, key, payload=None):
+        """Make sure the keyed job runs no later than ``due``, scheduling it if needed."""
+        job_id = self.schedule(name, due, payload, key=key)
+        job = self._jobs[job_id]
+
+        if job["due"] > due:
+            self._reschedule(job, due)
+            self._save()
+            self._wakeup.set()
+
+        return job_id
+
+    def pending_count(self):
+        """Return the number of pending jobs."""
+        return len(self._jobs)
+
+    def start(self):
+        """Start the dispatcher task if it isn't already running."""
+        if self._task and not self._task.done():
+            return
+
+        self._task = asyncio.get_running_loop().create_task(self._dispatch_loop())
+
+    async def stop(self):
+        """Stop the dispatcher task."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _dispatch_loop(self):
+        """Run due jobs, then sleep until the next one is due or a new job arrives."""
+        while True:
+            self._wakeup.clear()
+            now = datetime.now()
+
+            ran_jobs = False
+            while self._heap and self._heap[0][0] <= now:
+                due, job_id = heapq.heappop(self._heap)
+                job = self._jobs.get(job_id)
+
+                # Skip entries for cancelled or rescheduled jobs
+                if job is None or job["due"] != due:
+                    continue
+
+                await self._run_job(job, now)
+                ran_jobs = True
+
+            if ran_jobs:
+                self._save()
+
+            timeout = self.MAX_SLEEP
+            if self._heap:
+                timeout = min(timeout, max((self._heap[0][0] - datetime.now()).total_seconds(), 0))
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_job(self, job, now):
+        """Run a single job and reschedule or drop it afterwards."""
+        handler = self.handlers.get(job["name"])
+
+        if handler is None:
+            logging.warning(f"No handler registered for scheduled job '{job['name']}', retrying later")
+            self._reschedule(job, now + timedelta(seconds=self.MISSING_HANDLER_RETRY))
+            return
+
+        # One-shot jobs are removed before running so the handler can schedule a successor
+        if not job["interval"]:
+            self._jobs.pop(job["id"], None)
+            if self._keys.get(job.get("key")) == job["id"]:
+                del self._keys[job["key"]]
+
+        try:
+            result = handler(job["payload"])
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logging.error(f"Scheduled job '{job['name']}' (ID: {job['id']}) failed: {e}")
+
+        if not job["interval"]:
+            return
+
+        # Recurring job: work out the next occurrence
+        interval = timedelta(seconds=job["interval"])
+        next_due = job["due"] + interval
+
+        if job["catch_up"] != "all":
+            # Coalesce any missed occurrences into the single run we just did
+            while next_due <= now:
+                next_due += interval
+
+        self._reschedule(job, next_due)
+
+    def _reschedule(self, job, due):
+        """Move a job to a new due time."""
+        job["due"] = due
+        heapq.heappush(self._heap, (due, job["id"]))
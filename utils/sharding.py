@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from datetime import datetime
+from utils.config import ACTIVITY_FLUSH_INTERVAL
+
+def shard_for(snowflake_id, shard_count):
+    """Get the shard a guild (or any other snowflake) belongs to, using Discord's formula."""
+    return (int(snowflake_id) >> 22) % max(shard_count or 1, 1)
+
+class ShardContext:
+    """Which shards this process runs, read from the bot when needed.
+
+    With AutoShardedBot the shard count may only be known once the bot
+    connects, so nothing is cached here. Guild data belongs to the guild's
+    shard; user records aren't tied to a guild, so a user belongs to the shard
+    their own ID maps to.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @property
+    def shard_count(self):
+        return self.bot.shard_count or 1
+
+    @property
+    def shard_ids(self):
+        """The shard IDs handled by this process (all of them on a plain Bot)."""
+        return list(getattr(self.bot, "shard_ids", None) or range(self.shard_count))
+
+    def guild_shard(self, guild):
+        """Get the shard a message's guild belongs to (shard 0 for DMs)."""
+        return guild.shard_id if guild is not None else 0
+
+    def owns_user(self, user_id):
+        """Whether a user's record is processed by this process."""
+        return shard_for(user_id, self.shard_count) in self.shard_ids
+
+    def owns_guild(self, guild_id):
+        """Whether a guild's data is processed by this process (DMs, with no guild, belong to shard 0)."""
+        return (shard_for(guild_id, self.shard_count) if guild_id is not None else 0) in self.shard_ids
+
+class ActivityBuffer:
+    """Buffer message activity per shard and write it in batches.
+
+    Recording activity used to load and rewrite the users file twice per
+    message. Messages are now collected per shard as (first seen, last seen)
+    per user, and each shard's buffer is flushed with a single write by a
+    background task. The first-seen time keeps the hourly activity bonus the
+    same as when every message was written straight away.
+    """
+
+    def __init__(self, db, interval=ACTIVITY_FLUSH_INTERVAL):
+        self.db = db
+        self.interval = interval
+        self._pending = {}  # shard_id -> {user_id: [first_seen, last_seen]}
+        self._task = None
+
+    def record(self, shard_id, user_id, when=None):
+        """Record that a user sent a message in a guild on the given shard."""
+        when = when or datetime.now()
+        seen = self._pending.setdefault(shard_id, {}).get(user_id)
+        if seen is None:
+            self._pending[shard_id][user_id] = [when, when]
+        else:
+            seen[1] = when
+
+    def pending_count(self):
+        return sum(len(users) for users in self._pending.values())
+
+    def flush(self, shard_id):
+        """Write one shard's buffered activity. Returns the number of users written."""
+        activity = self._pending.pop(shard_id, None)
+        if not activity:
+            return 0
+
+        self.db.record_activity(activity)
+        return len(activity)
+
+    def flush_all(self):
+        """Write the buffered activity of every shard."""
+        for shard_id in list(self._pending):
+            try:
+                self.flush(shard_id)
+            except Exception as e:
+                logging.error(f"Failed to flush activity for shard {shard_id}: {e}")
+
+    def start(self):
+        """Start the background flush task if it isn't already running."""
+        if self._task and not self._task.done():
+            return
+
+        self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def stop(self):
+        """Stop the flush task and write whatever is still buffered."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        self.flush_all()
+
+    async def _flush_loop(self):
+        """Flush the buffered activity every interval, one write per shard."""
+        while True:
+            await asyncio.sleep(self.interval)
+            self.flush_all()
@@ -0,0 +1,147 @@
+import os
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from utils.config import STORAGE_BACKEND, SQLITE_PATH, SQLITE_BUSY_TIMEOUT
+
+class JsonFileStore:
+    """Documents kept as JSON files under their own paths (single process only).
+
+    Transactions only serialize threads of this process; running several bot
+    processes on these files would lose updates.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+
+    def exists(self, name):
+        return os.path.exists(name)
+
+    def read(self, name):
+        """Get a document's text, or None if it doesn't exist."""
+        try:
+            with open(name, 'r') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def write(self, name, text):
+        """Replace a document; readers never see a half-written file."""
+        temp_path = f"{name}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(text)
+        os.replace(temp_path, name)
+
+    def version(self, name):
+        """A value that changes whenever the document is written."""
+        return os.stat(name).st_mtime_ns if os.path.exists(name) else None
+
+    def adopt_file(self, name):
+        """Documents already are the files; nothing to import."""
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            yield
+
+class SQLiteStore:
+    """Documents kept in one SQLite database in WAL mode, shared by several processes.
+
+    Each document is a row with its JSON text and a version that's bumped on
+    every write, which other processes use to tell that their cached view is
+    stale. Read-modify-write sequences run inside ``transaction()``, which takes
+    SQLite's write lock up front (``BEGIN IMMEDIATE``) so two processes can never
+    both read the same balance and write back conflicting updates. Transactions
+    are reentrant per thread; only the outermost one commits.
+    """
+
+    def __init__(self, path=SQLITE_PATH, busy_timeout=SQLITE_BUSY_TIMEOUT):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()  # One connection and transaction depth per thread
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "name TEXT PRIMARY KEY, body TEXT NOT NULL, version INTEGER NOT NULL)"
+        )
+
+    def _connection(self):
+        """Get this thread's connection, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit mode; transactions are started explicitly
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.depth = 0
+        return connection
+
+    def exists(self, name):
+        return self._connection().execute(
+            "SELECT 1 FROM documents WHERE name = ?", (name,)
+        ).fetchone() is not None
+
+    def read(self, name):
+        """Get a document's text, or None if it doesn't exist."""
+        row = self._connection().execute("SELECT body FROM documents WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def write(self, name, text):
+        """Replace a document and bump its version."""
+        self._connection().execute(
+            "INSERT INTO documents (name, body, version) VALUES (?, ?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET body = excluded.body, version = version + 1",
+            (name, text)
+        )
+
+    def version(self, name):
+        """The document's write counter, shared by every process."""
+        row = self._connection().execute("SELECT version FROM documents WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def adopt_file(self, name):
+        """Import an existing JSON file the first time the database is used."""
+        if self.exists(name) or not os.path.exists(name):
+            return
+
+        with open(name, 'r') as f:
+            self.write(name, f.read())
+        logging.info(f"Imported {name} into {self.path}")
+
+    @contextmanager
+    def transaction(self):
+        """Hold the database write lock for the duration of the block."""
+        connection = self._connection()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield
+            finally:
+                self._local.depth -= 1
+            return
+
+        connection.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        else:
+            connection.execute("COMMIT")
+        finally:
+            self._local.depth = 0
+
+def open_store(backend=STORAGE_BACKEND):
+    """Open the document store for the configured backend."""
+    if backend == "sqlite":
+        logging.info(f"Using the SQLite store at {SQLITE_PATH}")
+        return SQLiteStore()
+
+    if backend != "json":
+        logging.warning(f"Unknown storage backend '{backend}', using 'json'")
+    return JsonFileStore()
@@ -0,0 +1,67 @@
+import bisect
+from collections import Counter
+
+class TimeoutLogIndex:
+    """Read-only indexes over the recent timeout log entries.
+
+    The entries are stored oldest first, so time windows are found with a binary
+    search on the timestamps. Entries are also grouped per target and per
+    moderator (each group stays in time order) and sorted by duration, so every
+    query only touches the entries it returns.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.timestamps = [log["timestamp"] for log in entries]
+
+        # user_id -> (logs, timestamps), both in time order
+        self.by_user = {}
+        self.by_moderator = {}
+        for log in entries:
+            for index, user_id in ((self.by_user, log["user_id"]), (self.by_moderator, log["moderator_id"])):
+                logs, timestamps = index.setdefault(user_id, ([], []))
+                logs.append(log)
+                timestamps.append(log["timestamp"])
+
+        self.by_duration = sorted(entries, key=lambda x: x["duration"])
+        self.durations = [log["duration"] for log in self.by_duration]
+
+    def _window(self, logs, timestamps, since=None, until=None):
+        """Slice a time-ordered list of logs to the entries within [since, until]."""
+        start = 0 if since is None else bisect.bisect_left(timestamps, since)
+        end = len(timestamps) if until is None else bisect.bisect_right(timestamps, until)
+        return logs[start:end]
+
+    def between(self, since=None, until=None):
+        """Get the entries logged within a time window, oldest first."""
+        return self._window(self.entries, self.timestamps, since, until)
+
+    def for_user(self, user_id, since=None, until=None):
+        """Get the entries for a bombed user, oldest first."""
+        logs, timestamps = self.by_user.get(user_id, ([], []))
+        return self._window(logs, timestamps, since, until)
+
+    def for_moderator(self, moderator_id, since=None, until=None):
+        """Get the entries for bombs given by a moderator, oldest first."""
+        logs, timestamps = self.by_moderator.get(moderator_id, ([], []))
+        return self._window(logs, timestamps, since, until)
+
+    def with_duration(self, min_duration=None, max_duration=None):
+        """Get the entries with a duration within [min_duration, max_duration], shortest first."""
+        start = 0 if min_duration is None else bisect.bisect_left(self.durations, min_duration)
+        end = len(self.durations) if max_duration is None else bisect.bisect_right(self.durations, max_duration)
+        return self.by_duration[start:end]
+
+    def top(self, since=None, until=None, limit=5):
+        """Get the top bombers and most bombed users within a time window.
+
+        Returns:
+            dict: "top_bombers" and "most_bombed" as lists of (user_id, count), and the "total" bombs
+        """
+        logs = self.between(since, until)
+
+        return {
+            "top_bombers": Counter(log["moderator_id"] for log in logs).most_common(limit),
+            "most_bombed": Counter(log["user_id"] for log in logs).most_common(limit),
+            "total": len(logs)
+        }
@@ -0,0 +1,48 @@
+import json
+import hashlib
+import logging
+
+class TreeSyncer:
+    """Sync the slash command tree only when it actually changed.
+
+    The commands registered for a scope (one guild, or global) are serialized
+    the same way discord.py sends them to Discord, and a hash of that payload is
+    persisted after every successful sync. Later syncs for the same scope are
+    skipped while the hash matches, so reconnects and restarts don't spend the
+    heavily rate-limited sync endpoint on an unchanged tree.
+    """
+
+    def __init__(self, bot, db):
+        self.bot = bot
+        self.db = db
+
+    def tree_hash(self, guild=None):
+        """Hash the serialized commands registered for a guild (or globally)."""
+        tree = self.bot.tree
+        payload = sorted(
+            (command.to_dict(tree) for command in tree.get_commands(guild=guild)),
+            key=lambda command: (command.get("type", 1), command["name"])
+        )
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    async def sync(self, guild=None, force=False):
+        """Sync the commands for a guild (or globally) if they changed since the last sync.
+
+        Returns:
+            bool: True if a sync was sent to Discord
+        """
+        scope = str(guild.id) if guild is not None else "global"
+        digest = self.tree_hash(guild)
+        hashes = self.db.get_command_tree_hashes()
+
+        if not force and hashes.get(scope) == digest:
+            logging.info(f"Slash commands ({scope}) unchanged, skipping sync")
+            return False
+
+        logging.info(f"Syncing slash commands ({scope})...")
+        await self.bot.tree.sync(guild=guild)
+
+        hashes[scope] = digest
+        self.db.save_command_tree_hashes(hashes)
+        logging.info(f"Slash commands ({scope}) synced successfully!")
+        return True